@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    스레드 안전한 LRU 캐시 (선택적으로 TTL 지원)
+
+    - maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초)이 지정되면 만료된 항목은 조회 시점에 제거
+    - 락은 threading.Lock이므로 이벤트 루프 안에서 호출해도 await 없이 바로 반환됨
+    - get_or_set의 factory는 키별 락 안에서 실행되므로 느린 생성이 다른 키의 조회를 막지 않음
+    - on_evict(key, value)는 maxsize를 넘어 제거된 항목마다 캐시 락 밖에서 호출됨 (커넥션 정리 등)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.stats = CacheStats()
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.RLock()
+        # 생성 중인 키 -> [키별 락, 대기 중인 스레드 수]
+        self._building: dict[K, list] = {}
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _lookup(self, key: K) -> Any:
+        # 락을 잡은 상태에서 호출
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+        stored_at, value = entry
+        if self._expired(stored_at):
+            del self._data[key]
+            self.stats.expirations += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _store(self, key: K, value: V) -> list[tuple[K, V]]:
+        # 락을 잡은 상태에서 호출, 용량 초과로 제거된 항목을 반환 (락을 놓은 뒤 _evicted로 전달)
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        evicted = []
+        while len(self._data) > self.maxsize:
+            old_key, (_, old_value) = self._data.popitem(last=False)
+            evicted.append((old_key, old_value))
+            self.stats.evictions += 1
+        return evicted
+
+    def _evicted(self, evicted: list[tuple[K, V]]) -> None:
+        if self.on_evict is not None:
+            for key, value in evicted:
+                self.on_evict(key, value)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+            return value
+
+    def peek(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """최근 사용 순서와 통계를 바꾸지 않고 조회 (만료된 항목은 제거)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            stored_at, value = entry
+            if self._expired(stored_at):
+                del self._data[key]
+                self.stats.expirations += 1
+                return default
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            evicted = self._store(key, value)
+        self._evicted(evicted)
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        """캐시에 없으면 factory()로 생성해서 저장 (같은 키에 대해 factory는 한 번만 호출됨)"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.stats.hits += 1
+                return value
+            building = self._building.setdefault(key, [threading.Lock(), 0])
+            building[1] += 1
+        try:
+            # 같은 키를 요청한 스레드만 기다리고, 캐시 전체 락은 factory 실행 중에 잡지 않음
+            with building[0]:
+                with self._lock:
+                    value = self._lookup(key)
+                    if value is not _MISSING:
+                        # 먼저 들어온 스레드가 생성한 값
+                        self.stats.hits += 1
+                        return value
+                    self.stats.misses += 1
+                value = factory()
+                with self._lock:
+                    evicted = self._store(key, value)
+                self._evicted(evicted)
+                return value
+        finally:
+            with self._lock:
+                building[1] -= 1
+                if building[1] == 0:
+                    del self._building[key]
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_key(*args: Any, **kwargs: Any) -> tuple:
+    """
+    인자들을 해시 가능한 캐시 키로 변환
+    dict/list/set은 정렬된 tuple로 바꿔서 순서에 상관없이 같은 키가 나오도록 함
+    """
+
+    def freeze(obj: Any) -> Hashable:
+        if isinstance(obj, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in obj.items()))
+        if isinstance(obj, (list, tuple)):
+            return tuple(freeze(v) for v in obj)
+        if isinstance(obj, (set, frozenset)):
+            return tuple(sorted(freeze(v) for v in obj))
+        return obj
+
+    return (freeze(args), freeze(kwargs))
@@ -1,30 +1,50 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator, Optional
 
-# MariaDB 연결 URL
-user = "user"
-password = "user" # 특수문자 포함 시
-host = "localhost" # Docker라면 'host.docker.internal' 또는 서비스명
-db_name = "backend"
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{user}:{password}@{host}:3306/{db_name}"
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-# 연결 옵션 추가
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  # 연결 유효성 체크
-    pool_recycle=3600,   # 1시간마다 연결 재생성
-    echo=True            # SQL 쿼리 로깅 (개발 시에만 True)
-)
+from app.config import settings
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 엔진은 첫 요청 때 생성 (드라이버 import와 커넥션 풀 생성을 기동 시점에 하지 않음)
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def make_engine(url: str, **kwargs) -> AsyncEngine:
+    """비동기 엔진 생성 (SQLite는 커넥션 풀 옵션을 지원하지 않으므로 제외)"""
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": True}  # 연결 유효성 체크
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return create_async_engine(url, **{**options, **kwargs})
+
+
+def make_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # commit 후에도 객체 속성을 다시 조회하지 않도록 expire_on_commit=False (async에서는 지연 로딩 불가)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def get_engine() -> AsyncEngine:
+    global _engine, _sessionmaker
+    if _engine is None:
+        _engine = make_engine(settings.DATABASE_URL)
+        _sessionmaker = make_sessionmaker(_engine)
+    return _engine
 
-Base = declarative_base()
 
 # 의존성 함수
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    get_engine()
+    async with _sessionmaker() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def dispose_engine() -> None:
+    """서버 종료 시 커넥션 풀 정리"""
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = _sessionmaker = None
@@ -1,8 +1,20 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import settings
+from app.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
@@ -11,6 +23,28 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = HTTPBearer(auto_error=True)
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+# 검증이 끝난 토큰 -> (user_id, 만료 시각) 캐시 (보호된 API마다 JWT를 다시 디코딩하지 않음)
+token_cache: LRUCache[str, tuple[str, Optional[float]]] = LRUCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
+# bcrypt는 한 번에 수백 ms 걸리는 CPU 작업이므로 이벤트 루프 대신 이 스레드 풀에서 실행
+# (max_workers가 동시 해싱 수의 상한, 나머지 요청은 큐에서 대기)
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            # bcrypt는 GIL을 풀고 실행되므로 코어 수보다 많은 스레드는 서로 CPU만 나눠 씀
+            workers = settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1)
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password-hash"
+            )
+        return _hash_executor
+
 
 def verify_password(plain_password, hashed_password):
     """평문 비밀번호와 해싱된 비밀번호를 비교"""
@@ -20,6 +54,18 @@ def get_password_hash(password):
     """비밀번호를 해싱"""
     return pwd_context.hash(password)
 
+async def averify_password(plain_password, hashed_password) -> bool:
+    """verify_password를 해싱 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_hash_executor(), verify_password, plain_password, hashed_password
+    )
+
+async def aget_password_hash(password) -> str:
+    """get_password_hash를 해싱 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), get_password_hash, password)
+
 def create_access_token(data: dict):
     encoded_jwt = jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -28,21 +74,31 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(o
     """
     보호된 엔드포인트에서 사용될 의존성 (Depends)
     1. 요청 헤더에서 토큰을 추출 (FastAPI가 자동으로 해줌)
-    2. 토큰을 디코딩하고 검증
-    3. 토큰의 username(sub)을 이용해 DB에서 최신 사용자 정보를 가져옴
+    2. 토큰을 디코딩하고 검증 (최근에 검증한 토큰은 캐시에서 바로 반환)
+    3. 토큰의 user_id를 반환
     """
 
     token = credentials.credentials
-    print(f"token : {token}")
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보를 확인할 수 없습니다",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cached = token_cache.get(token)
+    if cached is not None:
+        user_id, expires_at = cached
+        # 캐시 TTL 안에서 토큰 자체가 만료된 경우
+        if expires_at is None or expires_at > time.time():
+            return user_id
+        token_cache.pop(token)
+        raise credentials_exception
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"payload : {payload}")
-        return payload['user_id']
-    except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        user_id = payload['user_id']
+    except (JWTError, KeyError):
+        logger.info("Rejected an invalid access token")
+        raise credentials_exception
+    token_cache.set(token, (user_id, payload.get("exp")))
+    return user_id
@@ -1,6 +1,8 @@
+import codecs
 import random
 import string
 import datetime
+from typing import AsyncIterator
 
 def generate_random_string(length: int = 6) -> str:
     """
@@ -34,4 +36,20 @@ def get_current_time_string() -> str:
     # %H: 24시간 형식의 시, %M: 2자리 분, %S: 2자리 초
     time_string = now.strftime("%Y-%m-%d %H:%M:%S")
     
-    return str(time_string)
\ No newline at end of file
+    return str(time_string)
+
+async def iter_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """
+    바이트 스트림(예: request.stream())을 줄 단위 문자열로 변환합니다.
+    본문 전체를 메모리에 올리지 않고, 청크 경계에 걸친 줄/멀티바이트 문자도 처리합니다.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.removesuffix("\r")
@@ -1,7 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from .config import server_config
 from fastapi import APIRouter
-from app.routes import user_router
+from app.routes import rag_router, user_router
 import logging
 from fastapi.exceptions import RequestValidationError
 import app.schema.common_schema as common_schema
@@ -9,11 +10,31 @@ from fastapi.responses import JSONResponse
 from app.core.exception import CustomException, ErrorCode
 import os
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from openai import AsyncOpenAI
+from app.config import settings
+from app.core.database import dispose_engine
+from app.rag.retrieval_graph.propmts import prompts_langsmith
+from app.rag.weaviate_client import weaviate_pool
 
-app = FastAPI(title="Backend + AI Server")
+logger = logging.getLogger(__name__)
+
+# 서버 시작 시 Weaviate 공유 클라이언트를 연결하고 종료 시 정리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청에서 사용하는 동기 클라이언트를 미리 연결 (연결 대기 중에 이벤트 루프를 막지 않도록 스레드에서 실행)
+    if await asyncio.to_thread(weaviate_pool.health_check):
+        logger.info("Weaviate is ready")
+    else:
+        # Weaviate가 내려가 있어도 사용자 API는 동작해야 하므로 기동은 계속하고, 이후 요청에서 재연결
+        logger.error("Weaviate is not ready; retrieval requests will retry the connection")
+    # LangSmith 프롬프트는 스냅샷으로 바로 기동하고, 새 버전은 백그라운드에서 받아옴
+    if settings.PROMPT_REFRESH_INTERVAL > 0:
+        prompts_langsmith.registry.start_background_refresh(settings.PROMPT_REFRESH_INTERVAL)
+    yield
+    prompts_langsmith.registry.stop_background_refresh()
+    await weaviate_pool.aclose()
+    await dispose_engine()
+
+app = FastAPI(title="Backend + AI Server", lifespan=lifespan)
 
 logging.basicConfig(
     level=logging.INFO,  # 로그 레벨을 INFO로 설정
@@ -82,5 +103,6 @@ app.add_middleware(
 
 api_router = APIRouter()
 api_router.include_router(router=user_router.router)
+api_router.include_router(router=rag_router.router)
 
 app.include_router(api_router)
\ No newline at end of file
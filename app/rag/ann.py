@@ -0,0 +1,186 @@
+"""IVF (inverted file) approximate nearest-neighbour index for `LocalVectorStore`.
+
+Vectors are partitioned by a spherical k-means coarse quantizer into `nlist`
+lists. A query scores only the rows of the `nprobe` lists whose centroids are
+closest, so latency scales with `nprobe / nlist` of the corpus instead of all
+of it; raising `nprobe` trades latency for recall.
+
+The list assignment of every row is kept in an int32 file aligned with the
+store's vector file, so inserts are one write at the row offset, deletions reuse the
+store's tombstones (the record manager keys are the store ids), and opening the
+index is an `np.memmap` plus one sort to rebuild the inverted lists.
+
+Files (next to vectors.f32):
+
+    ivf_centroids.npy    (nlist, dim) float32, L2-normalized
+    ivf_assignments.i32  list id per store row
+    ivf_meta.json        nlist and the number of rows the quantizer was trained on
+
+Classes:
+    IVFIndex: Coarse quantizer plus the row → list assignments.
+"""
+
+import json
+import math
+import os
+from typing import Optional
+
+import numpy as np
+
+CENTROIDS_FILE = "ivf_centroids.npy"
+ASSIGNMENTS_FILE = "ivf_assignments.i32"
+META_FILE = "ivf_meta.json"
+
+# 한 번에 centroid와 곱하는 행 수 (메모리 사용량 제한)
+_ASSIGN_CHUNK = 65_536
+
+
+def default_nlist(rows: int) -> int:
+    return max(1, min(rows, int(4 * math.sqrt(rows))))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        chunk = np.asarray(vectors[start : start + _ASSIGN_CHUNK], dtype=np.float32)
+        out[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return out
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Centroids maximizing cosine similarity (vectors are expected to be normalized)."""
+    rng = np.random.default_rng(seed)
+    centroids = np.array(vectors[rng.choice(len(vectors), nlist, replace=False)])
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        present, starts = np.unique(sorted_labels, return_index=True)
+        sums = np.add.reduceat(np.asarray(vectors)[order], starts, axis=0)
+        centroids[present] = _normalize(sums)
+        # 비어 있는 리스트는 임의의 벡터로 다시 시작
+        empty = np.setdiff1d(np.arange(nlist), present)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted lists over the rows of a vector file.
+
+    Args:
+        centroids: (nlist, dim) normalized coarse centroids.
+        assignments: List id of each row, in row order.
+        trained_rows: Number of rows the centroids were trained on.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.assignments = assignments
+        self.trained_rows = trained_rows
+        self._lists: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        nlist: Optional[int] = None,
+        sample_size: int = 100_000,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Train the quantizer on a sample of `vectors` and assign every row."""
+        rows = len(vectors)
+        nlist = nlist or default_nlist(rows)
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(rows, min(rows, max(sample_size, nlist)), replace=False))
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+        centroids = spherical_kmeans(sample, nlist, iterations=iterations, seed=seed)
+        return cls(centroids, _assign(vectors, centroids), trained_rows=rows)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return _assign(vectors, self.centroids)
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        # 행 번호를 리스트 id 순으로 정렬한 배열과 각 리스트의 시작 위치
+        if self._lists is None:
+            assignments = np.asarray(self.assignments)
+            order = np.argsort(assignments, kind="stable").astype(np.int64)
+            bounds = np.searchsorted(assignments[order], np.arange(self.nlist + 1))
+            self._lists = (order, bounds)
+        return self._lists
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows of the `nprobe` lists closest to `query`, in ascending row order."""
+        nprobe = min(nprobe, self.nlist)
+        similarity = self.centroids @ query
+        probes = np.argpartition(-similarity, nprobe - 1)[:nprobe]
+        order, bounds = self._inverted_lists()
+        rows = np.concatenate([order[bounds[p] : bounds[p + 1]] for p in probes])
+        # memmap에서 연속된 영역을 읽도록 행 번호 순으로 정렬
+        rows.sort()
+        return rows
+
+    # 저장 / 로딩
+
+    def save(self, path: str) -> None:
+        # 임시 파일에 쓰고 교체: 기존 파일을 memmap 중인 검색은 이전 내용을 계속 읽음
+        def write(name: str, write_to) -> None:
+            tmp_path = os.path.join(path, f"{name}.tmp")
+            with open(tmp_path, "wb") as f:
+                write_to(f)
+            os.replace(tmp_path, os.path.join(path, name))
+
+        write(CENTROIDS_FILE, lambda f: np.save(f, self.centroids))
+        write(ASSIGNMENTS_FILE, lambda f: f.write(np.asarray(self.assignments, np.int32).tobytes()))
+        meta = {"nlist": self.nlist, "trained_rows": self.trained_rows}
+        write(META_FILE, lambda f: f.write(json.dumps(meta).encode()))
+
+    def write_rows(self, path: str, start: int, assignments: np.ndarray) -> None:
+        """Set the assignments of rows `start`, `start + 1`, ... in memory and on disk.
+
+        Anything stored from `start` on (e.g. rows of a write that was never committed)
+        is replaced.
+        """
+        assignments = np.asarray(assignments, dtype=np.int32)
+        # 파일을 고쳐 쓰기 전에 메모리로 복사 (self.assignments가 같은 파일의 memmap일 수 있음)
+        self.assignments = np.concatenate([np.asarray(self.assignments[:start]), assignments])
+        self._lists = None
+        file_path = os.path.join(path, ASSIGNMENTS_FILE)
+        with open(file_path, "r+b" if os.path.exists(file_path) else "wb") as f:
+            f.seek(start * assignments.itemsize)
+            f.write(assignments.tobytes())
+            f.truncate()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["IVFIndex"]:
+        """Open a saved index with the assignments memory-mapped, or None if there is none."""
+        centroids_path = os.path.join(path, CENTROIDS_FILE)
+        if not os.path.exists(centroids_path):
+            return None
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        assignments_path = os.path.join(path, ASSIGNMENTS_FILE)
+        if os.path.getsize(assignments_path):
+            assignments = np.memmap(assignments_path, dtype=np.int32, mode="r")
+        else:
+            assignments = np.empty(0, dtype=np.int32)
+        return cls(np.load(centroids_path), assignments, trained_rows=meta["trained_rows"])
+
+    @staticmethod
+    def remove(path: str) -> None:
+        for name in (CENTROIDS_FILE, ASSIGNMENTS_FILE, META_FILE):
+            file_path = os.path.join(path, name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
@@ -0,0 +1,436 @@
+"""Semantic cache of retrieval graph answers.
+
+Users often send near-identical questions (the same job description, the same
+question re-phrased). The cache embeds the last user message and returns a
+stored answer if a previous question under the same *partition* is at least
+`threshold` cosine-similar. The partition is a hash of
+
+- the index version, bumped by `ingest_docs` whenever it changes the index
+  (`bump_index_version`), so answers are never served from an outdated index,
+- the graph configuration (models, retriever, reranker ...),
+- the earlier conversation turns, so only the same conversation state matches.
+
+Entries expire after `ttl` seconds and the least recently used entries are
+evicted past `max_entries` (over all partitions for the local backend, per
+partition for Redis).
+
+Backends:
+    LocalAnswerCache: In-process (per worker) numpy similarity search over LRU entries.
+    RedisAnswerCache: Shared between workers; needs the optional `redis` package.
+
+Classes:
+    CachedAnswer: A stored answer and the documents it was based on.
+    AnswerCache: Embeds questions, computes partitions and talks to a backend.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.core.cache import CacheStats, LRUCache
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    answer: str
+    documents: list[dict[str, Any]] = field(default_factory=list)
+    """`{"page_content", "metadata"}` of the context documents."""
+    question: str = ""
+    created_at: float = 0.0
+
+    def to_documents(self) -> list["Document"]:
+        from langchain_core.documents import Document
+
+        return [Document(**doc) for doc in self.documents]
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+def _best_match(
+    query: np.ndarray, vectors: list[np.ndarray], threshold: float
+) -> Optional[tuple[int, float]]:
+    if not vectors:
+        return None
+    similarity = np.stack(vectors) @ query
+    best = int(np.argmax(similarity))
+    score = float(similarity[best])
+    return (best, score) if score >= threshold else None
+
+
+# 인덱스 버전 (ingest가 인덱스를 바꿀 때마다 갱신)
+
+
+def read_index_version(path: Optional[str] = None) -> str:
+    path = path or settings.INDEX_VERSION_PATH
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def _write_index_version(path: str, version: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, path)
+
+
+def bump_index_version(path: Optional[str] = None) -> str:
+    """Give the index a new version, which invalidates every cached answer.
+
+    The version is written to INDEX_VERSION_PATH and, with the Redis backend, to Redis,
+    so API workers on other hosts see it too.
+    """
+    version = uuid.uuid4().hex
+    _write_index_version(path or settings.INDEX_VERSION_PATH, version)
+    if settings.ANSWER_CACHE_BACKEND == "redis":
+        RedisAnswerCache(settings.ANSWER_CACHE_REDIS_URL).set_index_version(version)
+    return version
+
+
+class AnswerCacheBackend(Protocol):
+    def index_version(self) -> str: ...
+
+    def lookup(
+        self, partition: str, vector: np.ndarray, threshold: float
+    ) -> Optional[tuple[CachedAnswer, float]]: ...
+
+    def store(self, partition: str, vector: np.ndarray, answer: CachedAnswer) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LocalAnswerCache:
+    """In-process backend: LRU/TTL entries plus one vector list per partition.
+
+    Args:
+        max_entries: Entries kept over all partitions (least recently used are evicted).
+        ttl: Seconds an entry stays valid.
+        index_version_path: File holding the index version (default INDEX_VERSION_PATH).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: Optional[float] = 3600,
+        index_version_path: Optional[str] = None,
+    ):
+        self.index_version_path = index_version_path
+        self._version: Optional[str] = None
+        self._entries: LRUCache[str, tuple[str, np.ndarray, CachedAnswer]] = LRUCache(
+            maxsize=max_entries, ttl=ttl
+        )
+        self._partitions: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._entries.stats
+
+    def index_version(self) -> str:
+        version = read_index_version(self.index_version_path)
+        if version != self._version:
+            # 인덱스가 바뀌면 예전 파티션은 더 이상 조회되지 않으므로 메모리에서도 비움
+            if self._version is not None:
+                self.clear()
+            self._version = version
+        return version
+
+    def lookup(
+        self, partition: str, vector: np.ndarray, threshold: float
+    ) -> Optional[tuple[CachedAnswer, float]]:
+        with self._lock:
+            entry_ids = self._partitions.get(partition)
+            if not entry_ids:
+                self._entries.stats.misses += 1
+                return None
+            # 만료/제거된 항목은 파티션 목록에서도 정리 (최근 사용 순서는 적중한 항목만 갱신)
+            live = [(i, e) for i in entry_ids if (e := self._entries.peek(i)) is not None]
+            if live:
+                self._partitions[partition] = [i for i, _ in live]
+            else:
+                del self._partitions[partition]
+            match = _best_match(vector, [e[1] for _, e in live], threshold)
+            if match is None:
+                self._entries.stats.misses += 1
+                return None
+            index, score = match
+            entry_id, (_, _, answer) = live[index]
+            self._entries.get(entry_id)
+            return answer, score
+
+    def store(self, partition: str, vector: np.ndarray, answer: CachedAnswer) -> None:
+        entry_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries.set(entry_id, (partition, vector, answer))
+            self._partitions.setdefault(partition, []).append(entry_id)
+            # LRU에서 밀려난 항목의 id가 조회되지 않는 파티션에 쌓이지 않도록 가끔 정리
+            if len(self._partitions) > self._entries.maxsize:
+                self._prune()
+
+    def _prune(self) -> None:
+        partitions = {}
+        for partition, entry_ids in self._partitions.items():
+            live = [i for i in entry_ids if self._entries.peek(i) is not None]
+            if live:
+                partitions[partition] = live
+        self._partitions = partitions
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._partitions.clear()
+
+
+class RedisAnswerCache:
+    """Redis backend shared by all API workers.
+
+    Per partition, a sorted set keyed by last access time holds the entry ids
+    (LRU order). Each entry is two keys with the same expiry: the question
+    vector as raw float32 bytes and the answer as JSON. A lookup reads the
+    vectors of at most `max_scan` most recently used entries and fetches the
+    answer JSON of the best match only.
+
+    Unlike `LocalAnswerCache`, `max_entries` applies per partition: Redis keeps
+    no global LRU order, and memory is bounded by `ttl` and the number of active
+    partitions (index version x configuration x conversation state).
+
+    Args:
+        url: Redis URL, e.g. "redis://:password@localhost:6379/1".
+        max_entries: Entries kept per partition.
+        ttl: Seconds an entry stays valid.
+        max_scan: Most recently used entries of a partition compared per lookup.
+        client: A ready `redis.Redis` client (instead of `url`).
+        prefix: Key prefix.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_entries: int = 1000,
+        ttl: Optional[float] = 3600,
+        max_scan: int = 200,
+        client: Any = None,
+        prefix: str = "answer_cache",
+    ):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "ANSWER_CACHE_BACKEND=redis requires the redis package: pip install redis"
+                ) from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.max_entries = max_entries
+        self.ttl = int(ttl) if ttl else None
+        self.max_scan = max_scan
+        self.prefix = prefix
+
+    def index_version(self) -> str:
+        version = self.client.get(f"{self.prefix}:index_version")
+        return version.decode() if isinstance(version, bytes) else version or ""
+
+    def set_index_version(self, version: str) -> None:
+        self.client.set(f"{self.prefix}:index_version", version)
+
+    def _index_key(self, partition: str) -> str:
+        return f"{self.prefix}:{partition}:index"
+
+    def _entry_key(self, partition: str, entry_id: str) -> str:
+        return f"{self.prefix}:{partition}:{entry_id}"
+
+    def _vector_key(self, partition: str, entry_id: str) -> str:
+        return f"{self.prefix}:{partition}:{entry_id}:vector"
+
+    def lookup(
+        self, partition: str, vector: np.ndarray, threshold: float
+    ) -> Optional[tuple[CachedAnswer, float]]:
+        index_key = self._index_key(partition)
+        # 최근에 사용된 max_scan개만 비교 (점수 오름차순이므로 뒤에서부터)
+        entry_ids = [
+            i.decode() if isinstance(i, bytes) else i
+            for i in self.client.zrange(index_key, -self.max_scan, -1)
+        ]
+        if not entry_ids:
+            return None
+        blobs = self.client.mget([self._vector_key(partition, i) for i in entry_ids])
+        live, expired = [], []
+        for entry_id, blob in zip(entry_ids, blobs):
+            if blob is None:
+                expired.append(entry_id)
+            else:
+                live.append((entry_id, np.frombuffer(blob, dtype=np.float32)))
+        if expired:
+            self.client.zrem(index_key, *expired)
+        match = _best_match(vector, [v for _, v in live], threshold)
+        if match is None:
+            return None
+        index, score = match
+        entry_id = live[index][0]
+        value = self.client.get(self._entry_key(partition, entry_id))
+        if value is None:
+            return None
+        self.client.zadd(index_key, {entry_id: time.time()})
+        return CachedAnswer(**json.loads(value)), score
+
+    def store(self, partition: str, vector: np.ndarray, answer: CachedAnswer) -> None:
+        entry_id = uuid.uuid4().hex
+        index_key = self._index_key(partition)
+        self.client.set(
+            self._vector_key(partition, entry_id),
+            np.asarray(vector, dtype=np.float32).tobytes(),
+            ex=self.ttl,
+        )
+        self.client.set(
+            self._entry_key(partition, entry_id),
+            json.dumps(asdict(answer), default=str),
+            ex=self.ttl,
+        )
+        self.client.zadd(index_key, {entry_id: time.time()})
+        # 오래 사용되지 않은 항목부터 제거
+        overflow = self.client.zcard(index_key) - self.max_entries
+        if overflow > 0:
+            for old_id in self.client.zrange(index_key, 0, overflow - 1):
+                old_id = old_id.decode() if isinstance(old_id, bytes) else old_id
+                self.client.delete(
+                    self._entry_key(partition, old_id), self._vector_key(partition, old_id)
+                )
+            self.client.zremrangebyrank(index_key, 0, overflow - 1)
+        if self.ttl:
+            self.client.expire(index_key, self.ttl)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            name = key.decode() if isinstance(key, bytes) else key
+            if name != f"{self.prefix}:index_version":
+                self.client.delete(key)
+
+
+class AnswerCache:
+    """Semantic answer cache in front of the retrieval graph.
+
+    Args:
+        backend: Where entries are stored (`LocalAnswerCache` or `RedisAnswerCache`).
+        embeddings: Embeds the last user message.
+        threshold: Minimum cosine similarity of a cached question to count as a hit.
+    """
+
+    def __init__(self, backend: AnswerCacheBackend, embeddings: "Embeddings", threshold: float = 0.95):
+        self.backend = backend
+        self.embeddings = embeddings
+        self.threshold = threshold
+
+    def partition(self, configurable: dict[str, Any], history: Sequence[tuple[str, str]]) -> str:
+        payload = json.dumps(
+            {
+                "version": self.backend.index_version(),
+                "config": configurable,
+                "history": [list(turn) for turn in history],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    async def alookup(
+        self, question: str, configurable: dict[str, Any], history: Sequence[tuple[str, str]] = ()
+    ) -> tuple[Optional[CachedAnswer], np.ndarray, str]:
+        """Returns (hit or None, question vector, partition); pass the latter two to `astore`."""
+        vector = _normalize(await self.embeddings.aembed_query(question))
+
+        # Redis 백엔드는 네트워크 I/O이므로 이벤트 루프 밖에서 조회
+        def lookup() -> tuple[str, Optional[tuple[CachedAnswer, float]]]:
+            partition = self.partition(configurable, history)
+            return partition, self.backend.lookup(partition, vector, self.threshold)
+
+        partition, match = await asyncio.to_thread(lookup)
+        if match is None:
+            return None, vector, partition
+        answer, score = match
+        logger.info(f"Answer cache hit (similarity {score:.3f}) for: {question[:80]!r}")
+        return answer, vector, partition
+
+    async def astore(
+        self,
+        question: str,
+        vector: np.ndarray,
+        partition: str,
+        answer: str,
+        documents: Sequence["Document"] = (),
+    ) -> None:
+        await asyncio.to_thread(
+            self.backend.store,
+            partition,
+            vector,
+            CachedAnswer(
+                answer=answer,
+                documents=[
+                    {"page_content": d.page_content, "metadata": d.metadata} for d in documents
+                ],
+                question=question,
+                created_at=time.time(),
+            ),
+        )
+
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """The process-wide cache configured by ANSWER_CACHE_*, or None if it is disabled."""
+    global _answer_cache
+    if settings.ANSWER_CACHE_BACKEND == "none":
+        return None
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            # 검색 그래프와 같은 (임베딩 캐시가 적용된) 임베딩 모델 사용
+            from app.rag.retrieval import make_text_encoder
+
+            if settings.ANSWER_CACHE_BACKEND == "redis":
+                backend: AnswerCacheBackend = RedisAnswerCache(
+                    settings.ANSWER_CACHE_REDIS_URL,
+                    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                    ttl=settings.ANSWER_CACHE_TTL,
+                    max_scan=settings.ANSWER_CACHE_REDIS_MAX_SCAN,
+                )
+            elif settings.ANSWER_CACHE_BACKEND == "local":
+                backend = LocalAnswerCache(
+                    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES, ttl=settings.ANSWER_CACHE_TTL
+                )
+            else:
+                raise ValueError(
+                    f"Unsupported ANSWER_CACHE_BACKEND: {settings.ANSWER_CACHE_BACKEND}. "
+                    "Expected 'none', 'local' or 'redis'"
+                )
+            _answer_cache = AnswerCache(
+                backend,
+                make_text_encoder(settings.ANSWER_CACHE_EMBEDDING_MODEL),
+                threshold=settings.ANSWER_CACHE_THRESHOLD,
+            )
+        return _answer_cache
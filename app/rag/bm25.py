@@ -0,0 +1,195 @@
+"""Local BM25 inverted index over the ingested chunks.
+
+Built from the same chunks `ingest_docs` sends to Weaviate, so keyword search
+can be tested offline and fused with dense results (see `app.rag.fusion`).
+
+The tokenizer keeps identifiers whole *and* splits them into parts, so a query
+for `ChatOpenAI`, `langchain_core.documents` or `ERR_CONNECTION_RESET` matches
+the exact identifier with a high IDF instead of only its common sub-words.
+
+Classes:
+    BM25Index: Okapi BM25 index with per-source replace/remove and gzip JSON persistence.
+    BM25Retriever: `BaseRetriever` over a `BM25Index`.
+"""
+
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Iterable, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from app.rag.embedding_cache import hash_text
+
+_TOKEN_RE = re.compile(r"\w+(?:[.\-:/]\w+)*")
+_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+|[^\W\d_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased tokens: each identifier as a whole plus its snake/dotted/camelCase parts."""
+    tokens: list[str] = []
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        tokens.append(token.lower())
+        parts = [p.lower() for p in _PART_RE.findall(token)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over documents grouped by their `source` metadata.
+
+    Args:
+        k1: Term frequency saturation.
+        b: Document length normalization.
+        source_key: Metadata key used to replace/remove all chunks of a page.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, source_key: str = "source"):
+        self.k1 = k1
+        self.b = b
+        self.source_key = source_key
+        self._docs: dict[int, Document] = {}
+        self._lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._by_source: dict[str, list[int]] = defaultdict(list)
+        self._total_length = 0
+        self._next_id = 0
+        self._refreshed: Optional[set[str]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc: Document) -> None:
+        """Index one chunk.
+
+        Inside `begin_refresh()` / `end_refresh()`, the first chunk of a source
+        replaces all chunks previously indexed for that source.
+        """
+        source = doc.metadata.get(self.source_key, "")
+        with self._lock:
+            if self._refreshed is not None and source not in self._refreshed:
+                self._refreshed.add(source)
+                self.remove_sources([source])
+            doc_id = self._next_id
+            self._next_id += 1
+            terms = Counter(tokenize(doc.page_content))
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = tf
+            length = sum(terms.values())
+            self._docs[doc_id] = doc
+            self._lengths[doc_id] = length
+            self._total_length += length
+            self._by_source[source].append(doc_id)
+
+    def add_documents(self, docs: Iterable[Document]) -> None:
+        for doc in docs:
+            self.add(doc)
+
+    def remove_sources(self, sources: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for source in sources:
+                for doc_id in self._by_source.pop(source, []):
+                    doc = self._docs.pop(doc_id)
+                    self._total_length -= self._lengths.pop(doc_id)
+                    for term in set(tokenize(doc.page_content)):
+                        postings = self._postings.get(term)
+                        if postings is not None:
+                            postings.pop(doc_id, None)
+                            if not postings:
+                                del self._postings[term]
+                    removed += 1
+        return removed
+
+    def begin_refresh(self) -> None:
+        """Start a run in which re-added sources replace their old chunks."""
+        with self._lock:
+            self._refreshed = set()
+
+    def end_refresh(self, remove_missing: bool = False) -> None:
+        """Finish the run; with `remove_missing`, drop sources that were not re-added (full cleanup)."""
+        with self._lock:
+            refreshed, self._refreshed = self._refreshed or set(), None
+            if remove_missing:
+                self.remove_sources([s for s in list(self._by_source) if s not in refreshed])
+
+    def search(self, query: str, k: int = 4) -> list[tuple[Document, float]]:
+        with self._lock:
+            n = len(self._docs)
+            if not n:
+                return []
+            avgdl = self._total_length / n
+            scores: dict[int, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avgdl)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self._docs[doc_id], score) for doc_id, score in top]
+
+    def save(self, path: str) -> None:
+        """Write the chunks as gzip JSON lines (postings are rebuilt on load)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self._lock, gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"k1": self.k1, "b": self.b, "source_key": self.source_key}) + "\n")
+            for doc in self._docs.values():
+                f.write(json.dumps({"text": doc.page_content, "metadata": doc.metadata}) + "\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            index = cls(**json.loads(f.readline()))
+            for line in f:
+                row = json.loads(line)
+                index.add(Document(page_content=row["text"], metadata=row["metadata"]))
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str, **kwargs: Any) -> "BM25Index":
+        return cls.load(path) if os.path.exists(path) else cls(**kwargs)
+
+
+class BM25Retriever(BaseRetriever):
+    """Keyword retriever over a local `BM25Index`.
+
+    Returned documents carry `score` and a content-derived `uuid` in their metadata,
+    mirroring `WeaviateVectorStore` with `return_uuids=True`.
+    """
+
+    index: BM25Index
+    k: int = 4
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return [
+            Document(
+                page_content=doc.page_content,
+                metadata={
+                    **doc.metadata,
+                    "score": score,
+                    "uuid": doc.metadata.get("uuid") or hash_text(doc.page_content),
+                },
+            )
+            for doc, score in self.index.search(query, self.k)
+        ]
@@ -49,17 +49,23 @@ class BaseConfiguration:
     )
 
     retriever_provider: Annotated[
-        Literal["weaviate"],
+        Literal["weaviate", "local", "bm25"],
         {"__template_metadata__": {"kind": "retriever"}},
     ] = field(
         default="weaviate",
-        metadata={"description": "The vector store provider to use for retrieval."},
+        metadata={
+            "description": "The vector store provider to use for retrieval. "
+            "'local' searches the embedded NumPy store written by ingest_docs "
+            "(VECTOR_STORE_PROVIDER=local), 'bm25' the local keyword index (offline testing)."
+        },
     )
 
     search_kwargs: dict[str, Any] = field(
         default_factory=dict,
         metadata={
-            "description": "Additional keyword arguments to pass to the search function of the retriever."
+            "description": "Additional keyword arguments to pass to the search function of the retriever. "
+            "For hybrid search: 'alpha' (1 = vector only, 0 = BM25 only) and "
+            "'fusion' ('relative_score' or 'rrf')."
         },
     )
 
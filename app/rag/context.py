@@ -0,0 +1,203 @@
+"""Token-budgeted packing of the response context.
+
+`format_docs` turns every document, with its full `repr`'d metadata, into the
+prompt; the prompt (and time to first token) grows with whatever retrieval
+returned. `pack_context` instead fills a token budget in priority order
+(the reranked order):
+
+- passages (paragraphs) already packed from an earlier document are skipped,
+  so overlapping chunks are not sent twice,
+- a document that doesn't fit is trimmed at a sentence (or line) boundary,
+- metadata is reduced to a few quoted attributes (`source`, `title`),
+- the string is assembled with a single `join`.
+
+The result reports the tokens used by each document.
+
+Classes:
+    PackedDocument: How one input document ended up in the context.
+    PackedContext: The packed string and per-document token report.
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+from xml.sax.saxutils import quoteattr
+
+from langchain_core.documents import Document
+
+from app.rag.embedding_cache import hash_text
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[str], int]
+
+# 모델별 기본 컨텍스트 토큰 예산 (AgentConfiguration.context_token_budget으로 덮어쓸 수 있음)
+DEFAULT_CONTEXT_BUDGET = 4000
+CONTEXT_BUDGETS = {
+    "openai/gpt-4o-mini": 6000,
+    "openai/gpt-4o": 8000,
+    "anthropic/claude-3-5-sonnet-20240620": 8000,
+}
+
+METADATA_KEYS = ("source", "title")
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# 문장 끝(.!? 뒤 공백) 또는 줄바꿈에서 자름 (코드 블록은 줄 단위로 유지)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def approximate_token_count(text: str) -> int:
+    """~4 characters per token, the usual estimate for English text and code."""
+    return math.ceil(len(text) / 4)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model: str) -> TokenCounter:
+    """Token counter of a "provider/model" name (tiktoken), or the approximation if unavailable."""
+    model_name = model.split("/", maxsplit=1)[-1]
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model(model_name)
+    except Exception:
+        # 모르는 모델이거나 인코딩 파일을 받을 수 없으면(오프라인) 근사치 사용
+        logger.warning(f"No tiktoken encoding for {model}; approximating token counts")
+        return approximate_token_count
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def context_budget(model: str, override: Optional[int] = None) -> int:
+    return override or CONTEXT_BUDGETS.get(model, DEFAULT_CONTEXT_BUDGET)
+
+
+@dataclass
+class PackedDocument:
+    index: int
+    """Position of the document in the input."""
+    tokens: int = 0
+    """Tokens of the document's element in the context (0 if it was left out)."""
+    truncated: bool = False
+    duplicate_passages: int = 0
+    status: str = "packed"
+    """"packed", "duplicate" (every passage was already packed) or "over_budget"."""
+
+
+@dataclass
+class PackedContext:
+    text: str
+    tokens: int
+    budget: int
+    documents: list[PackedDocument] = field(default_factory=list)
+
+    @property
+    def packed(self) -> list[PackedDocument]:
+        return [d for d in self.documents if d.status == "packed"]
+
+
+def _open_tag(doc: Document, metadata_keys: Sequence[str]) -> str:
+    attributes = "".join(
+        f" {key}={quoteattr(str(doc.metadata[key]))}"
+        for key in metadata_keys
+        if doc.metadata.get(key)
+    )
+    return f"<document{attributes}>\n"
+
+
+def _trim(text: str, budget: int, count_tokens: TokenCounter) -> str:
+    """Longest prefix of whole sentences/lines that fits `budget` tokens."""
+    kept: list[str] = []
+    used = 0
+    start = 0
+    for match in [*_SENTENCE_RE.finditer(text), None]:
+        end = match.end() if match else len(text)
+        piece = text[start:end]
+        used += count_tokens(piece)
+        if used > budget:
+            break
+        kept.append(piece)
+        if match is None:
+            break
+        start = end
+    # 조각별 토큰 수의 합은 이어 붙인 문자열의 토큰 수와 조금 다를 수 있으므로 전체로 다시 확인
+    while kept and count_tokens("".join(kept).rstrip()) > budget:
+        kept.pop()
+    return "".join(kept).rstrip()
+
+
+def pack_context(
+    docs: Sequence[Document],
+    budget: int,
+    count_tokens: TokenCounter = approximate_token_count,
+    metadata_keys: Sequence[str] = METADATA_KEYS,
+    min_document_tokens: int = 32,
+) -> PackedContext:
+    """Pack `docs` (highest priority first) into an XML context of at most `budget` tokens.
+
+    Args:
+        docs: Documents in priority order, e.g. reranked.
+        budget: Token budget of the whole context string.
+        count_tokens: Token counter of the response model (see `get_token_counter`).
+        metadata_keys: Metadata emitted as attributes of each `<document>`.
+        min_document_tokens: Don't add a trimmed document with fewer content tokens than this.
+
+    Returns:
+        PackedContext: The context string, its token count and a per-document report.
+    """
+    header, footer, close = "<documents>\n", "</documents>", "\n</document>\n"
+    parts = [header]
+    used = count_tokens(header) + count_tokens(footer)
+    close_tokens = count_tokens(close)
+    seen_passages: set[str] = set()
+    report: list[PackedDocument] = []
+
+    for index, doc in enumerate(docs):
+        entry = PackedDocument(index=index)
+        report.append(entry)
+
+        passages: list[tuple[str, str]] = []
+        doc_passages: set[str] = set()
+        for passage in _PARAGRAPH_RE.split(doc.page_content.strip()):
+            key = hash_text(_WHITESPACE_RE.sub(" ", passage).strip().lower())
+            if key in seen_passages or key in doc_passages:
+                entry.duplicate_passages += 1
+                continue
+            doc_passages.add(key)
+            passages.append((key, passage))
+        if not passages:
+            entry.status = "duplicate"
+            continue
+
+        open_tag = _open_tag(doc, metadata_keys)
+        body = "\n\n".join(passage for _, passage in passages)
+        overhead = count_tokens(open_tag) + close_tokens
+        remaining = budget - used - overhead
+        tokens = count_tokens(body)
+        if tokens > remaining:
+            if remaining < min_document_tokens:
+                entry.status = "over_budget"
+                continue
+            body = _trim(body, remaining, count_tokens)
+            tokens = count_tokens(body)
+            if not body or not min_document_tokens <= tokens <= remaining:
+                entry.status = "over_budget"
+                continue
+            entry.truncated = True
+
+        parts += (open_tag, body, close)
+        entry.tokens = overhead + tokens
+        used += entry.tokens
+        # 실제로 들어간(잘리지 않은) 문단만 이후 문서의 중복 판정에 사용
+        end = 0
+        for key, passage in passages:
+            end += len(passage)
+            if end > len(body):
+                break
+            seen_passages.add(key)
+            end += 2
+
+    parts.append(footer)
+    return PackedContext(text="".join(parts), tokens=used, budget=budget, documents=report)
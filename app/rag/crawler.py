@@ -0,0 +1,304 @@
+"""Concurrent async crawler used by the ingest pipeline.
+
+Pages are fetched over a pooled keep-alive `httpx.AsyncClient` with a global
+concurrency limit, a per-host limit, retry with exponential backoff and
+conditional GETs (ETag / Last-Modified). Results are yielded as they complete
+through a bounded queue, so a slow consumer throttles the crawl instead of
+letting responses pile up in memory.
+
+Classes:
+    SitemapEntry: A `<url>` entry of a sitemap.
+    CrawlResult: Outcome of fetching one URL.
+    AsyncCrawler: The crawler itself.
+"""
+
+import asyncio
+import logging
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+import httpx
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class SitemapEntry:
+    """A `<url>` entry of a sitemap; `meta` holds every child tag (loc, lastmod, ...)."""
+
+    loc: str
+    lastmod: Optional[str] = None
+    meta: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of fetching one URL.
+
+    `content` is None when the server answered 304 Not Modified or the fetch failed.
+    """
+
+    url: str
+    status: int
+    content: Optional[bytes] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    entry: Optional[SitemapEntry] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+class AsyncCrawler:
+    """Fetch many URLs concurrently over a shared connection pool.
+
+    Use as an async context manager so the pooled client is closed afterwards:
+
+        async with AsyncCrawler() as crawler:
+            entries = await crawler.fetch_sitemap("https://example.com/sitemap.xml")
+            async for result in crawler.crawl(entries):
+                ...
+
+    Args:
+        concurrency: Maximum number of requests in flight across all hosts.
+        per_host_limit: Maximum number of requests in flight per host.
+        max_retries: Retries for transport errors and 429/5xx responses.
+        backoff: Base delay in seconds for exponential backoff.
+        timeout: Per-request timeout in seconds.
+        validators: Known (etag, last_modified) per URL, used for conditional GETs.
+        transport: Transport for the pooled client (default: httpx's network transport).
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 32,
+        per_host_limit: int = 8,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        headers: Optional[dict[str, str]] = None,
+        validators: Optional[dict[str, tuple[Optional[str], Optional[str]]]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.validators = validators if validators is not None else {}
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.per_host_limit)
+        )
+
+    async def __aenter__(self) -> "AsyncCrawler":
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            timeout=self.timeout,
+            headers=self.headers,
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("AsyncCrawler must be used as an async context manager")
+        return self._client
+
+    async def fetch(self, url: str, entry: Optional[SitemapEntry] = None) -> CrawlResult:
+        """GET `url`, sending If-None-Match / If-Modified-Since when validators are known."""
+        etag, last_modified = self.validators.get(url, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        error: Optional[str] = None
+        async with self._host_semaphores[_host(url)]:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError as e:
+                    error = f"{type(e).__name__}: {e}"
+                    retry_after = None
+                except httpx.HTTPError as e:
+                    # TooManyRedirects, DecodingError 등은 재시도해도 같은 결과이므로 바로 실패 처리
+                    error = f"{type(e).__name__}: {e}"
+                    logger.error(f"Failed to fetch URL {url}: {error}")
+                    return CrawlResult(url=url, status=0, entry=entry, error=error)
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        return self._to_result(url, response, entry)
+                    error = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get("Retry-After")
+
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._delay(attempt, retry_after))
+
+        logger.error(f"Failed to fetch URL {url}: {error}")
+        return CrawlResult(url=url, status=0, entry=entry, error=error)
+
+    def _delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        # 지수 백오프 + 지터 (동시에 실패한 요청들이 같은 시점에 재시도하지 않도록)
+        return self.backoff * (2**attempt) * (1 + random.random())
+
+    def _to_result(
+        self, url: str, response: httpx.Response, entry: Optional[SitemapEntry]
+    ) -> CrawlResult:
+        result = CrawlResult(
+            url=url,
+            status=response.status_code,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            entry=entry,
+        )
+        if response.status_code == 304:
+            return result
+        if response.is_error:
+            result.error = f"HTTP {response.status_code}"
+            logger.error(f"Failed to fetch URL {url}: {result.error}")
+            return result
+        result.content = response.content
+        return result
+
+    async def fetch_sitemap(
+        self, sitemap_url: str, filter_urls: Optional[Sequence[str]] = None
+    ) -> list[SitemapEntry]:
+        """Return the `<url>` entries of a sitemap, following nested sitemap indexes.
+
+        `filter_urls` are regex patterns matched against each loc with `re.match`,
+        the same semantics as `SitemapLoader(filter_urls=...)`.
+        """
+        result = await self.fetch(sitemap_url)
+        if not result.ok or result.content is None:
+            return []
+
+        try:
+            root = etree.fromstring(result.content, parser=etree.XMLParser(recover=True))
+        except etree.XMLSyntaxError:
+            root = None
+        if root is None:
+            # recover=True여도 복구할 수 없는 문서(공백뿐인 응답, 텍스트 등)는 None이나 예외
+            logger.error(f"Failed to parse sitemap {sitemap_url}")
+            return []
+        entries: list[SitemapEntry] = []
+        nested: list[str] = []
+        for element in root:
+            if not isinstance(element.tag, str):
+                continue
+            tag = etree.QName(element).localname
+            meta = {
+                etree.QName(child).localname: (child.text or "").strip()
+                for child in element
+                if isinstance(child.tag, str)
+            }
+            loc = meta.get("loc")
+            if not loc:
+                continue
+            if tag == "sitemap":
+                nested.append(loc)
+            elif tag == "url":
+                if filter_urls and not any(re.match(p, loc) for p in filter_urls):
+                    continue
+                entries.append(SitemapEntry(loc=loc, lastmod=meta.get("lastmod"), meta=meta))
+
+        if nested:
+            children = await asyncio.gather(
+                *(self.fetch_sitemap(url, filter_urls) for url in nested)
+            )
+            for child_entries in children:
+                entries.extend(child_entries)
+        return entries
+
+    async def crawl(
+        self,
+        targets: Iterable[Union[str, SitemapEntry]],
+        max_in_flight: Optional[int] = None,
+    ) -> AsyncIterator[CrawlResult]:
+        """Fetch `targets` concurrently and yield results in completion order.
+
+        At most `max_in_flight` finished results are buffered (default: `concurrency`);
+        when the consumer falls behind, the workers block instead of fetching more.
+        """
+        max_in_flight = max_in_flight or self.concurrency
+        pending: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        results: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        done = object()
+
+        async def produce() -> None:
+            try:
+                for target in targets:
+                    await pending.put(target)
+            finally:
+                for _ in range(self.concurrency):
+                    await pending.put(done)
+
+        async def work() -> None:
+            try:
+                while (target := await pending.get()) is not done:
+                    entry = target if isinstance(target, SitemapEntry) else None
+                    url = entry.loc if entry is not None else target
+                    try:
+                        result = await self.fetch(url, entry=entry)
+                    except Exception as e:
+                        # 잘못된 URL(httpx.InvalidURL 등) 하나 때문에 크롤 전체가 중단되지 않도록 실패 결과로 처리
+                        error = f"{type(e).__name__}: {e}"
+                        logger.error(f"Failed to fetch URL {url}: {error}", exc_info=True)
+                        result = CrawlResult(url=url, status=0, entry=entry, error=error)
+                    await results.put(result)
+            finally:
+                # 예외로 종료되어도 done을 넣어야 소비자 루프가 끝남
+                # (취소된 경우는 소비자가 이미 종료 중이라 가득 찬 큐에서 기다리지 않도록 생략)
+                if not asyncio.current_task().cancelling():
+                    await results.put(done)
+
+        tasks = [asyncio.create_task(produce())] + [
+            asyncio.create_task(work()) for _ in range(self.concurrency)
+        ]
+        try:
+            finished = 0
+            while finished < self.concurrency:
+                result = await results.get()
+                if result is done:
+                    finished += 1
+                else:
+                    yield result
+            # targets 순회나 워커에서 발생한 예외가 있으면 전파
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
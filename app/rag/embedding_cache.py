@@ -0,0 +1,273 @@
+"""Persistent embedding cache keyed by (model, sha256(text)).
+
+Re-ingests of unchanged chunks and repeated queries are served from a local
+SQLite file instead of calling the embedding API again.
+
+Classes:
+    SQLiteEmbeddingStore: Size-bounded vector store on disk with LRU eviction.
+    CachedEmbeddings: `Embeddings` wrapper that consults the store before the API.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class SQLiteEmbeddingStore:
+    """Embedding vectors stored as float32 blobs in SQLite.
+
+    Entries are evicted least-recently-used first once `max_entries` is exceeded.
+    A single connection is shared between threads behind a lock.
+
+    `last_used` is only rewritten for hits older than `touch_interval` seconds, so
+    cache hits are normally read-only. The row count is kept in memory and
+    recounted at most every `recount_interval` seconds, to pick up rows written by
+    other processes sharing the file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 500_000,
+        touch_interval: float = 300.0,
+        recount_interval: float = 60.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.recount_interval = recount_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._rows = self._count()
+        self._counted_at = time.monotonic()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> dict[str, list[float]]:
+        """Return the cached vectors for `hashes` and mark them as recently used."""
+        if not hashes:
+            return {}
+        found: dict[str, list[float]] = {}
+        stale: list[str] = []
+        unique = list(dict.fromkeys(hashes))
+        now = time.time()
+        with self._lock:
+            # SQLite의 바인딩 변수 개수 제한을 피하기 위해 나눠서 조회
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector, last_used FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, blob, last_used in rows:
+                    found[text_hash] = _decode(blob)
+                    if now - last_used >= self.touch_interval:
+                        stale.append(text_hash)
+            # 최근에 갱신된 항목은 건너뛰어 히트 대부분을 쓰기 없이 처리
+            if stale:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in stale],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, items: dict[str, Sequence[float]]) -> None:
+        """Store vectors by text hash, evicting the oldest entries if over capacity."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(_encode(vector), now, model, text_hash) for text_hash, vector in items.items()]
+        with self._lock:
+            inserted = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (vector, last_used, model, text_hash) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            ).rowcount
+            if inserted < len(rows):
+                # 이미 있던 항목(다른 프로세스가 먼저 저장한 경우 등)은 덮어씀
+                self._conn.executemany(
+                    "UPDATE embeddings SET vector = ?, last_used = ? "
+                    "WHERE model = ? AND text_hash = ?",
+                    rows,
+                )
+            # 매번 COUNT(*)를 하지 않고 메모리의 행 수를 사용 (다른 프로세스의 쓰기는 주기적으로 다시 셈)
+            if time.monotonic() - self._counted_at >= self.recount_interval:
+                self._rows = self._count()
+                self._counted_at = time.monotonic()
+            else:
+                self._rows += inserted
+            overflow = self._rows - self.max_entries
+            if overflow > 0:
+                self._rows -= self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+            self._conn.commit()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap an `Embeddings` so that only texts missing from the store hit the API.
+
+    Documents and queries share the same key space, which holds for providers that
+    embed queries and documents identically (e.g. OpenAI).
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, store: SQLiteEmbeddingStore):
+        self.underlying = underlying
+        self.model = model
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _lookup(self, texts: list[str]) -> tuple[list[str], dict[str, list[float]], list[str]]:
+        hashes = [hash_text(text) for text in texts]
+        cached = self.store.get_many(self.model, hashes)
+        # 같은 배치 안의 중복 텍스트는 한 번만 임베딩
+        missing: dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        with self._stats_lock:
+            self.misses += len(missing)
+            self.hits += sum(1 for text_hash in hashes if text_hash in cached)
+        return hashes, cached, list(missing.values())
+
+    def _merge(
+        self,
+        hashes: list[str],
+        cached: dict[str, list[float]],
+        missing_texts: list[str],
+        new_vectors: list[list[float]],
+    ) -> list[list[float]]:
+        # 캐시 히트/미스와 상관없이 같은 값을 돌려주도록 새 벡터도 float32로 맞춤
+        computed = {
+            hash_text(text): _decode(_encode(vector))
+            for text, vector in zip(missing_texts, new_vectors)
+        }
+        self.store.put_many(self.model, computed)
+        vectors = {**cached, **computed}
+        return [vectors[text_hash] for text_hash in hashes]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes, cached, missing_texts = self._lookup(texts)
+        new_vectors = self.underlying.embed_documents(missing_texts) if missing_texts else []
+        return self._merge(hashes, cached, missing_texts, new_vectors)
+
+    def embed_query(self, text: str) -> list[float]:
+        hashes, cached, missing_texts = self._lookup([text])
+        new_vectors = [self.underlying.embed_query(text)] if missing_texts else []
+        return self._merge(hashes, cached, missing_texts, new_vectors)[0]
+
+    # SQLite 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes, cached, missing_texts = await asyncio.to_thread(self._lookup, texts)
+        if not missing_texts:
+            return [cached[text_hash] for text_hash in hashes]
+        new_vectors = await self.underlying.aembed_documents(missing_texts)
+        return await asyncio.to_thread(self._merge, hashes, cached, missing_texts, new_vectors)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        hashes, cached, missing_texts = await asyncio.to_thread(self._lookup, [text])
+        if not missing_texts:
+            return cached[hashes[0]]
+        new_vectors = [await self.underlying.aembed_query(text)]
+        return (await asyncio.to_thread(self._merge, hashes, cached, missing_texts, new_vectors))[0]
+
+
+_stores: dict[str, SQLiteEmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(
+    path: str, max_entries: int, touch_interval: float = 300.0
+) -> SQLiteEmbeddingStore:
+    """Return the process-wide store for `path` (one SQLite connection per file)."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SQLiteEmbeddingStore(
+                path, max_entries=max_entries, touch_interval=touch_interval
+            )
+        return _stores[path]
+
+
+def with_embedding_cache(embeddings: Embeddings, model: str) -> Embeddings:
+    """Wrap `embeddings` with the persistent cache unless EMBEDDING_CACHE_PATH is empty."""
+    from app.config import settings
+
+    if not settings.EMBEDDING_CACHE_PATH:
+        return embeddings
+    store = get_embedding_store(
+        settings.EMBEDDING_CACHE_PATH,
+        settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        settings.EMBEDDING_CACHE_TOUCH_INTERVAL,
+    )
+    return CachedEmbeddings(embeddings, model=model, store=store)
+
+
+def cache_stats(embeddings: Embeddings) -> Optional[dict[str, int]]:
+    """Return hit/miss counters if `embeddings` is cache-backed."""
+    return embeddings.stats if isinstance(embeddings, CachedEmbeddings) else None
@@ -1,6 +1,23 @@
 from langchain_core.embeddings import Embeddings
-from langchain_openai import OpenAIEmbeddings
+
+from app.config import settings
+from app.rag.embedding_cache import with_embedding_cache
+from app.rag.utils import get_or_create_model
 
 
 def get_embeddings_model() -> Embeddings:
-    return OpenAIEmbeddings(model="text-embedding-3-small", chunk_size=200)
+    # langchain_openai(openai SDK 포함)는 import 비용이 크므로 모델을 처음 만들 때 로딩
+    from langchain_openai import OpenAIEmbeddings
+
+    return get_or_create_model(
+        "embeddings",
+        lambda: with_embedding_cache(
+            OpenAIEmbeddings(
+                model="text-embedding-3-small", chunk_size=settings.EMBED_BATCH_SIZE
+            ),
+            "openai/text-embedding-3-small",
+        ),
+        "openai",
+        "text-embedding-3-small",
+        chunk_size=settings.EMBED_BATCH_SIZE,
+    )
@@ -0,0 +1,190 @@
+"""Rank fusion of several result lists.
+
+Used to combine keyword (BM25) and dense results locally, mirroring the two
+hybrid fusion algorithms Weaviate offers:
+
+- `relative_score_fusion`: min-max normalize each list's scores, then weight
+  them by `alpha` (1 = dense only, 0 = keyword only), like Weaviate's
+  `relativeScoreFusion`.
+- `reciprocal_rank_fusion`: sum of `weight / (rrf_k + rank)`, like Weaviate's
+  `rankedFusion`; scores are ignored, so it needs no calibration.
+
+Documents are identified by `metadata["uuid"]` when present, otherwise by a
+hash of their content. Hybrid fusion always uses the content hash, because the
+keyword and dense indexes assign different ids to the same chunk.
+`fuse_query_results` merges the per-query lists of the researcher fan-out by
+both: two hits are the same chunk if they share the uuid *or* the content.
+
+Classes:
+    HybridRetriever: Dense `VectorStore` search fused with a local `BM25Index`.
+"""
+
+from typing import Any, Callable, Optional, Sequence, Union
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+from app.rag.bm25 import BM25Index
+from app.rag.embedding_cache import hash_text
+
+RRF_K = 60
+
+
+def document_key(doc: Document) -> str:
+    return doc.metadata.get("uuid") or hash_text(doc.page_content)
+
+
+def content_key(doc: Document) -> str:
+    return hash_text(doc.page_content)
+
+
+def chunk_keys(doc: Document) -> tuple[str, ...]:
+    """Aliases of a chunk: its uuid (if any) and its content hash."""
+    content_hash = hash_text(doc.page_content)
+    doc_id = doc.metadata.get("uuid")
+    return (doc_id, content_hash) if doc_id else (content_hash,)
+
+
+# 문서 하나의 키 또는 같은 문서를 가리키는 여러 키(별칭)
+DocumentKey = Callable[[Document], Union[str, tuple[str, ...]]]
+
+
+def _min_max(scores: list[float]) -> list[float]:
+    if not scores:
+        return []
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(s - low) / (high - low) for s in scores]
+
+
+def _fuse(
+    result_lists: Sequence[Sequence[Document]],
+    contributions: Callable[[int, Sequence[Document]], list[float]],
+    k: Optional[int],
+    key: DocumentKey,
+) -> list[Document]:
+    fused: dict[str, float] = {}
+    first_seen: dict[str, Document] = {}
+    # 별칭 -> 처음 본 문서의 대표 키
+    canonical: dict[str, str] = {}
+    for list_index, docs in enumerate(result_lists):
+        for doc, contribution in zip(docs, contributions(list_index, docs)):
+            aliases = key(doc)
+            if isinstance(aliases, str):
+                aliases = (aliases,)
+            doc_key = next((canonical[a] for a in aliases if a in canonical), aliases[0])
+            for alias in aliases:
+                canonical.setdefault(alias, doc_key)
+            first_seen.setdefault(doc_key, doc)
+            fused[doc_key] = fused.get(doc_key, 0.0) + contribution
+    ranked = sorted(fused, key=fused.__getitem__, reverse=True)[:k]
+    return [
+        Document(
+            page_content=first_seen[doc_key].page_content,
+            metadata={**first_seen[doc_key].metadata, "fused_score": fused[doc_key]},
+        )
+        for doc_key in ranked
+    ]
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[Document]],
+    k: Optional[int] = None,
+    weights: Optional[Sequence[float]] = None,
+    rrf_k: int = RRF_K,
+    key: DocumentKey = document_key,
+) -> list[Document]:
+    """Fuse ranked lists with RRF; duplicates across lists are merged by `key`."""
+    weights = weights or [1.0] * len(result_lists)
+    return _fuse(
+        result_lists,
+        lambda i, docs: [weights[i] / (rrf_k + rank) for rank in range(1, len(docs) + 1)],
+        k,
+        key,
+    )
+
+
+def relative_score_fusion(
+    result_lists: Sequence[Sequence[Document]],
+    weights: Sequence[float],
+    k: Optional[int] = None,
+    score_key: str = "score",
+    key: DocumentKey = document_key,
+) -> list[Document]:
+    """Fuse lists by their min-max normalized `metadata[score_key]`, weighted per list."""
+    return _fuse(
+        result_lists,
+        lambda i, docs: [
+            weights[i] * s for s in _min_max([d.metadata.get(score_key, 0.0) for d in docs])
+        ],
+        k,
+        key,
+    )
+
+
+def hybrid_fusion(
+    dense: Sequence[Document],
+    keyword: Sequence[Document],
+    k: Optional[int] = None,
+    alpha: float = 0.5,
+    fusion: str = "relative_score",
+) -> list[Document]:
+    """Fuse dense and keyword results the way Weaviate's `hybrid(alpha=..., fusion_type=...)` does."""
+    weights = [alpha, 1 - alpha]
+    if fusion == "rrf":
+        return reciprocal_rank_fusion([dense, keyword], k=k, weights=weights, key=content_key)
+    if fusion == "relative_score":
+        return relative_score_fusion([dense, keyword], weights=weights, k=k, key=content_key)
+    raise ValueError(f"Unsupported fusion: {fusion}. Expected 'relative_score' or 'rrf'")
+
+
+def fuse_query_results(
+    result_lists: Sequence[Sequence[Document]], k: Optional[int] = None, rrf_k: int = RRF_K
+) -> list[Document]:
+    """One ranked, deduplicated list from the results of several queries.
+
+    Chunks are merged by uuid and content hash and ranked with RRF, so a chunk
+    found by several queries moves up instead of appearing several times. Every
+    returned document has a `uuid` (the content hash if the retriever gave none),
+    so `reduce_docs` can deduplicate across research steps too.
+    """
+    fused = reciprocal_rank_fusion(result_lists, k=k, rrf_k=rrf_k, key=chunk_keys)
+    for doc in fused:
+        if not doc.metadata.get("uuid"):
+            doc.metadata["uuid"] = content_key(doc)
+    return fused
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuse dense results of a `VectorStore` with keyword results of a `BM25Index`.
+
+    Both sides fetch `k` candidates, which are fused with `hybrid_fusion` and cut to `k`.
+    Dense scores are the store's similarity scores, keyword scores BM25 scores.
+    """
+
+    vectorstore: VectorStore
+    keyword_index: BM25Index
+    k: int = 4
+    alpha: float = 0.5
+    fusion: str = "relative_score"
+    search_kwargs: dict[str, Any] = {}
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        dense = [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "score": score})
+            for doc, score in self.vectorstore.similarity_search_with_score(
+                query, k=self.k, **self.search_kwargs
+            )
+        ]
+        keyword = [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "score": score})
+            for doc, score in self.keyword_index.search(query, self.k)
+        ]
+        return hybrid_fusion(dense, keyword, k=self.k, alpha=self.alpha, fusion=self.fusion)
@@ -1,156 +1,230 @@
 """Load html from files, clean up, split, ingest into Weaviate."""
 
+import asyncio
 import logging
 import os
-import re
-from typing import Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator, Optional, Sequence
 
-import weaviate
-from bs4 import BeautifulSoup, SoupStrainer
-from langchain.document_loaders import SitemapLoader
+from bs4 import BeautifulSoup
+from langchain_core.indexing import RecordManager
 from langchain_core.indexing.api import index
-from langchain.indexes import SQLRecordManager
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_weaviate import WeaviateVectorStore
 from langchain_core.documents import Document
-import requests
+from langchain_core.vectorstores import VectorStore
 
 from app.rag.constants import WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME
+from app.rag.answer_cache import bump_index_version
+from app.rag.bm25 import BM25Index
+from app.rag.crawler import AsyncCrawler, CrawlResult
+from app.rag.embedding_cache import cache_stats
 from app.rag.embeddings import get_embeddings_model
-from app.rag.parser import langchain_docs_extractor
+from app.rag.local_store import LocalVectorStore
+from app.rag.page_state import IncrementalTracker, PageStateStore
+from app.rag.parse_pool import ParsePool, ParseTask
+from app.rag.parser import (
+    SINGLE_URL_PARSE_ONLY,
+    SITEMAP_PARSE_ONLY,
+    langchain_docs_extractor,
+    simple_extractor,
+)
+from app.rag.pipeline import iter_async, prepare_chunks, tap_stage
+from app.rag.weaviate_client import weaviate_pool
 from app.config import settings
 
+if TYPE_CHECKING:
+    from langchain.indexes import SQLRecordManager
+
+    from app.rag.vector_writer import BatchedWeaviateVectorStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
  
-WEAVIATE_HOST = settings.WEAVIATE_HOST
-WEAVIATE_PORT = settings.WEAVIATE_PORT
-WEAVIATE_GRPC_PORT = settings.WEAVIATE_GRPC_PORT
 RECORD_MANAGER_DB_URL = settings.RECORD_MANAGER_DB_URL
 
 
-def metadata_extractor(
-    meta: dict, soup: BeautifulSoup, title_suffix: Optional[str] = None
-) -> dict:
-    title_element = soup.find("title")
-    description_element = soup.find("meta", attrs={"name": "description"})
-    html_element = soup.find("html")
-    title = title_element.get_text() if title_element else ""
-    if title_suffix is not None:
-        title += title_suffix
+#########################
+# General Guides and Tutorials
+#########################
 
-    return {
-        "source": meta["loc"],
-        "title": title,
-        "description": description_element.get("content", "")
-        if description_element
-        else "",
-        "language": html_element.get("lang", "") if html_element else "",
-        **meta,
-    }
 
+@dataclass(frozen=True)
+class SitemapSource:
+    """A sitemap to crawl and the function used to extract text from its pages."""
 
-def simple_extractor(html: str | BeautifulSoup) -> str:
-    if isinstance(html, str):
-        soup = BeautifulSoup(html, "lxml")
-    elif isinstance(html, BeautifulSoup):
-        soup = html
-    else:
-        raise ValueError(
-            "Input should be either BeautifulSoup object or an HTML string"
-        )
-    return re.sub(r"\n\n+", "\n\n", soup.text).strip()
+    sitemap_url: str
+    parsing_function: Callable[[BeautifulSoup], str]
+    filter_urls: Optional[tuple[str, ...]] = None
 
 
-#########################
-# General Guides and Tutorials
-#########################
-
+# NOTE: To be deprecated once LangChain docs are migrated to new site.
+LANGCHAIN_PYTHON_DOCS = SitemapSource(
+    "https://python.langchain.com/sitemap.xml",
+    parsing_function=langchain_docs_extractor,
+    filter_urls=("https://python.langchain.com/",),
+)
 
 # NOTE: To be deprecated once LangChain docs are migrated to new site.
+LANGCHAIN_JS_DOCS = SitemapSource(
+    "https://js.langchain.com/sitemap.xml",
+    parsing_function=simple_extractor,
+    filter_urls=("https://js.langchain.com/docs/",),
+)
+
+AGGREGATED_DOCS_SITE = SitemapSource(
+    "https://docs.langchain.com/sitemap.xml",
+    parsing_function=simple_extractor,
+)
+
+def make_crawler(validators: Optional[dict] = None) -> AsyncCrawler:
+    return AsyncCrawler(
+        concurrency=settings.CRAWL_CONCURRENCY,
+        per_host_limit=settings.CRAWL_PER_HOST_LIMIT,
+        max_retries=settings.CRAWL_MAX_RETRIES,
+        timeout=settings.CRAWL_TIMEOUT,
+        headers={"User-Agent": settings.CRAWL_USER_AGENT},
+        validators=validators,
+    )
+
+
+def make_parse_pool() -> ParsePool:
+    return ParsePool(
+        workers=settings.PARSE_WORKERS,
+        chunksize=settings.PARSE_CHUNKSIZE,
+        ordered=settings.PARSE_ORDERED,
+    )
+
+
+async def aiter_sitemap_pages(
+    sources: list[SitemapSource],
+    tracker: Optional[IncrementalTracker] = None,
+) -> AsyncIterator[tuple[CrawlResult, Callable[[BeautifulSoup], str]]]:
+    """Crawl all `sources` concurrently over one connection pool.
+
+    Yields each fetched page together with the parsing function of its source.
+    With a `tracker`, pages whose sitemap lastmod is unchanged are not fetched,
+    the others are fetched conditionally and 304 responses are not yielded.
+    """
+    validators = tracker.validators() if tracker is not None else None
+    async with make_crawler(validators) as crawler:
+        sitemaps = await asyncio.gather(
+            *(crawler.fetch_sitemap(s.sitemap_url, s.filter_urls) for s in sources)
+        )
+        if tracker is not None and not all(sitemaps):
+            # 사이트맵을 못 받아온 경우 해당 페이지들이 삭제된 것으로 처리되지 않도록 함
+            tracker.mark_sitemap_failed()
+        # 여러 사이트맵에 같은 URL이 있으면 먼저 나온 소스의 파서를 사용
+        parsers: dict[str, Callable[[BeautifulSoup], str]] = {}
+        entries = []
+        for source, source_entries in zip(sources, sitemaps):
+            for entry in source_entries:
+                if entry.loc not in parsers:
+                    parsers[entry.loc] = source.parsing_function
+                    if tracker is None or tracker.should_fetch(entry):
+                        entries.append(entry)
+        logger.info(f"Crawling {len(entries)} pages from {len(sources)} sitemaps")
+
+        async for result in crawler.crawl(entries):
+            if tracker is not None and not tracker.on_fetched(result):
+                continue
+            yield result, parsers[result.url]
+
+
+def _iter_parsed_docs(
+    pages: Iterator[tuple[CrawlResult, Callable[[BeautifulSoup], str]]],
+    parse_only: Sequence[str] = SITEMAP_PARSE_ONLY,
+    tracker: Optional[IncrementalTracker] = None,
+) -> Iterator[Document]:
+    # parse 단계: 받아온 페이지를 프로세스 풀에서 파싱해서 Document로 흘려보냄
+    tasks = (
+        ParseTask(
+            content=result.content,
+            parsing_function=parsing_function,
+            meta={**(result.entry.meta if result.entry else {}), "loc": result.url},
+            parse_only=parse_only,
+        )
+        for result, parsing_function in pages
+        if result.content is not None
+    )
+    with make_parse_pool() as pool:
+        for page_content, metadata in pool.map(tasks):
+            if tracker is not None and not tracker.is_changed(metadata["source"], page_content):
+                continue
+            yield Document(page_content=page_content, metadata=metadata)
+
+
+def iter_sitemap_docs(
+    sources: list[SitemapSource], tracker: Optional[IncrementalTracker] = None
+) -> Iterator[Document]:
+    """Stream Documents while the crawl is still running (load → parse stages).
+
+    HTML parsing is CPU bound, so pages are shipped to a process pool
+    (PARSE_WORKERS) instead of being parsed on the crawler's thread.
+    With a `tracker`, pages whose extracted text did not change are dropped.
+    """
+    pages = iter_async(
+        lambda: aiter_sitemap_pages(sources, tracker),
+        max_buffered=settings.INGEST_LOAD_BUFFER,
+    )
+    return _iter_parsed_docs(pages, tracker=tracker)
+
+
+async def aiter_url_pages(
+    urls: Sequence[str], parsing_function: Callable[[BeautifulSoup], str]
+) -> AsyncIterator[tuple[CrawlResult, Callable[[BeautifulSoup], str]]]:
+    """Crawl `urls` (no sitemap) and yield each fetched page with `parsing_function`."""
+    async with make_crawler() as crawler:
+        async for result in crawler.crawl(urls):
+            yield result, parsing_function
+
+
+def iter_url_docs(
+    urls: Sequence[str],
+    parsing_function: Callable[[BeautifulSoup], str] = langchain_docs_extractor,
+) -> Iterator[Document]:
+    """Stream Documents for individual URLs through the same load → parse stages as sitemaps."""
+    pages = iter_async(
+        lambda: aiter_url_pages(urls, parsing_function),
+        max_buffered=settings.INGEST_LOAD_BUFFER,
+    )
+    for doc in _iter_parsed_docs(pages, parse_only=SINGLE_URL_PARSE_ONLY):
+        if not doc.page_content:
+            logger.warning(f"No content extracted from URL: {doc.metadata['source']}")
+            continue
+        logger.debug(f"Loaded {doc.metadata['source']}: {doc.metadata}")
+        yield doc
+
+
+def load_sitemap_docs(sources: list[SitemapSource]) -> list[Document]:
+    return list(iter_sitemap_docs(sources))
+
+
 def load_langchain_python_docs():
-    return SitemapLoader(
-        "https://python.langchain.com/sitemap.xml",
-        filter_urls=["https://python.langchain.com/"],
-        parsing_function=langchain_docs_extractor,
-        default_parser="lxml",
-        bs_kwargs={
-            "parse_only": SoupStrainer(
-                name=("article", "title", "html", "lang", "content")
-            ),
-        },
-        meta_function=metadata_extractor,
-    ).load()
+    return load_sitemap_docs([LANGCHAIN_PYTHON_DOCS])
 
 
-# NOTE: To be deprecated once LangChain docs are migrated to new site.
 def load_langchain_js_docs():
-    return SitemapLoader(
-        "https://js.langchain.com/sitemap.xml",
-        parsing_function=simple_extractor,
-        default_parser="lxml",
-        bs_kwargs={
-            "parse_only": SoupStrainer(
-                name=("article", "title", "html", "lang", "content")
-            )
-        },
-        meta_function=metadata_extractor,
-        filter_urls=["https://js.langchain.com/docs/"],
-    ).load()
+    return load_sitemap_docs([LANGCHAIN_JS_DOCS])
 
 
 def load_aggregated_docs_site():
-    return SitemapLoader(
-        "https://docs.langchain.com/sitemap.xml",
-        parsing_function=simple_extractor,
-        default_parser="lxml",
-        bs_kwargs={
-            "parse_only": SoupStrainer(
-                name=("article", "title", "html", "lang", "content")
-            )
-        },
-        meta_function=metadata_extractor,
-    ).load()
+    return load_sitemap_docs([AGGREGATED_DOCS_SITE])
+
+
+def iter_general_guides_and_tutorials() -> Iterator[Document]:
+    # 세 사이트를 순차적으로 로딩하지 않고 하나의 크롤러로 동시에 수집
+    return iter_sitemap_docs(
+        [LANGCHAIN_PYTHON_DOCS, LANGCHAIN_JS_DOCS, AGGREGATED_DOCS_SITE]
+    )
 
 
 def ingest_general_guides_and_tutorials():
-    langchain_python_docs = load_langchain_python_docs()
-    langchain_js_docs = load_langchain_js_docs()
-    aggregated_site_docs = load_aggregated_docs_site()
-    return langchain_python_docs + langchain_js_docs + aggregated_site_docs
+    return list(iter_general_guides_and_tutorials())
 
 def load_single_url(url: str) -> list[Document]:
     """Load a single URL and extract content using custom functions."""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # HTTP 에러가 발생하면 예외를 발생시킴
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch URL {url}: {e}")
-        return []
-
-    # html 내용 출력 (디버깅 용도)
-    #print(response.text)
-
-    # 필요한 태그만 파싱
-    strainer = SoupStrainer(name=("article", "title", "lang"))
-    #strainer = SoupStrainer(name=("article", "title", "html", "lang", "content"))
-    # 페이지 파싱
-    soup = BeautifulSoup(response.text, "lxml", parse_only=strainer)
-
-    # 기존 메타데이터 및 파싱 함수 재사용
-    meta = {"loc": url}
-    metadata = metadata_extractor(meta, soup)
-    print(metadata)
-
-    page_content = langchain_docs_extractor(soup)
-    print(page_content)
-
-    if not page_content:
-        logger.warning(f"No content extracted from URL: {url}")
-        return []
-
-    doc = Document(page_content=page_content, metadata=metadata)
-    return [doc]
+    return list(iter_url_docs([url]))
 
 def load_notion_docs(path:str):
     from langchain_community.document_loaders import NotionDirectoryLoader
@@ -162,52 +236,153 @@ def load_notion_docs(path:str):
         document.metadata["title"] = source
     return documents
 
-def ingest_docs():
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=4000, chunk_overlap=200)
-    embedding = get_embeddings_model()
+def make_writer_kwargs() -> dict:
+    return {
+        "embed_batch_size": settings.EMBED_BATCH_SIZE,
+        "embed_concurrency": settings.EMBED_CONCURRENCY,
+        "requests_per_second": settings.EMBED_REQUESTS_PER_SECOND,
+        "batch_mode": settings.WEAVIATE_BATCH_MODE,
+        "batch_size": settings.WEAVIATE_BATCH_SIZE,
+        "concurrent_requests": settings.WEAVIATE_BATCH_CONCURRENCY,
+        "max_retries": settings.WRITE_MAX_RETRIES,
+    }
 
-    with weaviate.connect_to_local(
-        host = WEAVIATE_HOST,
-        port = WEAVIATE_PORT,
-        grpc_port = WEAVIATE_GRPC_PORT,
-        skip_init_checks=True
-    ) as weaviate_client:
-        # General Guides and Tutorials
-        general_guides_and_tutorials_vectorstore = WeaviateVectorStore(
-            client=weaviate_client,
-            index_name=WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME,
-            text_key="text",
-            embedding=embedding,
-            # Weaviate에 쿼리 시 반환할 메타데이터 속성 지정, 따라서 Ducument 저장시에 해당 속성이 반드시 포함되어야 함
+
+def make_vectorstore(weaviate_client, embedding) -> "BatchedWeaviateVectorStore":
+    # weaviate/langchain_weaviate는 import 비용이 크므로 Weaviate에 적재할 때만 로딩
+    from app.rag.vector_writer import BatchedWeaviateVectorStore
+
+    # 임베딩 요청을 병렬로 보내고 gRPC 배치로 업서트하는 writer를 사용
+    return BatchedWeaviateVectorStore(
+        client=weaviate_client,
+        index_name=WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME,
+        text_key="text",
+        embedding=embedding,
+        # Weaviate에 쿼리 시 반환할 메타데이터 속성 지정, 따라서 Ducument 저장시에 해당 속성이 반드시 포함되어야 함
+        attributes=["source", "title"],
+        writer_kwargs=make_writer_kwargs(),
+    )
+
+
+@contextmanager
+def open_vectorstore(embedding) -> Iterator[VectorStore]:
+    """The store ingest writes to (VECTOR_STORE_PROVIDER: "weaviate" or the embedded "local")."""
+    if settings.VECTOR_STORE_PROVIDER == "local":
+        store = LocalVectorStore(
+            settings.LOCAL_STORE_PATH,
+            embedding,
             attributes=["source", "title"],
+            nprobe=settings.LOCAL_STORE_NPROBE,
         )
-
-        # 어떤 문서가 이미 벡터 저장소에 저장되었는지 기록하는 역활을 함 (중복 인덱싱 방지)
-        record_manager = SQLRecordManager(
-            namespace=f"weaviate/{WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME}",
-            db_url=RECORD_MANAGER_DB_URL,
+        try:
+            yield store
+            # 저장소가 충분히 커졌거나 학습 이후 두 배로 늘어났으면 IVF 인덱스를 (재)학습
+            min_rows = settings.LOCAL_STORE_ANN_MIN_ROWS
+            if min_rows and store.needs_ann_training(min_rows):
+                store.train_ann()
+                logger.info(f"Trained ANN index: {store.ann.nlist} lists over {len(store)} rows")
+        finally:
+            store.close()
+        return
+
+    with weaviate_pool.client() as weaviate_client:
+        store = make_vectorstore(weaviate_client, embedding)
+        try:
+            yield store
+        finally:
+            logger.info(f"Write stats: {store.writer.report}")
+            store.writer.close()
+
+
+def make_record_manager() -> "SQLRecordManager":
+    from langchain.indexes import SQLRecordManager
+
+    # 어떤 문서가 이미 벡터 저장소에 저장되었는지 기록하는 역활을 함 (중복 인덱싱 방지)
+    # 저장소마다 기록을 따로 관리 (weaviate/..., local/...)
+    namespace = f"{settings.VECTOR_STORE_PROVIDER}/{WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME}"
+    record_manager = SQLRecordManager(
+        namespace=namespace,
+        db_url=RECORD_MANAGER_DB_URL,
+    )
+    record_manager.create_schema()
+    return record_manager
+
+
+def log_vector_count(vectorstore: VectorStore) -> None:
+    if isinstance(vectorstore, LocalVectorStore):
+        num_vecs = len(vectorstore)
+    else:
+        num_vecs = (
+            weaviate_pool.get_client()
+            .collections.get(WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME)
+            .aggregate.over_all()
+            .total_count
         )
-        record_manager.create_schema()
+    logger.info(
+        f"General Guides and Tutorials now has this many vectors: {num_vecs}",
+    )
+
+
+def delete_sources(
+    record_manager: RecordManager,
+    vectorstore: VectorStore,
+    sources: list[str],
+) -> int:
+    """Delete every chunk indexed for `sources` from the vector store and the record manager."""
+    deleted = 0
+    batch_size = settings.INGEST_BATCH_SIZE
+    for start in range(0, len(sources), batch_size):
+        keys = record_manager.list_keys(group_ids=sources[start : start + batch_size])
+        if keys:
+            vectorstore.delete(keys)
+            record_manager.delete_keys(keys)
+            deleted += len(keys)
+    return deleted
+
+
+def invalidate_answers_if_changed(indexing_stats: dict) -> None:
+    """Bump the index version (invalidating cached answers) if this run changed the index."""
+    changed = sum(indexing_stats.get(k, 0) for k in ("num_added", "num_updated", "num_deleted"))
+    if changed:
+        version = bump_index_version()
+        logger.info(f"Index changed ({changed} chunks); new index version {version}")
+
+
+def open_bm25_index() -> Optional[BM25Index]:
+    """The local BM25 index kept next to Weaviate, or None if BM25_INDEX_PATH is empty."""
+    if not settings.BM25_INDEX_PATH:
+        return None
+    bm25_index = BM25Index.load_or_create(settings.BM25_INDEX_PATH)
+    # 이번 실행에서 다시 들어온 source는 예전 청크를 대체
+    bm25_index.begin_refresh()
+    return bm25_index
+
+
+def ingest_docs():
+    if settings.INGEST_MODE == "incremental":
+        return ingest_docs_incremental()
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=4000, chunk_overlap=200)
+    embedding = get_embeddings_model()
+
+    # General Guides and Tutorials
+    with open_vectorstore(embedding) as general_guides_and_tutorials_vectorstore:
+        record_manager = make_record_manager()
         
-        # general_guides_and_tutorials_docs = ingest_general_guides_and_tutorials()
-        general_guides_and_tutorials_docs = load_single_url("https://m.sports.naver.com/kbaseball/article/022/0004086120")
+        # 문서는 제너레이터로 흘려보내며 처리 (전체 문서를 메모리에 올리지 않음)
+        # general_guides_and_tutorials_docs = iter_general_guides_and_tutorials()
+        general_guides_and_tutorials_docs = iter_url_docs(["https://m.sports.naver.com/kbaseball/article/022/0004086120"])
         # general_guides_and_tutorials_docs = load_notion_docs("/Users/haram/Desktop/카카오부캠/코드/rag-base/test/sample_data/test")
 
-        # 문서 분할
-        docs_transformed = text_splitter.split_documents(
-            general_guides_and_tutorials_docs
-        )
-        # 필터링: 너무 짧은 문서는 제외
-        docs_transformed = [
-            doc for doc in docs_transformed if len(doc.page_content) > 10
-        ]
-
+        # 문서 분할 -> 필터링(너무 짧은 문서는 제외) -> 메타데이터 보정
         # weaviate에서 검색을 할 때 metadata의 source, title 필드를 포함하여 반환하도록 설정했으므로 문서에도 해당 필드가 반드시 포함되어야 함
-        for doc in docs_transformed:
-            if "source" not in doc.metadata:
-                doc.metadata["source"] = ""
-            if "title" not in doc.metadata:
-                doc.metadata["title"] = ""
+        docs_transformed = prepare_chunks(general_guides_and_tutorials_docs, text_splitter)
+        # 같은 청크로 로컬 BM25 인덱스도 갱신 (오프라인 테스트 / 키워드 검색용)
+        bm25_index = open_bm25_index()
+        if bm25_index is not None:
+            docs_transformed = tap_stage(docs_transformed, bm25_index.add)
+
+        # index()는 batch_size 단위로 청크를 가져와 임베딩/업서트 하므로 크롤링과 적재가 겹쳐서 진행됨
         indexing_stats = index(
             docs_transformed,
             record_manager,
@@ -217,17 +392,63 @@ def ingest_docs():
             # 만약 source_id_key를 사용하지 않는다면 page_content의 해시값이 고유 식별자로 사용됨
             # 문서가 조금만 바껴도 해시값이 달라지기 때문에 동일 문서임에도 불구하고 중복 인덱싱될 수 있음, 따라서 source와 같은 고유 식별자를 사용하는 것이 좋음
             source_id_key="source",
+            batch_size=settings.INGEST_BATCH_SIZE,
             force_update=(os.environ.get("FORCE_UPDATE") or "false").lower() == "true",
         )
         logger.info(f"Indexing stats: {indexing_stats}")
-        num_vecs = (
-            weaviate_client.collections.get(
-                WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME
-            )
-            .aggregate.over_all()
-            .total_count
-        )
-        logger.info(
-            f"General Guides and Tutorials now has this many vectors: {num_vecs}",
-        )
+        logger.info(f"Embedding cache stats: {cache_stats(embedding)}")
+        if bm25_index is not None:
+            # cleanup="full"과 같이 이번에 들어오지 않은 source는 제거
+            bm25_index.end_refresh(remove_missing=True)
+            bm25_index.save(settings.BM25_INDEX_PATH)
+        invalidate_answers_if_changed(indexing_stats)
+        log_vector_count(general_guides_and_tutorials_vectorstore)
+
+
+def ingest_docs_incremental(sources: Optional[list[SitemapSource]] = None):
+    """Re-ingest only the sitemap pages that changed since the last run.
+
+    Unchanged pages are skipped by sitemap lastmod, conditional GET and content
+    fingerprint (see `app.rag.page_state`). Changed pages are re-indexed with
+    `cleanup="incremental"`, which replaces their old chunks, and pages that
+    disappeared from the sitemaps are deleted.
+    """
+    sources = sources or [LANGCHAIN_PYTHON_DOCS, LANGCHAIN_JS_DOCS, AGGREGATED_DOCS_SITE]
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=4000, chunk_overlap=200)
+    embedding = get_embeddings_model()
 
+    with open_vectorstore(embedding) as vectorstore:
+        record_manager = make_record_manager()
+        # 페이지 상태는 record manager와 같은 DB, 같은 namespace에 저장
+        page_states = PageStateStore(record_manager.namespace, engine=record_manager.engine)
+        page_states.create_schema()
+        tracker = IncrementalTracker(previous=page_states.load())
+
+        chunks = prepare_chunks(iter_sitemap_docs(sources, tracker), text_splitter)
+        bm25_index = open_bm25_index()
+        if bm25_index is not None:
+            chunks = tap_stage(chunks, bm25_index.add)
+        indexing_stats = index(
+            chunks,
+            record_manager,
+            vectorstore,
+            # 이번 실행에서 다시 인덱싱한 source의 예전 청크만 정리 (변경되지 않은 페이지는 그대로 둠)
+            cleanup="incremental",
+            source_id_key="source",
+            batch_size=settings.INGEST_BATCH_SIZE,
+        )
+        removed = tracker.removed()
+        num_deleted = delete_sources(record_manager, vectorstore, removed)
+        if bm25_index is not None:
+            bm25_index.end_refresh()
+            bm25_index.remove_sources(removed)
+            bm25_index.save(settings.BM25_INDEX_PATH)
+        # 인덱싱이 끝난 뒤에만 상태를 저장 (중간에 실패하면 다음 실행에서 다시 처리됨)
+        tracker.commit(page_states)
+
+        logger.info(f"Page stats: {tracker.stats}, removed pages: {len(removed)}")
+        indexing_stats["num_deleted"] += num_deleted
+        logger.info(f"Indexing stats: {indexing_stats}")
+        logger.info(f"Embedding cache stats: {cache_stats(embedding)}")
+        invalidate_answers_if_changed(indexing_stats)
+        log_vector_count(vectorstore)
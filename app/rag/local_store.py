@@ -0,0 +1,442 @@
+"""Embedded in-process vector store backed by a memory-mapped NumPy file.
+
+For tests, offline work and small deployments that don't want to run Weaviate.
+
+Layout of a store directory:
+
+    vectors.f32     float32 rows, L2-normalized, appended in insertion order (np.memmap)
+    meta.sqlite3    sidecar: row -> uuid, text, metadata JSON, deleted flag;
+                    settings (dim, generation)
+
+Opening a store only maps the vector file and reads the uuid/deleted columns,
+so load time does not grow with text size. A query is one matrix-vector
+product over the mapped rows plus `np.argpartition` for the top k; text and
+metadata are read from SQLite for those k rows only.
+
+Updates append a new row and tombstone the old one (ids are stable, as
+`index()` expects), `compact()` rewrites the files without tombstones.
+Every write bumps the `generation` setting in the same transaction, so
+`refresh()` in another process (e.g. the API while ingest runs) detects adds,
+deletes and compactions with a single primary-key lookup.
+
+Once the store grows large, `train_ann()` builds an IVF index
+(`app.rag.ann`); queries then score only the `nprobe` closest lists. Pass
+`exact=True` to force a full scan.
+
+Classes:
+    LocalVectorStore: `VectorStore` implementation usable by `index()` and as a retriever.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from app.rag.ann import IVFIndex
+
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.sqlite3"
+
+
+class LocalVectorStore(VectorStore):
+    """Exact cosine-similarity search over a memory-mapped float32 matrix.
+
+    Args:
+        path: Store directory (created if missing).
+        embedding: Embedding model for texts and queries.
+        text_key: Name under which the text is kept (for parity with `WeaviateVectorStore`).
+        attributes: Metadata keys returned with search results; None returns all of them.
+        nprobe: IVF lists scanned per query once an ANN index was trained.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embedding: Embeddings,
+        text_key: str = "text",
+        attributes: Optional[list[str]] = None,
+        nprobe: int = 8,
+    ):
+        self.path = path
+        self.nprobe = nprobe
+        self._embedding = embedding
+        self.text_key = text_key
+        self.attributes = attributes
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, VECTORS_FILE)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(path, META_FILE), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                uuid TEXT NOT NULL,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rows_uuid ON rows (uuid)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    # 로딩 / 매핑
+
+    def _load(self) -> None:
+        row = self._conn.execute("SELECT value FROM settings WHERE key = 'dim'").fetchone()
+        self.dim: Optional[int] = int(row[0]) if row else None
+        self._generation = self._read_generation()
+        rows = self._conn.execute("SELECT uuid, deleted FROM rows ORDER BY row").fetchall()
+        self._uuids: list[str] = [r[0] for r in rows]
+        self._live = np.array([not r[1] for r in rows], dtype=bool)
+        self._row_of: dict[str, int] = {
+            u: i for i, u in enumerate(self._uuids) if self._live[i]
+        }
+        self._vectors: Optional[np.ndarray] = None
+        self._mapped_rows = 0
+        self.ann = IVFIndex.load(self.path)
+        if self.ann is not None:
+            indexed = len(self.ann.assignments)
+            if indexed > len(self._uuids):
+                # 커밋되지 않은 쓰기가 남긴 뒤쪽 항목은 무시 (다음 쓰기에서 덮어씀)
+                self.ann.assignments = self.ann.assignments[: len(self._uuids)]
+            elif indexed < len(self._uuids):
+                self.ann.write_rows(self.path, indexed, self.ann.assign(self._matrix()[indexed:]))
+
+    def _matrix(self) -> np.ndarray:
+        """The mapped vectors, remapped when rows were appended since the last call."""
+        n = len(self._uuids)
+        if self._vectors is None or self._mapped_rows != n:
+            if n == 0 or self.dim is None:
+                self._vectors = np.empty((0, self.dim or 0), dtype=np.float32)
+            else:
+                self._vectors = np.memmap(
+                    self._vectors_path, dtype=np.float32, mode="r", shape=(n, self.dim)
+                )
+            self._mapped_rows = n
+        return self._vectors
+
+    def _write_vectors(self, start: int, matrix: np.ndarray) -> None:
+        # 덧붙이기("ab") 대신 커밋된 행 수 위치에 쓰고 뒤를 잘라냄:
+        # 크래시나 INSERT 실패로 커밋되지 못한 이전 쓰기의 벡터가 남아 있어도 행 번호가 어긋나지 않음
+        mode = "r+b" if os.path.exists(self._vectors_path) else "wb"
+        with open(self._vectors_path, mode) as f:
+            f.seek(start * matrix.shape[1] * matrix.itemsize)
+            f.write(matrix.tobytes())
+            f.truncate()
+
+    def refresh(self) -> None:
+        """Pick up writes (adds, deletes, compaction) made by another process since the last load."""
+        with self._lock:
+            if self._read_generation() != self._generation:
+                self._load()
+
+    def _read_generation(self) -> int:
+        row = self._conn.execute("SELECT value FROM settings WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_generation(self) -> None:
+        # 락을 잡은 상태에서, 변경과 같은 트랜잭션 안에서 호출 (commit 전)
+        self._conn.execute(
+            """
+            INSERT INTO settings (key, value) VALUES ('generation', '1')
+            ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """
+        )
+        self._generation = self._read_generation()
+
+    def __len__(self) -> int:
+        return int(self._live.sum())
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._conn.close()
+
+    # 쓰기
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]] | np.ndarray,
+        metadatas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> list[str]:
+        """Add precomputed vectors. Existing ids are replaced (tombstoned and appended)."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(texts):
+            raise ValueError("vectors must be a (len(texts), dim) matrix")
+        if len(texts) == 0:
+            return []
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        ids = [str(i) for i in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+
+        with self._lock:
+            # 다른 프로세스가 커밋한 행까지 반영한 뒤, 커밋된 행 수를 새 행의 시작 번호로 사용
+            self.refresh()
+            if self.dim is not None and matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Expected {self.dim}-dimensional vectors, got {matrix.shape[1]}"
+                )
+            dim = matrix.shape[1]
+            replaced = [self._row_of[i] for i in ids if i in self._row_of]
+            start = len(self._uuids)
+            try:
+                if self.dim is None:
+                    self._conn.execute(
+                        "INSERT INTO settings (key, value) VALUES ('dim', ?)", (str(dim),)
+                    )
+                self._write_vectors(start, matrix)
+                if self.ann is not None:
+                    self.ann.write_rows(self.path, start, self.ann.assign(matrix))
+                self._conn.executemany(
+                    "UPDATE rows SET deleted = 1 WHERE row = ?", [(r,) for r in replaced]
+                )
+                self._conn.executemany(
+                    "INSERT INTO rows (row, uuid, text, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (start + i, ids[i], text, json.dumps(metadatas[i], default=str))
+                        for i, text in enumerate(texts)
+                    ],
+                )
+                self._bump_generation()
+                self._conn.commit()
+            except BaseException:
+                # 파일에 쓴 벡터/ANN 항목은 커밋된 행 뒤에 있으므로 무시되고 다음 쓰기에서 덮어씀
+                self._conn.rollback()
+                raise
+            self.dim = dim
+
+            self._live[replaced] = False
+            self._live = np.concatenate([self._live, np.ones(len(texts), dtype=bool)])
+            self._uuids.extend(ids)
+            for offset, doc_id in enumerate(ids):
+                self._row_of[doc_id] = start + offset
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[list[dict]] = None,
+        *,
+        ids: Optional[list[str]] = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_embeddings(texts, vectors, metadatas, ids)
+
+    def delete(self, ids: Optional[list[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        with self._lock:
+            rows = [self._row_of.pop(str(i)) for i in ids if str(i) in self._row_of]
+            if rows:
+                self._conn.executemany(
+                    "UPDATE rows SET deleted = 1 WHERE row = ?", [(r,) for r in rows]
+                )
+                self._bump_generation()
+                self._conn.commit()
+                self._live[rows] = False
+        return True
+
+    def compact(self) -> None:
+        """Rewrite the vector file and the sidecar without deleted rows."""
+        with self._lock:
+            live_rows = np.flatnonzero(self._live)
+            if len(live_rows) == len(self._uuids):
+                return
+            matrix = np.array(self._matrix()[live_rows]) if len(live_rows) else None
+            self._vectors = None
+            tmp_path = f"{self._vectors_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                if matrix is not None:
+                    f.write(matrix.tobytes())
+            os.replace(tmp_path, self._vectors_path)
+            if self.ann is not None:
+                assignments = np.asarray(self.ann.assignments)[live_rows]
+                IVFIndex(self.ann.centroids, assignments, self.ann.trained_rows).save(self.path)
+            # 남은 행의 번호를 0부터 다시 매김 (벡터 파일의 행 순서와 동일)
+            live = self._conn.execute(
+                "SELECT uuid, text, metadata FROM rows WHERE deleted = 0 ORDER BY row"
+            ).fetchall()
+            self._conn.execute("DELETE FROM rows")
+            self._conn.executemany(
+                "INSERT INTO rows (row, uuid, text, metadata) VALUES (?, ?, ?, ?)",
+                [(row, *values) for row, values in enumerate(live)],
+            )
+            self._bump_generation()
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+            self._load()
+
+    # ANN 인덱스
+
+    def train_ann(
+        self, nlist: Optional[int] = None, sample_size: int = 100_000, iterations: int = 10
+    ) -> IVFIndex:
+        """(Re)train the IVF index on the current rows and persist it."""
+        with self._lock:
+            if not self._uuids:
+                raise ValueError("Cannot train an ANN index on an empty store")
+            ann = IVFIndex.train(
+                self._matrix(), nlist=nlist, sample_size=sample_size, iterations=iterations
+            )
+            ann.save(self.path)
+            self.ann = ann
+            # 다른 프로세스도 새 인덱스를 읽도록
+            self._bump_generation()
+            self._conn.commit()
+            return ann
+
+    def drop_ann(self) -> None:
+        with self._lock:
+            IVFIndex.remove(self.path)
+            self.ann = None
+            self._bump_generation()
+            self._conn.commit()
+
+    def needs_ann_training(self, min_rows: int, growth: float = 2.0) -> bool:
+        """True past `min_rows` rows if there is no index yet or the store grew `growth`x since training."""
+        rows = len(self._uuids)
+        if rows < min_rows:
+            return False
+        return self.ann is None or rows >= growth * self.ann.trained_rows
+
+    # 검색
+
+    def _top_k(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+    ) -> list[tuple[int, float]]:
+        with self._lock:
+            matrix = self._matrix()
+            live = self._live
+            ann = self.ann
+        if k <= 0 or len(matrix) == 0:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        query = query / norm if norm else query
+
+        if ann is not None and not exact:
+            rows = ann.candidates(query, nprobe or self.nprobe)
+            rows = rows[live[rows]]
+            # 후보가 k개보다 적으면 정확도를 위해 전체 검색으로 대체
+            if len(rows) >= k:
+                scores = matrix[rows] @ query
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                return [(int(rows[i]), float(scores[i])) for i in top]
+
+        scores = matrix @ query
+        scores = np.where(live, scores, -np.inf)
+        k = min(k, int(live.sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def _documents(
+        self, hits: list[tuple[int, float]], return_uuids: bool
+    ) -> list[tuple[Document, float]]:
+        if not hits:
+            return []
+        placeholders = ",".join("?" * len(hits))
+        with self._lock:
+            rows = {
+                row: (doc_id, text, metadata)
+                for row, doc_id, text, metadata in self._conn.execute(
+                    f"SELECT row, uuid, text, metadata FROM rows WHERE row IN ({placeholders})",
+                    [row for row, _ in hits],
+                )
+            }
+        results = []
+        for row, score in hits:
+            doc_id, text, metadata = rows[row]
+            metadata = json.loads(metadata)
+            if self.attributes is not None:
+                metadata = {key: metadata[key] for key in self.attributes if key in metadata}
+            if return_uuids:
+                metadata["uuid"] = doc_id
+            results.append((Document(id=doc_id, page_content=text, metadata=metadata), score))
+        return results
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        return_uuids: bool = False,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        # compact가 두 읽기 사이에 행 번호를 바꾸지 않도록 락을 잡은 채로 검색 + 문서 조회
+        with self._lock:
+            hits = self._top_k(embedding, k, nprobe=nprobe, exact=exact)
+            return self._documents(hits, return_uuids)
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        vector = self._embedding.embed_query(query)
+        return self.similarity_search_by_vector_with_score(vector, k, **kwargs)
+
+    def similarity_search_by_vector(
+        self, embedding: list[float], k: int = 4, **kwargs: Any
+    ) -> list[Document]:
+        hits = self.similarity_search_by_vector_with_score(embedding, k, **kwargs)
+        return [doc for doc, _ in hits]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # 정규화된 벡터의 코사인 유사도(-1~1)를 0~1로 변환
+        return lambda score: (score + 1) / 2
+
+    def get_by_ids(self, ids: Sequence[str], /) -> list[Document]:
+        with self._lock:
+            hits = [(self._row_of[i], 0.0) for i in ids if i in self._row_of]
+            return [doc for doc, _ in self._documents(hits, return_uuids=False)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: list[str],
+        embedding: Embeddings,
+        metadatas: Optional[list[dict]] = None,
+        *,
+        ids: Optional[list[str]] = None,
+        path: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        if path is None:
+            raise ValueError("LocalVectorStore.from_texts requires a store directory (path=...)")
+        store = cls(path, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,242 @@
+"""Per-URL crawl state for incremental re-ingest.
+
+For every indexed page we remember the sitemap `lastmod`, the HTTP validators
+(ETag / Last-Modified) and a fingerprint of the extracted text. On the next run
+a page is skipped
+
+1. before fetching, when its sitemap `lastmod` did not change,
+2. after fetching, when the server answers 304 to a conditional GET,
+3. after parsing, when the normalized text has the same fingerprint,
+
+so only pages whose content actually changed are split, embedded and upserted.
+The state lives in the record manager DB next to SQLRecordManager's table.
+
+Classes:
+    PageState: Stored state of one URL.
+    PageStateStore: SQLAlchemy table of PageState rows per namespace.
+    IncrementalTracker: Decides what to skip during one run and collects the new state.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Optional
+
+from sqlalchemy import (
+    Column,
+    Float,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    insert,
+    select,
+)
+from sqlalchemy.engine import Engine
+
+from app.rag.crawler import CrawlResult, SitemapEntry
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def content_fingerprint(text: str) -> str:
+    """sha256 of the text with whitespace collapsed, so re-wrapped markup doesn't count as a change."""
+    normalized = _WHITESPACE_RE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageState:
+    url: str
+    lastmod: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprint: Optional[str] = None
+    updated_at: float = 0.0
+
+
+_metadata = MetaData()
+
+page_state_table = Table(
+    "page_state",
+    _metadata,
+    Column("namespace", String, primary_key=True),
+    Column("url", String, primary_key=True),
+    Column("lastmod", String, nullable=True),
+    Column("etag", String, nullable=True),
+    Column("last_modified", String, nullable=True),
+    Column("fingerprint", String, nullable=True),
+    Column("updated_at", Float, nullable=False),
+)
+
+
+class PageStateStore:
+    """PageState rows of one namespace (the same namespace as the record manager)."""
+
+    def __init__(
+        self, namespace: str, db_url: Optional[str] = None, engine: Optional[Engine] = None
+    ):
+        if engine is None:
+            if db_url is None:
+                raise ValueError("Either db_url or engine must be given")
+            engine = create_engine(db_url)
+        self.namespace = namespace
+        self.engine = engine
+
+    def create_schema(self) -> None:
+        _metadata.create_all(self.engine, tables=[page_state_table])
+
+    def load(self) -> dict[str, PageState]:
+        query = select(page_state_table).where(page_state_table.c.namespace == self.namespace)
+        with self.engine.connect() as conn:
+            return {
+                row.url: PageState(
+                    url=row.url,
+                    lastmod=row.lastmod,
+                    etag=row.etag,
+                    last_modified=row.last_modified,
+                    fingerprint=row.fingerprint,
+                    updated_at=row.updated_at,
+                )
+                for row in conn.execute(query)
+            }
+
+    def upsert_many(self, states: Iterable[PageState]) -> None:
+        rows = [
+            {
+                "namespace": self.namespace,
+                "url": s.url,
+                "lastmod": s.lastmod,
+                "etag": s.etag,
+                "last_modified": s.last_modified,
+                "fingerprint": s.fingerprint,
+                "updated_at": s.updated_at,
+            }
+            for s in states
+        ]
+        if not rows:
+            return
+        # DB 종류(sqlite/postgres)에 상관없이 동작하도록 delete 후 insert
+        with self.engine.begin() as conn:
+            self._delete(conn, [row["url"] for row in rows])
+            conn.execute(insert(page_state_table), rows)
+
+    def delete_many(self, urls: Iterable[str]) -> None:
+        urls = list(urls)
+        if urls:
+            with self.engine.begin() as conn:
+                self._delete(conn, urls)
+
+    def _delete(self, conn, urls: list[str]) -> None:
+        for start in range(0, len(urls), 500):
+            conn.execute(
+                delete(page_state_table).where(
+                    page_state_table.c.namespace == self.namespace,
+                    page_state_table.c.url.in_(urls[start : start + 500]),
+                )
+            )
+
+
+@dataclass
+class IncrementalTracker:
+    """Skip decisions and state updates for one incremental run.
+
+    The crawl stage calls `should_fetch` / `validators` / `on_fetched`, the parse stage
+    calls `is_changed`. New state is only kept in memory and written with `commit`
+    once indexing succeeded, so a failed run is simply redone next time.
+    """
+
+    previous: dict[str, PageState]
+    seen: set[str] = field(default_factory=set)
+    updates: dict[str, PageState] = field(default_factory=dict)
+    stats: dict[str, int] = field(
+        default_factory=lambda: {
+            "skipped_lastmod": 0,
+            "not_modified": 0,
+            "unchanged_content": 0,
+            "changed": 0,
+            "new": 0,
+        }
+    )
+    sitemaps_complete: bool = True
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        # 파싱이 끝날 때까지 응답 본문 대신 검증자(etag, last_modified, lastmod)만 보관
+        self._fetched: dict[str, tuple[Optional[str], Optional[str], Optional[str]]] = {}
+
+    def mark_sitemap_failed(self) -> None:
+        """An empty or failed sitemap: don't treat its pages as deleted this run."""
+        self.sitemaps_complete = False
+
+    def should_fetch(self, entry: SitemapEntry) -> bool:
+        with self._lock:
+            self.seen.add(entry.loc)
+            state = self.previous.get(entry.loc)
+            if (
+                state is not None
+                and state.fingerprint is not None
+                and entry.lastmod
+                and entry.lastmod == state.lastmod
+            ):
+                self.stats["skipped_lastmod"] += 1
+                return False
+            return True
+
+    def validators(self) -> dict[str, tuple[Optional[str], Optional[str]]]:
+        """Conditional GET validators for the crawler (only pages that were fully indexed)."""
+        return {
+            url: (state.etag, state.last_modified)
+            for url, state in self.previous.items()
+            if state.fingerprint is not None and (state.etag or state.last_modified)
+        }
+
+    def on_fetched(self, result: CrawlResult) -> bool:
+        """Record a crawl result. Returns False if the page should not be parsed."""
+        lastmod = result.entry.lastmod if result.entry else None
+        with self._lock:
+            if result.not_modified:
+                self.stats["not_modified"] += 1
+                state = self.previous.get(result.url)
+                if state is not None:
+                    self.updates[result.url] = replace(
+                        state, lastmod=lastmod, updated_at=time.time()
+                    )
+                return False
+            if result.content is None:
+                return False
+            self._fetched[result.url] = (result.etag, result.last_modified, lastmod)
+            return True
+
+    def is_changed(self, url: str, page_content: str) -> bool:
+        """Compare the parsed text with the stored fingerprint and record the new state."""
+        fingerprint = content_fingerprint(page_content)
+        with self._lock:
+            etag, last_modified, lastmod = self._fetched.pop(url, (None, None, None))
+            state = self.previous.get(url)
+            self.updates[url] = PageState(
+                url=url,
+                lastmod=lastmod,
+                etag=etag,
+                last_modified=last_modified,
+                fingerprint=fingerprint,
+                updated_at=time.time(),
+            )
+            if state is not None and state.fingerprint == fingerprint:
+                self.stats["unchanged_content"] += 1
+                return False
+            self.stats["new" if state is None else "changed"] += 1
+            return True
+
+    def removed(self) -> list[str]:
+        """URLs indexed before that no sitemap lists anymore."""
+        if not self.sitemaps_complete:
+            return []
+        return [url for url in self.previous if url not in self.seen]
+
+    def commit(self, store: PageStateStore) -> None:
+        store.upsert_many(self.updates.values())
+        store.delete_many(self.removed())
@@ -0,0 +1,111 @@
+"""Process-pool HTML parsing stage.
+
+BeautifulSoup/lxml parsing is CPU bound and holds the GIL, so during large
+ingests it is shipped to worker processes. Tasks are submitted in chunks and
+only a bounded number of chunks are in flight, which keeps the stage
+streaming: raw pages are pulled from the upstream generator only as fast as
+the workers finish them.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from bs4 import BeautifulSoup
+
+from app.rag.parser import SITEMAP_PARSE_ONLY, parse_html
+
+
+@dataclass
+class ParseTask:
+    """Raw page to parse. `parsing_function` must be a module-level (picklable) function."""
+
+    content: bytes | str
+    parsing_function: Callable[[BeautifulSoup], str]
+    meta: dict
+    parse_only: Optional[Sequence[str]] = SITEMAP_PARSE_ONLY
+
+
+def _parse_task(task: ParseTask) -> tuple[str, dict]:
+    return parse_html(task.content, task.parsing_function, task.meta, task.parse_only)
+
+
+def _parse_chunk(tasks: list[ParseTask]) -> list[tuple[str, dict]]:
+    return [_parse_task(t) for t in tasks]
+
+
+def _chunks(tasks: Iterable[ParseTask], size: int) -> Iterator[list[ParseTask]]:
+    chunk: list[ParseTask] = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ParsePool:
+    """Parse pages into (page_content, metadata) on a `ProcessPoolExecutor`.
+
+    Args:
+        workers: Number of worker processes. None uses every core, 0 parses inline.
+        chunksize: Number of pages sent to a worker per task.
+        ordered: Yield results in input order. Unordered mode yields whichever
+            chunk finishes first, so one slow page does not stall the others.
+        max_pending: Maximum number of chunks in flight (default: 2 per worker).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunksize: int = 8,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+    ):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunksize = max(1, chunksize)
+        self.ordered = ordered
+        self.max_pending = max_pending or max(1, self.workers * 2)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParsePool":
+        if self.workers > 0:
+            # 크롤러 스레드가 떠 있는 프로세스에서 fork 하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def map(self, tasks: Iterable[ParseTask]) -> Iterator[tuple[str, dict]]:
+        """Yield (page_content, metadata) for every task."""
+        if self._executor is None:
+            for task in tasks:
+                yield _parse_task(task)
+            return
+
+        pending: deque[Future] = deque()
+        for chunk in _chunks(tasks, self.chunksize):
+            pending.append(self._executor.submit(_parse_chunk, chunk))
+            if len(pending) >= self.max_pending:
+                yield from self._drain(pending, until=self.max_pending - 1)
+        yield from self._drain(pending, until=0)
+
+    def _drain(self, pending: deque[Future], until: int) -> Iterator[tuple[str, dict]]:
+        while len(pending) > until:
+            if self.ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            yield from future.result()
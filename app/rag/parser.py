@@ -1,7 +1,61 @@
 import re
-from typing import Generator
+from typing import Callable, Generator, Optional, Sequence
 
-from bs4 import BeautifulSoup, Doctype, NavigableString, Tag
+from bs4 import BeautifulSoup, Doctype, NavigableString, SoupStrainer, Tag, UnicodeDammit
+from lxml import etree
+
+# SitemapLoader에서 사용하던 것과 동일하게 필요한 태그만 파싱
+SITEMAP_PARSE_ONLY = ("article", "title", "html", "lang", "content")
+# 단일 URL 로딩은 본문(article)과 제목만 파싱
+SINGLE_URL_PARSE_ONLY = ("article", "title", "lang")
+
+
+def metadata_extractor(
+    meta: dict, soup: BeautifulSoup, title_suffix: Optional[str] = None
+) -> dict:
+    title_element = soup.find("title")
+    description_element = soup.find("meta", attrs={"name": "description"})
+    html_element = soup.find("html")
+    title = title_element.get_text() if title_element else ""
+    if title_suffix is not None:
+        title += title_suffix
+
+    return {
+        "source": meta["loc"],
+        "title": title,
+        "description": description_element.get("content", "")
+        if description_element
+        else "",
+        "language": html_element.get("lang", "") if html_element else "",
+        **meta,
+    }
+
+
+def simple_extractor(html: str | BeautifulSoup) -> str:
+    if isinstance(html, str):
+        soup = BeautifulSoup(html, "lxml")
+    elif isinstance(html, BeautifulSoup):
+        soup = html
+    else:
+        raise ValueError(
+            "Input should be either BeautifulSoup object or an HTML string"
+        )
+    return re.sub(r"\n\n+", "\n\n", soup.text).strip()
+
+
+def parse_html(
+    content: bytes | str,
+    parsing_function: Callable[[BeautifulSoup], str],
+    meta: dict,
+    parse_only: Optional[Sequence[str]] = SITEMAP_PARSE_ONLY,
+) -> tuple[str, dict]:
+    """Parse a raw page into (page_content, metadata).
+
+    Module-level and free of app settings so it can run inside worker processes.
+    """
+    strainer = SoupStrainer(name=tuple(parse_only)) if parse_only else None
+    soup = BeautifulSoup(content, "lxml", parse_only=strainer)
+    return parsing_function(soup), metadata_extractor(meta, soup)
 
 
 def langchain_docs_extractor(soup: BeautifulSoup) -> str:
@@ -108,3 +162,221 @@ def langchain_docs_extractor(soup: BeautifulSoup) -> str:
 
     joined = "".join(get_text(soup))
     return re.sub(r"\n\n+", "\n\n", joined).strip()
+
+
+#########################
+# lxml-native extractor
+#########################
+
+# langchain_docs_extractor와 같은 마크다운을 만들되, 정규식은 미리 컴파일하고
+# lxml 트리를 재귀 없이 한 번만 순회한다.
+_LANGUAGE_RE = re.compile(r"language-\w+")
+_NEWLINES_RE = re.compile(r"\n\n+")
+
+_SKIP_TAGS = frozenset(("nav", "footer", "aside", "script", "style"))
+_HEADING_LEVELS = {f"h{i}": i for i in range(1, 7)}
+# BeautifulSoup은 이 태그 안의 문자열을 별도 타입으로 만들어 get_text()에서 제외함
+_STRING_CONTAINER_TAGS = frozenset(("rt", "rp", "template"))
+
+_PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+_HTML_PARSER = etree.HTMLParser()
+
+
+def _classes(element: etree._Element) -> list[str]:
+    return (element.get("class") or "").split()
+
+
+def _is_element(node: etree._Element) -> bool:
+    return isinstance(node.tag, str)
+
+
+def _find_all(
+    element: etree._Element, predicate: Callable[[etree._Element], bool]
+) -> list[etree._Element]:
+    """Descendants matching `predicate` in document order, ignoring skipped subtrees."""
+    found = []
+    stack = [c for c in reversed(element) if _is_element(c)]
+    while stack:
+        node = stack.pop()
+        if node.tag in _SKIP_TAGS:
+            continue
+        if predicate(node):
+            found.append(node)
+        stack.extend(c for c in reversed(node) if _is_element(c))
+    return found
+
+
+def _find(
+    element: etree._Element, predicate: Callable[[etree._Element], bool]
+) -> Optional[etree._Element]:
+    found = _find_all(element, predicate)
+    return found[0] if found else None
+
+
+def _normalize(text: str, preserve: bool) -> str:
+    """BeautifulSoup collapses whitespace-only strings to a newline or a space outside <pre>."""
+    if preserve or text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _in_preserve(element: etree._Element) -> bool:
+    if element.tag in _PRESERVE_WHITESPACE_TAGS:
+        return True
+    return any(a.tag in _PRESERVE_WHITESPACE_TAGS for a in element.iterancestors())
+
+
+def _expand(element: etree._Element, preserve: bool) -> list:
+    """Stack items that emit the text and children of `element` in document order.
+
+    Strings are pushed already normalized; elements are pushed as (element, preserve).
+    """
+    preserve = preserve or element.tag in _PRESERVE_WHITESPACE_TAGS
+    items: list = []
+    for child in reversed(element):
+        if child.tail:
+            items.append(_normalize(child.tail, preserve))
+        items.append((child, preserve))
+    if element.text:
+        items.append(_normalize(element.text, preserve))
+    return items
+
+
+def _text(element: etree._Element, strip: bool = False, preserve: Optional[bool] = None) -> str:
+    """Equivalent of BeautifulSoup's `Tag.get_text()` on the cleaned tree."""
+    if preserve is None:
+        preserve = _in_preserve(element)
+    parts: list[str] = []
+    stack = _expand(element, preserve)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if strip:
+                item = item.strip()
+            if item:
+                parts.append(item)
+            continue
+        node, node_preserve = item
+        tag = node.tag
+        if not isinstance(tag, str) or tag in _SKIP_TAGS or tag in _STRING_CONTAINER_TAGS:
+            continue
+        stack.extend(_expand(node, node_preserve))
+    return "".join(parts)
+
+
+def _code_block(code: etree._Element) -> Optional[str]:
+    parent = code.getparent()
+    if parent is None or parent.tag != "pre":
+        return None
+    language = next((c for c in _classes(parent) if _LANGUAGE_RE.match(c)), None)
+    language = "" if language is None else language.split("-")[1]
+
+    lines = [
+        "".join(
+            _text(token, preserve=True)
+            for token in _find_all(span, lambda e: e.tag == "span")
+        )
+        for span in _find_all(
+            code, lambda e: e.tag == "span" and "token-line" in _classes(e)
+        )
+    ]
+    code_content = "\n".join(lines)
+    return f"```{language}\n{code_content}\n```\n\n"
+
+
+def _table(table: etree._Element) -> str:
+    parts = []
+    thead = _find(table, lambda e: e.tag == "thead")
+    if thead is not None:
+        headers = _find_all(thead, lambda e: e.tag == "th")
+        if headers:
+            parts.append("| " + " | ".join(_text(h) for h in headers) + " |\n")
+            parts.append("| " + " | ".join("----" for _ in headers) + " |\n")
+    tbody = _find(table, lambda e: e.tag == "tbody")
+    if tbody is not None:
+        for row in _find_all(tbody, lambda e: e.tag == "tr"):
+            cells = _find_all(row, lambda e: e.tag == "td")
+            parts.append("| " + " | ".join(_text(c, strip=True) for c in cells) + " |\n")
+    parts.append("\n\n")
+    return "".join(parts)
+
+
+def lxml_docs_extractor(html: str | bytes | etree._Element) -> str:
+    """Single-pass lxml equivalent of `langchain_docs_extractor`.
+
+    Produces the same Markdown as `langchain_docs_extractor(BeautifulSoup(html, "lxml"))`
+    without building a BeautifulSoup tree: skipped tags are pruned during the walk
+    instead of being decomposed up front, and the walk uses an explicit stack.
+
+    The one known difference is text nested inside several `<rt>`/`<template>`
+    elements, which BeautifulSoup types inconsistently; docs pages don't use them.
+    """
+    if isinstance(html, bytes):
+        # BeautifulSoup과 같은 방식으로 인코딩을 판별 (meta charset, BOM, utf-8 순)
+        html = UnicodeDammit(html, is_html=True).unicode_markup or ""
+    if isinstance(html, str):
+        if not html.strip():
+            return ""
+        root = etree.fromstring(html, _HTML_PARSER)
+        if root is None:
+            return ""
+        # <html> 밖의 최상위 주석도 BeautifulSoup에서는 문서의 자식이므로 함께 처리
+        top_level = [*reversed(list(root.itersiblings(preceding=True))), root, *root.itersiblings()]
+    else:
+        top_level = [html]
+
+    out: list[str] = []
+    stack: list = [(node, False) for node in reversed(top_level)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+        node, preserve = item
+        tag = node.tag
+        if not isinstance(tag, str):
+            # 주석은 NavigableString으로 취급되어 그대로 출력됨
+            if tag is etree.Comment and node.text:
+                out.append(_normalize(node.text, preserve))
+            continue
+        if tag in _SKIP_TAGS or tag == "button":
+            continue
+
+        if tag in _HEADING_LEVELS:
+            out.append(f"{'#' * _HEADING_LEVELS[tag]} {_text(node, preserve=preserve)}\n\n")
+        elif tag == "a":
+            out.append(f"[{_text(node, preserve=preserve)}]({node.get('href')})")
+        elif tag == "img":
+            out.append(f"![{node.get('alt', '')}]({node.get('src')})")
+        elif tag in ("strong", "b"):
+            out.append(f"**{_text(node, preserve=preserve)}**")
+        elif tag in ("em", "i"):
+            out.append(f"_{_text(node, preserve=preserve)}_")
+        elif tag == "br":
+            out.append("\n")
+        elif tag == "code":
+            block = _code_block(node)
+            out.append(block if block is not None else f"`{_text(node, preserve=preserve)}`")
+        elif tag == "p":
+            stack.append("\n\n")
+            stack.extend(_expand(node, preserve))
+        elif tag in ("ul", "ol"):
+            items = [c for c in node if c.tag == "li"]
+            for i in range(len(items) - 1, -1, -1):
+                stack.append("\n\n")
+                stack.extend(_expand(items[i], preserve))
+                stack.append("- " if tag == "ul" else f"{i + 1}. ")
+        elif tag == "div" and "tabs-container" in _classes(node):
+            tabs = _find_all(node, lambda e: e.tag == "li" and e.get("role") == "tab")
+            panels = _find_all(node, lambda e: e.tag == "div" and e.get("role") == "tabpanel")
+            for tab, panel in reversed(list(zip(tabs, panels))):
+                stack.extend(_expand(panel, preserve))
+                stack.append(f"{_text(tab, strip=True)}\n")
+        elif tag == "table":
+            out.append(_table(node))
+        else:
+            stack.extend(_expand(node, preserve))
+
+    return _NEWLINES_RE.sub("\n\n", "".join(out)).strip()
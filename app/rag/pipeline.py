@@ -0,0 +1,119 @@
+"""Generator stages of the ingest pipeline.
+
+load → parse → split → filter → (embed → upsert)
+                                    ↘ tap (e.g. local BM25 index)
+
+Every stage consumes and yields lazily, so only a bounded number of pages and
+chunks are alive at any time. The load stage runs the async crawler on a
+background thread and hands results over through a bounded queue; when the
+downstream stages (ultimately `index()` embedding and upserting a batch) fall
+behind, the queue fills up and the crawler pauses. `index()` itself pulls
+`batch_size` chunks at a time, embeds and writes them, so Weaviate receives
+the first batches while the crawl is still running.
+"""
+
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from langchain_core.documents import Document
+from langchain_text_splitters import TextSplitter
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def iter_async(
+    make_agen: Callable[[], AsyncIterator[T]], max_buffered: int = 64
+) -> Iterator[T]:
+    """Drive an async generator on a background thread and yield its items synchronously.
+
+    At most `max_buffered` items wait in the hand-off queue (backpressure limit).
+    Closing the returned generator early stops the producer.
+    """
+    items: queue.Queue = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        # 소비자가 중단하면 막혀 있던 put도 빠져나올 수 있도록 타임아웃을 두고 반복
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce() -> None:
+        loop = asyncio.get_running_loop()
+        agen = make_agen()
+        try:
+            async for item in agen:
+                if not await loop.run_in_executor(None, put, item):
+                    break
+        finally:
+            await agen.aclose()
+
+    def run() -> None:
+        try:
+            asyncio.run(produce())
+        except BaseException as e:  # 소비자 쪽에서 다시 raise
+            put(_StageError(e))
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=run, name="ingest-load", daemon=True)
+    thread.start()
+    try:
+        while (item := items.get()) is not _DONE:
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def split_stage(docs: Iterable[Document], splitter: TextSplitter) -> Iterator[Document]:
+    """Split one document at a time, so chunks of a source are emitted contiguously."""
+    for doc in docs:
+        yield from splitter.split_documents([doc])
+
+
+def filter_stage(chunks: Iterable[Document], min_length: int = 10) -> Iterator[Document]:
+    """Drop chunks that are too short to be useful."""
+    for chunk in chunks:
+        if len(chunk.page_content) > min_length:
+            yield chunk
+
+
+def ensure_metadata_stage(
+    chunks: Iterable[Document], keys: Sequence[str] = ("source", "title")
+) -> Iterator[Document]:
+    """Make sure every chunk carries the attributes Weaviate returns on queries."""
+    for chunk in chunks:
+        for key in keys:
+            chunk.metadata.setdefault(key, "")
+        yield chunk
+
+
+def tap_stage(chunks: Iterable[T], callback: Callable[[T], None]) -> Iterator[T]:
+    """Pass chunks through unchanged, handing each one to `callback` on the way."""
+    for chunk in chunks:
+        callback(chunk)
+        yield chunk
+
+
+def prepare_chunks(
+    docs: Iterable[Document], splitter: TextSplitter, min_length: int = 10
+) -> Iterator[Document]:
+    """split → filter → ensure_metadata."""
+    return ensure_metadata_stage(filter_stage(split_stage(docs, splitter), min_length))
+
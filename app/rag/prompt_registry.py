@@ -0,0 +1,167 @@
+"""Lazily loaded LangSmith prompts backed by an on-disk snapshot.
+
+Pulling a prompt from the LangSmith hub is a network round trip, so prompts are
+not pulled at import time. `PromptRegistry.get` reads them from a JSON snapshot
+on first use:
+
+    {"version": 1, "prompts": {"<key>": {"identifier", "commit_hash", "template", "fetched_at"}}}
+
+`refresh` updates the snapshot. For every prompt it asks the hub for the latest
+commit hash (a metadata request) and pulls the prompt only if that hash differs
+from the snapshot. `start_background_refresh` runs `refresh` periodically in a
+daemon thread, so API workers pick up new prompt versions without a restart,
+and a worker (or test run) without network access keeps using the snapshot.
+
+The snapshot can be created ahead of time (e.g. while building an image) with
+
+    python -m app.rag.retrieval_graph.propmts.prompts_langsmith
+
+Classes:
+    PromptRegistry: Prompt templates by key, loaded from the snapshot and refreshed from the hub.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def _template(manifest: dict[str, Any]) -> str:
+    # pull_prompt(...).messages[0].prompt.template 과 같은 값 (첫 번째 메시지의 템플릿)
+    from langchain_core.load import load
+
+    # 프롬프트 템플릿만 들어 있으므로 langchain_core 클래스만 허용하고 환경 변수의 secret은 읽지 않음
+    prompt = load(manifest, allowed_objects="core", secrets_from_env=False)
+    return prompt.messages[0].prompt.template
+
+
+class PromptRegistry:
+    """Prompt templates by key.
+
+    Args:
+        identifiers: Key -> LangSmith hub identifier, e.g. "owner/prompt-name".
+        snapshot_path: JSON snapshot file the prompts are loaded from and saved to.
+        client_factory: Builds the `langsmith.Client` used by `refresh`.
+    """
+
+    def __init__(
+        self,
+        identifiers: dict[str, str],
+        snapshot_path: str,
+        client_factory: Callable[[], Any],
+    ):
+        self.identifiers = identifiers
+        self.snapshot_path = snapshot_path
+        self.client_factory = client_factory
+        self._entries: Optional[dict[str, dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        # 락을 잡은 상태에서 호출
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.snapshot_path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except FileNotFoundError:
+                logger.warning(
+                    f"No prompt snapshot at {self.snapshot_path}; "
+                    "LangSmith prompts are empty until the first refresh"
+                )
+            except (OSError, ValueError):
+                logger.warning(f"Unreadable prompt snapshot at {self.snapshot_path}", exc_info=True)
+            else:
+                if snapshot.get("version") == SNAPSHOT_VERSION:
+                    self._entries = snapshot.get("prompts", {})
+                else:
+                    logger.warning(f"Ignoring prompt snapshot version {snapshot.get('version')}")
+        return self._entries
+
+    def get(self, key: str) -> str:
+        """The template of `key` ("" if it is neither in the snapshot nor refreshed yet)."""
+        if key not in self.identifiers:
+            raise KeyError(f"Unknown prompt: {key}")
+        with self._lock:
+            entry = self._load().get(key)
+        return entry["template"] if entry else ""
+
+    def commit_hash(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._load().get(key)
+        return entry["commit_hash"] if entry else None
+
+    def save(self) -> None:
+        with self._lock:
+            snapshot = {"version": SNAPSHOT_VERSION, "prompts": dict(self._load())}
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 임시 파일에 쓰고 교체: 다른 워커가 읽는 도중에 잘린 파일을 보지 않도록
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def refresh(self) -> list[str]:
+        """Pull the prompts whose hub commit differs from the snapshot and save it.
+
+        Returns:
+            list[str]: Keys of the prompts that changed.
+        """
+        client = self.client_factory()
+        changed = []
+        for key, identifier in self.identifiers.items():
+            try:
+                current = self.commit_hash(key)
+                prompt = client.get_prompt(identifier)
+                latest = prompt.last_commit_hash if prompt is not None else None
+                if current is not None and latest == current:
+                    continue
+                commit = client.pull_prompt_commit(identifier)
+                entry = {
+                    "identifier": identifier,
+                    "commit_hash": commit.commit_hash,
+                    "template": _template(commit.manifest),
+                    "fetched_at": time.time(),
+                }
+            except Exception:
+                # 하나가 실패해도 나머지 프롬프트와 기존 스냅샷 값은 계속 사용
+                logger.warning(f"Failed to refresh prompt {identifier}", exc_info=True)
+                continue
+            with self._lock:
+                self._load()[key] = entry
+            changed.append(key)
+        if changed:
+            self.save()
+            logger.info(f"Refreshed prompts: {', '.join(changed)}")
+        return changed
+
+    def start_background_refresh(self, interval: float) -> None:
+        """Refresh now and then every `interval` seconds in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.warning("Prompt refresh failed", exc_info=True)
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="prompt-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+        self._thread = None
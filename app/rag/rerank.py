@@ -0,0 +1,172 @@
+"""Rerank the researched documents before they are sent to the response model.
+
+The researcher returns every fused chunk of every research step. Only the best
+`top_n` of them should end up in the response prompt, so a cheap CPU-side
+scorer re-orders them against the user's question:
+
+- "lexical" (default): BM25 over the candidate set itself (`app.rag.bm25`), so
+  exact identifiers in the question weigh heavily.
+- "hybrid": the lexical score blended with the cosine similarity of the query
+  and chunk embeddings. Chunk embeddings come from the embedding cache that
+  ingest filled; candidates missing from it are embedded on every request, so
+  this is opt-in.
+- "none": keep the retrieval order.
+
+Other scorers (e.g. a cross-encoder) can be plugged in with `register_reranker`.
+
+Classes:
+    Reranker: Scores (query, document) pairs in batches and keeps the top n.
+    LexicalReranker: BM25 scores over the candidates.
+    HybridReranker: Lexical scores blended with embedding similarity.
+"""
+
+import asyncio
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from app.rag.bm25 import BM25Index
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    if not len(scores):
+        return scores
+    low, high = scores.min(), scores.max()
+    if high == low:
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
+
+
+class Reranker:
+    """Keep the original order (base class of the scoring rerankers).
+
+    Subclasses implement `score`, and `ascore` if scoring does I/O.
+
+    Args:
+        batch_size: Number of documents scored per batch.
+    """
+
+    def __init__(self, batch_size: int = 64):
+        self.batch_size = batch_size
+
+    def score(self, query: str, docs: Sequence[Document]) -> list[float]:
+        # 원래 순서를 유지하도록 앞쪽 문서일수록 높은 점수
+        return [float(len(docs) - i) for i in range(len(docs))]
+
+    async def ascore(self, query: str, docs: Sequence[Document]) -> list[float]:
+        return await asyncio.to_thread(self.score, query, docs)
+
+    def _top_n(
+        self, docs: Sequence[Document], scores: Sequence[float], top_n: Optional[int]
+    ) -> list[Document]:
+        order = sorted(range(len(docs)), key=lambda i: scores[i], reverse=True)[:top_n]
+        return [
+            Document(
+                page_content=docs[i].page_content,
+                metadata={**docs[i].metadata, "rerank_score": float(scores[i])},
+            )
+            for i in order
+        ]
+
+    def rerank(
+        self, query: str, docs: Sequence[Document], top_n: Optional[int] = None
+    ) -> list[Document]:
+        """Documents sorted by score (best first), cut to `top_n`, with `metadata["rerank_score"]`."""
+        return self._top_n(docs, self.score(query, docs), top_n)
+
+    async def arerank(
+        self, query: str, docs: Sequence[Document], top_n: Optional[int] = None
+    ) -> list[Document]:
+        return self._top_n(docs, await self.ascore(query, docs), top_n)
+
+
+class LexicalReranker(Reranker):
+    """BM25 of the query over the candidate documents, min-max normalized to [0, 1]."""
+
+    def score(self, query: str, docs: Sequence[Document]) -> list[float]:
+        index = BM25Index()
+        # 후보 문서만으로 작은 BM25 인덱스를 만들어 IDF도 후보 집합 기준으로 계산
+        for i, doc in enumerate(docs):
+            index.add(Document(page_content=doc.page_content, metadata={"source": str(i)}))
+        scores = np.zeros(len(docs))
+        for doc, score in index.search(query, k=len(docs)):
+            scores[int(doc.metadata["source"])] = score
+        return _min_max(scores).tolist()
+
+
+class HybridReranker(LexicalReranker):
+    """`weight * cosine(query, chunk) + (1 - weight) * lexical score`.
+
+    Args:
+        embeddings: Model used for the query and chunk vectors (ideally the cached ingest model).
+        weight: Share of the embedding similarity in the final score.
+        batch_size: Number of chunks embedded per request.
+    """
+
+    def __init__(self, embeddings: Embeddings, weight: float = 0.5, batch_size: int = 64):
+        super().__init__(batch_size=batch_size)
+        self.embeddings = embeddings
+        self.weight = weight
+
+    def _blend(
+        self,
+        query: str,
+        docs: Sequence[Document],
+        query_vector: list[float],
+        doc_vectors: list[list[float]],
+    ) -> list[float]:
+        matrix = np.asarray(doc_vectors, dtype=np.float32)
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+        similarity = (matrix @ vector) / np.where(norms == 0, 1, norms)
+        lexical = np.asarray(super().score(query, docs))
+        return (self.weight * similarity + (1 - self.weight) * lexical).tolist()
+
+    def _batches(self, docs: Sequence[Document]) -> list[list[str]]:
+        texts = [doc.page_content for doc in docs]
+        return [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def score(self, query: str, docs: Sequence[Document]) -> list[float]:
+        if not docs:
+            return []
+        doc_vectors = [
+            vector for batch in self._batches(docs) for vector in self.embeddings.embed_documents(batch)
+        ]
+        return self._blend(query, docs, self.embeddings.embed_query(query), doc_vectors)
+
+    async def ascore(self, query: str, docs: Sequence[Document]) -> list[float]:
+        if not docs:
+            return []
+        # 쿼리와 모든 배치를 동시에 임베딩
+        query_vector, *batches = await asyncio.gather(
+            self.embeddings.aembed_query(query),
+            *(self.embeddings.aembed_documents(batch) for batch in self._batches(docs)),
+        )
+        doc_vectors = [vector for batch in batches for vector in batch]
+        # BM25 계산은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        return await asyncio.to_thread(self._blend, query, docs, query_vector, doc_vectors)
+
+
+# 이름 -> (임베딩 모델을 받아) Reranker를 만드는 함수
+RERANKERS: dict[str, Callable[[Embeddings], Reranker]] = {
+    "none": lambda embeddings: Reranker(),
+    "lexical": lambda embeddings: LexicalReranker(),
+    "hybrid": lambda embeddings: HybridReranker(embeddings),
+}
+
+
+def register_reranker(name: str, factory: Callable[[Embeddings], Reranker]) -> None:
+    """Make a custom reranker selectable with `AgentConfiguration.reranker = name`."""
+    RERANKERS[name] = factory
+
+
+def make_reranker(name: str, embeddings: Embeddings) -> Reranker:
+    try:
+        factory = RERANKERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported reranker: {name}. Expected one of: {', '.join(RERANKERS)}"
+        ) from None
+    return factory(embeddings)
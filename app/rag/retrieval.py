@@ -1,47 +1,80 @@
+import os
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Iterator
 
-import weaviate
 from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.runnables import RunnableConfig
-from langchain_weaviate import WeaviateVectorStore
 
-from app.rag.configuration import BaseConfiguration
-from app.rag.constants import WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME
 from app.config import settings
+from app.rag.bm25 import BM25Index, BM25Retriever
+from app.rag.fusion import HybridRetriever
+from app.rag.local_store import LocalVectorStore
 
-WEAVIATE_HOST = settings.WEAVIATE_HOST
-WEAVIATE_PORT = settings.WEAVIATE_PORT
-WEAVIATE_GRPC_PORT = settings.WEAVIATE_GRPC_PORT
+from app.rag.configuration import BaseConfiguration
+from app.rag.constants import WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME
+from app.rag.embedding_cache import with_embedding_cache
+from app.rag.utils import drop_resource, get_or_create_model, get_or_create_resource
+from app.rag.weaviate_client import weaviate_pool
 
 # 임베딩 모델 생성
 # configuration.embedding_model = "openai/text-embedding-3-small"
 # embedding_model = make_text_encoder(configuration.embedding_model)
 def make_text_encoder(model: str) -> Embeddings:
-    """Connect to the configured text encoder."""
+    """Connect to the configured text encoder (cached per provider/model)."""
     provider, model = model.split("/", maxsplit=1)
     match provider:
         case "openai":
             from langchain_openai import OpenAIEmbeddings
 
-            return OpenAIEmbeddings(model=model)
+            return get_or_create_model(
+                "embeddings",
+                lambda: with_embedding_cache(
+                    OpenAIEmbeddings(model=model), f"{provider}/{model}"
+                ),
+                provider,
+                model,
+            )
         case _:
             raise ValueError(f"Unsupported embedding provider: {provider}")
 
 
+# search_kwargs의 "fusion" 값 -> Weaviate hybrid()의 fusion_type (HybridFusion 멤버 이름)
+FUSION_TYPES = {
+    "relative_score": "RELATIVE_SCORE",
+    "rrf": "RANKED",
+}
+
+
+def make_weaviate_search_kwargs(search_kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Translate the configured search_kwargs to `WeaviateVectorStore` search arguments.
+
+    `WeaviateVectorStore` always runs a hybrid (BM25 + vector) query, so `alpha` is
+    passed through as is and `fusion` selects Weaviate's fusion algorithm.
+    """
+    search_kwargs = dict(search_kwargs)
+    fusion = search_kwargs.pop("fusion", None)
+    if fusion is not None:
+        if fusion not in FUSION_TYPES:
+            raise ValueError(
+                f"Unsupported fusion: {fusion}. Expected one of: {', '.join(FUSION_TYPES)}"
+            )
+        from weaviate.classes.query import HybridFusion
+
+        search_kwargs["fusion_type"] = getattr(HybridFusion, FUSION_TYPES[fusion])
+    return {**search_kwargs, "return_uuids": True}
+
+
 @contextmanager
 def make_weaviate_retriever(
     configuration: BaseConfiguration, embedding_model: Embeddings
 ) -> Iterator[BaseRetriever]:
     
-    # Connect to Weaviate and create a retriever
-    with weaviate.connect_to_local(
-        host = WEAVIATE_HOST,
-        port = WEAVIATE_PORT,
-        grpc_port = WEAVIATE_GRPC_PORT,
-        skip_init_checks=True
-    ) as weaviate_client:
+    # weaviate 관련 패키지는 import 비용이 크므로 Weaviate retriever를 만들 때 로딩
+    from langchain_weaviate import WeaviateVectorStore
+
+    # 프로세스 공유 클라이언트를 빌려서 retriever 생성 (요청마다 connect/close 하지 않음)
+    with weaviate_pool.client() as weaviate_client:
         store = WeaviateVectorStore(
             client=weaviate_client,
             index_name=WEAVIATE_GENERAL_GUIDES_AND_TUTORIALS_INDEX_NAME,
@@ -49,10 +82,72 @@ def make_weaviate_retriever(
             embedding=embedding_model,
             attributes=["source", "title"],
         )
-        search_kwargs = {**configuration.search_kwargs, "return_uuids": True}
+        search_kwargs = make_weaviate_search_kwargs(configuration.search_kwargs)
         yield store.as_retriever(search_kwargs=search_kwargs)
 
 
+def load_bm25_index(path: str) -> BM25Index:
+    """Load the local BM25 index, reloading it when ingest rewrote the file."""
+    if not path or not os.path.exists(path):
+        raise ValueError(f"BM25 index not found at {path!r}, run ingest_docs first")
+    mtime = os.path.getmtime(path)
+    # 경로당 하나만 캐시하고 로딩 시점의 mtime을 함께 저장 (mtime을 키에 넣으면 ingest마다 이전 인덱스가 남음)
+    loaded_mtime, index = get_or_create_resource("bm25", lambda: (mtime, BM25Index.load(path)), path)
+    if loaded_mtime != mtime:
+        drop_resource("bm25", path)
+        _, index = get_or_create_resource("bm25", lambda: (mtime, BM25Index.load(path)), path)
+    return index
+
+
+@contextmanager
+def make_bm25_retriever(configuration: BaseConfiguration) -> Iterator[BaseRetriever]:
+    index = load_bm25_index(settings.BM25_INDEX_PATH)
+    yield BM25Retriever(index=index, k=configuration.search_kwargs.get("k", 4))
+
+
+def load_local_store(path: str, embedding_model: Embeddings, model: str) -> LocalVectorStore:
+    """Open the embedded store once per process; later calls pick up newly ingested rows."""
+    store = get_or_create_resource(
+        "local_store",
+        lambda: LocalVectorStore(
+            path,
+            embedding_model,
+            attributes=["source", "title"],
+            nprobe=settings.LOCAL_STORE_NPROBE,
+        ),
+        path,
+        model,
+    )
+    store.refresh()
+    return store
+
+
+@contextmanager
+def make_local_retriever(
+    configuration: BaseConfiguration, embedding_model: Embeddings
+) -> Iterator[BaseRetriever]:
+    store = load_local_store(
+        settings.LOCAL_STORE_PATH, embedding_model, configuration.embedding_model
+    )
+    search_kwargs = dict(configuration.search_kwargs)
+    alpha = search_kwargs.pop("alpha", None)
+    fusion = search_kwargs.pop("fusion", None)
+    k = search_kwargs.pop("k", 4)
+    if alpha is None and fusion is None:
+        yield store.as_retriever(search_kwargs={**search_kwargs, "k": k, "return_uuids": True})
+        return
+
+    # alpha/fusion이 지정되면 Weaviate hybrid와 같이 로컬 BM25 결과와 융합
+    yield HybridRetriever(
+        vectorstore=store,
+        keyword_index=load_bm25_index(settings.BM25_INDEX_PATH),
+        k=k,
+        alpha=0.5 if alpha is None else alpha,
+        fusion=fusion or "relative_score",
+        search_kwargs={**search_kwargs, "return_uuids": True},
+    )
+
+
 # 메인함수
 @contextmanager
 def make_retriever(
@@ -60,12 +155,21 @@ def make_retriever(
 ) -> Iterator[BaseRetriever]:
     """Create a retriever for the agent, based on the current configuration."""
     configuration = BaseConfiguration.from_runnable_config(config)
-    embedding_model = make_text_encoder(configuration.embedding_model)
     match configuration.retriever_provider:
         case "weaviate":
+            embedding_model = make_text_encoder(configuration.embedding_model)
             with make_weaviate_retriever(configuration, embedding_model) as retriever:
                 yield retriever
 
+        case "local":
+            embedding_model = make_text_encoder(configuration.embedding_model)
+            with make_local_retriever(configuration, embedding_model) as retriever:
+                yield retriever
+
+        case "bm25":
+            with make_bm25_retriever(configuration) as retriever:
+                yield retriever
+
         case _:
             raise ValueError(
                 "Unrecognized retriever_provider in configuration. "
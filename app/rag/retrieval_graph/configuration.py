@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Optional
 
 from app.rag.configuration import BaseConfiguration
 from app.rag.retrieval_graph.propmts import prompts_langsmith
@@ -29,6 +30,50 @@ class AgentConfiguration(BaseConfiguration):
         },
     )
 
+    # research
+
+    research_mode: str = field(
+        default="sequential",
+        metadata={
+            "description": "How the research plan steps are executed: 'sequential' (one after another) "
+            "or 'parallel' (all steps at once, at most max_parallel_research concurrently)."
+        },
+    )
+
+    max_parallel_research: int = field(
+        default=4,
+        metadata={
+            "description": "The maximum number of research steps running at once in parallel mode."
+        },
+    )
+
+    # reranking
+
+    reranker: str = field(
+        default="lexical",
+        metadata={
+            "description": "How the researched documents are reranked before responding: "
+            "'lexical' (BM25 only), 'hybrid' (BM25 + embedding similarity, embeds every candidate "
+            "that is not in the embedding cache), 'none' (retrieval order) "
+            "or a name registered with app.rag.rerank.register_reranker."
+        },
+    )
+
+    rerank_top_n: int = field(
+        default=8,
+        metadata={
+            "description": "The number of reranked documents passed to the response model as context."
+        },
+    )
+
+    context_token_budget: Optional[int] = field(
+        default=None,
+        metadata={
+            "description": "Token budget of the documents in the response prompt. "
+            "Defaults to a per-model budget (app.rag.context.CONTEXT_BUDGETS)."
+        },
+    )
+
     # prompts
     plan_system_prompt: str = field(
         default=prompt_text.JOB_PLAN_GENERATION_SYSTEM_PROMPT,
@@ -45,42 +90,43 @@ class AgentConfiguration(BaseConfiguration):
         metadata={"description": "The system prompt used for generating responses."},
     )
 
+    # LangSmith 프롬프트: import 시 네트워크 요청 없이 처음 사용할 때 스냅샷에서 읽음
     router_system_prompt: str = field(
-        default=prompts_langsmith.ROUTER_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.ROUTER_SYSTEM_PROMPT,
         metadata={
             "description": "The system prompt used for classifying user questions to route them to the correct node."
         },
     )
 
     more_info_system_prompt: str = field(
-        default=prompts_langsmith.MORE_INFO_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.MORE_INFO_SYSTEM_PROMPT,
         metadata={
             "description": "The system prompt used for asking for more information from the user."
         },
     )
 
     general_system_prompt: str = field(
-        default=prompts_langsmith.GENERAL_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.GENERAL_SYSTEM_PROMPT,
         metadata={
             "description": "The system prompt used for responding to general questions."
         },
     )
 
     research_plan_system_prompt: str = field(
-        default=prompts_langsmith.RESEARCH_PLAN_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.RESEARCH_PLAN_SYSTEM_PROMPT,
         metadata={
             "description": "The system prompt used for generating a research plan based on the user's question."
         },
     )
 
     generate_queries_system_prompt: str = field(
-        default=prompts_langsmith.GENERATE_QUERIES_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.GENERATE_QUERIES_SYSTEM_PROMPT,
         metadata={
             "description": "The system prompt used by the researcher to generate queries based on a step in the research plan."
         },
     )
 
     response_system_prompt: str = field(
-        default=prompts_langsmith.RESPONSE_SYSTEM_PROMPT,
+        default_factory=lambda: prompts_langsmith.RESPONSE_SYSTEM_PROMPT,
         metadata={"description": "The system prompt used for generating responses."},
     )
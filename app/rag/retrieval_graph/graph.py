@@ -6,16 +6,33 @@ and key functions for processing & routing user queries, generating research pla
 conducting research, and formulating responses.
 """
 
-from typing import Any, Literal, TypedDict, cast
+import asyncio
+import logging
+import uuid
+import weakref
+from typing import Any, Literal, TypedDict, Union, cast
 
+from langchain_core.documents import Document
 from langchain_core.messages import BaseMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
+from app.rag.context import context_budget, get_token_counter, pack_context
+from app.rag.rerank import make_reranker
+from app.rag.retrieval import make_text_encoder
 from app.rag.retrieval_graph.configuration import AgentConfiguration
 from app.rag.retrieval_graph.researcher_graph.graph import graph as researcher_graph
-from app.rag.retrieval_graph.state import AgentState, InputState
-from app.rag.utils import format_docs, load_chat_model
+from app.rag.retrieval_graph.state import AgentState, InputState, ResearchStepState
+from app.rag.utils import ainvoke_structured, load_chat_model
+
+logger = logging.getLogger(__name__)
+
+
+# 구조화 출력 스키마는 모델 레지스트리의 캐시 키로 쓰이므로 모듈 레벨에 한 번만 정의
+class Plan(TypedDict):
+    """Generate research plan."""
+    steps: list[str]
 
 
 # state - 노드간 상태 관리
@@ -34,30 +51,28 @@ async def create_research_plan(
         dict[str, list[str]]: A dictionary with a 'steps' key containing the list of research steps.
     """
 
-    class Plan(TypedDict):
-        """Generate research plan."""
-        steps: list[str]
-
     configuration = AgentConfiguration.from_runnable_config(config)
     structured_output_kwargs = (
         {"method": "function_calling"} if "openai" in configuration.query_model else {}
     )
 
-    # 내부에서 |(파이프) LCEL문법을 사용하여 Plan 타입으로 출력하도록 함
-    # with_structured_output : return llm | output_parser
-    # 어떻게 동작하지? 프롬프트에서 출력 형식을 지정하는 것인가?
-    model = load_chat_model(configuration.query_model).with_structured_output(
-        Plan, **structured_output_kwargs
-    )
-
     # 프롬프트 메시지 생성
     messages = [
         {"role": "system", "content": configuration.plan_system_prompt}
     ] + state.messages
 
-    # invoke, ainvoke의 차이 : ainvoke는 비동기 함수, invoke는 동기 함수
+    # 내부에서 |(파이프) LCEL문법을 사용하여 Plan 타입으로 출력하도록 함
+    # with_structured_output : return llm | output_parser
+    # 같은 대화/프롬프트/모델로 최근에 만든 계획이 있으면 LLM을 호출하지 않고 재사용
     response = cast(
-        Plan, await model.ainvoke(messages, {"tags": ["langsmith:nostream"]})
+        Plan,
+        await ainvoke_structured(
+            configuration.query_model,
+            Plan,
+            messages,
+            {"tags": ["langsmith:nostream"]},
+            **structured_output_kwargs,
+        ),
     )
 
     # agent state 업데이트
@@ -92,25 +107,113 @@ async def conduct_research(state: AgentState) -> dict[str, Any]:
     return {"documents": result["documents"], "steps": state.steps[1:]}
 
 
-def check_finished(state: AgentState) -> Literal["respond", "conduct_research"]:
+def route_research(
+    state: AgentState, *, config: RunnableConfig
+) -> Union[Literal["conduct_research", "respond"], list[Send]]:
+    """Run the research plan step by step, or fan all steps out at once.
+
+    In "parallel" research mode every step is sent to its own `research_step` task, so the
+    research takes as long as the slowest step instead of the sum of all steps.
+    An empty plan skips research and goes straight to `respond`.
+
+    Args:
+        state (AgentState): The current state of the agent, including the research plan steps.
+        config (RunnableConfig): Configuration with the research mode.
+
+    Returns:
+        Union[Literal["conduct_research", "respond"], list[Send]]: The sequential loop,
+            one Send per step, or `respond` when there is nothing to research.
+    """
+    if not state.steps:
+        # 계획이 비어 있으면 conduct_research에서 steps[0]이 IndexError가 나므로 바로 답변
+        return "respond"
+    configuration = AgentConfiguration.from_runnable_config(config)
+    if configuration.research_mode != "parallel":
+        return "conduct_research"
+    research_id = str(uuid.uuid4())
+    return [
+        Send("research_step", ResearchStepState(step=step, research_id=research_id))
+        for step in state.steps
+    ]
+
+
+# research_id -> 같은 계획의 research_step들이 공유하는 세마포어 (모든 단계가 끝나면 자동으로 제거)
+_research_slots: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+async def research_step(
+    state: ResearchStepState, *, config: RunnableConfig
+) -> dict[str, list[Document]]:
+    """Research one step of the plan (parallel research mode).
+
+    At most `max_parallel_research` steps of the same plan run the researcher graph at once.
+
+    Args:
+        state (ResearchStepState): The step to research and the id of its plan.
+        config (RunnableConfig): Configuration with the concurrency cap.
+
+    Returns:
+        dict[str, list[Document]]: A dictionary with 'documents' containing the research results,
+            merged into AgentState.documents by `reduce_docs`.
+    """
+    configuration = AgentConfiguration.from_runnable_config(config)
+    slots = _research_slots.get(state.research_id)
+    if slots is None:
+        slots = asyncio.Semaphore(max(1, configuration.max_parallel_research))
+        _research_slots[state.research_id] = slots
+    async with slots:
+        result = await researcher_graph.ainvoke({"question": state.step})
+    return {"documents": result["documents"]}
+
+
+def check_finished(state: AgentState) -> Literal["rerank_documents", "conduct_research"]:
     """Determine if the research process is complete or if more research is needed.
 
     This function checks if there are any remaining steps in the research plan:
         - If there are, route back to the `conduct_research` node
-        - Otherwise, route to the `respond` node
+        - Otherwise, route to the `rerank_documents` node
 
     Args:
         state (AgentState): The current state of the agent, including the remaining research steps.
 
     Returns:
-        Literal["respond", "conduct_research"]: The next step to take based on whether research is complete.
+        Literal["rerank_documents", "conduct_research"]: The next step to take based on whether research is complete.
     """
 
     # 연구 계획에 남은 단계가 있는지 확인
     if len(state.steps or []) > 0:
         return "conduct_research"
     else:
-        return "respond"
+        return "rerank_documents"
+
+
+async def rerank_documents(
+    state: AgentState, *, config: RunnableConfig
+) -> dict[str, list[Document]]:
+    """Select the documents that are sent to the response model.
+
+    All research steps together return many chunks. They are reranked against the user's
+    question with the configured reranker and only the best `rerank_top_n` are kept, so the
+    response prompt stays small.
+
+    Args:
+        state (AgentState): The current state of the agent, including the researched documents.
+        config (RunnableConfig): Configuration with the reranker and the number of documents to keep.
+
+    Returns:
+        dict[str, list[Document]]: A dictionary with a 'context_documents' key containing the top documents.
+    """
+    configuration = AgentConfiguration.from_runnable_config(config)
+    reranker = make_reranker(
+        configuration.reranker, make_text_encoder(configuration.embedding_model)
+    )
+    # create_research_plan에서 저장한 사용자의 마지막 질문을 기준으로 재정렬
+    context_documents = await reranker.arerank(
+        state.query, state.documents, top_n=configuration.rerank_top_n
+    )
+    return {"context_documents": context_documents}
 
 
 async def respond(
@@ -129,16 +232,26 @@ async def respond(
     """
     configuration = AgentConfiguration.from_runnable_config(config)
     model = load_chat_model(configuration.response_model)
-    # TODO: add a re-ranker here
-    top_k = 20
-    
-    # 검색한 자료들을 문자열로 포맷팅 하여 컨텍스트로 사용
-    context = format_docs(state.documents[:top_k])
+
+    # rerank_documents가 고른 자료들을 토큰 예산 안에서 문자열로 포맷팅 하여 컨텍스트로 사용
+    # (토크나이저 로딩과 토큰 계산은 CPU 작업이므로 이벤트 루프 밖에서 실행)
+    packed = await asyncio.to_thread(
+        lambda: pack_context(
+            state.context_documents,
+            context_budget(configuration.response_model, configuration.context_token_budget),
+            get_token_counter(configuration.response_model),
+        )
+    )
+    logger.info(
+        f"Packed {len(packed.packed)}/{len(packed.documents)} documents into "
+        f"{packed.tokens}/{packed.budget} tokens; per document: "
+        f"{[(d.index, d.status, d.tokens) for d in packed.documents]}"
+    )
     response = await model.ainvoke(
         [
             {
                 "role": "system",
-                "content": configuration.writing_system_prompt.format(context=context),
+                "content": configuration.writing_system_prompt.format(context=packed.text),
             },
             *state.messages,
         ]
@@ -148,10 +261,12 @@ async def respond(
 
 # 전체 그래프 정의
 """
-Input --START--> create_research_plan -> conduct_research -> respond --END--> Output
-                                                |     ^
-                                                |     |
-                                                ㄴㅡㅡcheck_finished                                           
+Input --START--> create_research_plan -> conduct_research -> rerank_documents -> respond --END--> Output
+                          |                     |     ^           ^
+                          |                     |     |           |
+                          |                     ㄴㅡㅡcheck_finished
+                          |                                       |
+                          ㄴ(parallel) route_research -> research_step (x steps)
 """
 
 # researcher_graph 정의(conduct_research 노드에서 사용)
@@ -171,13 +286,22 @@ Input --START--> generate_queries -> retrieve_documents --END--> Output
 builder = StateGraph(AgentState, input=InputState, context_schema=AgentConfiguration)
 builder.add_node(create_research_plan)
 builder.add_node(conduct_research)
+builder.add_node(research_step)
+builder.add_node(rerank_documents)
 builder.add_node(respond)
 
 builder.add_edge(START, "create_research_plan")
-builder.add_edge("create_research_plan", "conduct_research")
-
-#  check_finished : return "conduct_research" or "respond"
+# research_mode가 "parallel"이면 모든 단계를 research_step으로 동시에 보냄 (Send)
+builder.add_conditional_edges(
+    "create_research_plan",
+    route_research,  # type: ignore
+    path_map=["conduct_research", "research_step", "respond"],
+)
+builder.add_edge("research_step", "rerank_documents")
+
+#  check_finished : return "conduct_research" or "rerank_documents"
 builder.add_conditional_edges("conduct_research", check_finished)
+builder.add_edge("rerank_documents", "respond")
 builder.add_edge("respond", END)
 
 # Compile into a graph object that you can invoke and deploy.
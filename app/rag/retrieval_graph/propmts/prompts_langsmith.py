@@ -1,41 +1,53 @@
+"""Default prompts.
+
+The prompts are LangSmith hub prompts, loaded on first use from the snapshot at
+`settings.PROMPT_SNAPSHOT_PATH` (see `app.rag.prompt_registry`); importing this
+module makes no network requests. `ROUTER_SYSTEM_PROMPT` etc. are still
+available as module attributes.
+
+Run this module to pull the prompts and write the snapshot:
+
+    python -m app.rag.retrieval_graph.propmts.prompts_langsmith
+"""
+
 import os
 
-from langsmith import Client
-
-"""Default prompts."""
-
-client = Client(
-    api_key=os.getenv("LANGCHAIN_PROMPT_API_KEY"),
-    api_url=os.getenv("LANGCHAIN_PROMPT_API_URL"),
-)
-# fetch from langsmith
-ROUTER_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-router-prompt")
-    .messages[0]
-    .prompt.template
-)
-GENERATE_QUERIES_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-generate-queries-prompt")
-    .messages[0]
-    .prompt.template
-)
-MORE_INFO_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-more-info-prompt")
-    .messages[0]
-    .prompt.template
-)
-RESEARCH_PLAN_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-research-plan-prompt")
-    .messages[0]
-    .prompt.template
-)
-GENERAL_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-general-prompt")
-    .messages[0]
-    .prompt.template
-)
-RESPONSE_SYSTEM_PROMPT = (
-    client.pull_prompt("langchain-ai/chat-langchain-response-prompt")
-    .messages[0]
-    .prompt.template
-)
+from app.config import settings
+from app.rag.prompt_registry import PromptRegistry
+
+# 모듈 속성 이름 -> LangSmith 프롬프트
+PROMPTS = {
+    "ROUTER_SYSTEM_PROMPT": "langchain-ai/chat-langchain-router-prompt",
+    "GENERATE_QUERIES_SYSTEM_PROMPT": "langchain-ai/chat-langchain-generate-queries-prompt",
+    "MORE_INFO_SYSTEM_PROMPT": "langchain-ai/chat-langchain-more-info-prompt",
+    "RESEARCH_PLAN_SYSTEM_PROMPT": "langchain-ai/chat-langchain-research-plan-prompt",
+    "GENERAL_SYSTEM_PROMPT": "langchain-ai/chat-langchain-general-prompt",
+    "RESPONSE_SYSTEM_PROMPT": "langchain-ai/chat-langchain-response-prompt",
+}
+
+
+def _client():
+    from langsmith import Client
+
+    return Client(
+        api_key=os.getenv("LANGCHAIN_PROMPT_API_KEY"),
+        api_url=os.getenv("LANGCHAIN_PROMPT_API_URL"),
+    )
+
+
+registry = PromptRegistry(PROMPTS, settings.PROMPT_SNAPSHOT_PATH, _client)
+
+
+def __getattr__(name: str) -> str:
+    # 속성에 처음 접근할 때 스냅샷에서 읽음
+    if name in PROMPTS:
+        return registry.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.basicConfig(level=logging.INFO)
+    changed = registry.refresh()
+    print(f"{len(changed)} prompt(s) updated in {registry.snapshot_path}")
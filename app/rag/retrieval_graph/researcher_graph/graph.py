@@ -4,7 +4,7 @@ This module defines the core structure and functionality of the researcher graph
 which is responsible for generating search queries and retrieving relevant documents.
 """
 
-from typing import cast
+from typing import Any, cast
 
 from langchain_core.documents import Document
 from langchain_core.runnables import RunnableConfig
@@ -13,9 +13,15 @@ from langgraph.types import Send
 from typing_extensions import TypedDict
 
 import app.rag.retrieval as retrieval
+from app.rag.fusion import fuse_query_results
 from app.rag.retrieval_graph.configuration import AgentConfiguration
 from app.rag.retrieval_graph.researcher_graph.state import QueryState, ResearcherState
-from app.rag.utils import load_chat_model
+from app.rag.utils import ainvoke_structured
+
+
+# 구조화 출력 스키마는 모델 레지스트리의 캐시 키로 쓰이므로 모듈 레벨에 한 번만 정의
+class Response(TypedDict):
+    queries: list[str]
 
 
 async def generate_queries(
@@ -33,29 +39,29 @@ async def generate_queries(
         dict[str, list[str]]: A dictionary with a 'queries' key containing the list of generated search queries.
     """
 
-    class Response(TypedDict):
-        queries: list[str]
-
     configuration = AgentConfiguration.from_runnable_config(config)
     structured_output_kwargs = (
         {"method": "function_calling"} if "openai" in configuration.query_model else {}
     )
-    model = load_chat_model(configuration.query_model).with_structured_output(
-        Response, **structured_output_kwargs
-    )
     messages = [
         {"role": "system", "content": configuration.query_system_prompt},
         {"role": "human", "content": state.question},
     ]
+    # 같은 단계/프롬프트/모델로 최근에 생성한 쿼리가 있으면 재사용
     response = cast(
-        Response, await model.ainvoke(messages, {"tags": ["langsmith:nostream"]})
+        Response,
+        await ainvoke_structured(
+            configuration.query_model,
+            Response,
+            messages,
+            {"tags": ["langsmith:nostream"]},
+            **structured_output_kwargs,
+        ),
     )
     return {"queries": response["queries"]}
 
 
-async def retrieve_documents(
-    state: QueryState, *, config: RunnableConfig
-) -> dict[str, list[Document] | int]:
+async def retrieve_documents(state: QueryState, *, config: RunnableConfig) -> dict[str, Any]:
     """Retrieve documents based on a given query.
 
     This function uses a retriever to fetch relevant documents for a given query.
@@ -65,12 +71,31 @@ async def retrieve_documents(
         config (RunnableConfig): Configuration with the retriever used to fetch documents.
 
     Returns:
-        dict[str, list[Document]]: A dictionary with a 'documents' key containing the list of retrieved documents.
+        dict[str, Any]: A dictionary with a 'query_results' key containing the query index and
+            the list of retrieved documents, fused with the other queries by `fuse_documents`.
     """
     with retrieval.make_retriever(config) as retriever:
         response = await retriever.ainvoke(state.query, config)
 
-    return {"documents": response, "query_index": state.query_index}
+    return {"query_results": [(state.query_index, response)], "query_index": state.query_index}
+
+
+def fuse_documents(state: ResearcherState) -> dict[str, list[Document]]:
+    """Merge the results of all queries into one ranked, deduplicated list.
+
+    Overlapping queries return many of the same chunks. Chunks are merged by uuid and
+    content hash and ranked with reciprocal rank fusion, so a chunk found by several
+    queries ranks higher and is passed on (and later formatted into the prompt) once.
+
+    Args:
+        state (ResearcherState): The current state with the per-query results.
+
+    Returns:
+        dict[str, list[Document]]: A dictionary with a 'documents' key containing the fused documents.
+    """
+    # 병렬 실행은 완료 순서가 달라질 수 있으므로 쿼리 순서로 정렬해서 결과를 결정적으로 유지
+    result_lists = [docs for _, docs in sorted(state.query_results, key=lambda r: r[0])]
+    return {"documents": fuse_query_results(result_lists)}
 
 
 def retrieve_in_parallel(state: ResearcherState) -> list[Send]:
@@ -97,22 +122,24 @@ def retrieve_in_parallel(state: ResearcherState) -> list[Send]:
 # Define the graph
 
 """
-Input --START--> generate_queries -> retrieve_documents --END--> Output
-                            |     -> retrieve_documents
-             retrieve_in_parallel -> retrieve_documents
-                            ㄴㅡㅡㅡㅡㅡㅡㅡㅡㅡㅡ|                                           
+Input --START--> generate_queries -> retrieve_documents -> fuse_documents --END--> Output
+                            |     -> retrieve_documents ->|
+             retrieve_in_parallel -> retrieve_documents ->|
+                            ㄴㅡㅡㅡㅡㅡㅡㅡㅡㅡㅡ|
 """
 
 builder = StateGraph(ResearcherState)
 builder.add_node(generate_queries)
 builder.add_node(retrieve_documents)
+builder.add_node(fuse_documents)
 builder.add_edge(START, "generate_queries")
 builder.add_conditional_edges(
     "generate_queries",
     retrieve_in_parallel,  # type: ignore
     path_map=["retrieve_documents"],
 )
-builder.add_edge("retrieve_documents", END)
+builder.add_edge("retrieve_documents", "fuse_documents")
+builder.add_edge("fuse_documents", END)
 # Compile into a graph object that you can invoke and deploy.
 graph = builder.compile()
 graph.name = "ResearcherGraph"
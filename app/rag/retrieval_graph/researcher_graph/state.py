@@ -3,6 +3,7 @@
 This module defines the state structures used in the researcher graph.
 """
 
+import operator
 from dataclasses import dataclass, field
 from typing import Annotated
 
@@ -27,6 +28,10 @@ class ResearcherState:
     """A step in the research plan generated by the retriever agent."""
     queries: list[str] = field(default_factory=list)
     """A list of search queries based on the question that the researcher generates."""
+    query_results: Annotated[list[tuple[int, list[Document]]], operator.add] = field(
+        default_factory=list
+    )
+    """(query_index, documents) of every retrieve_documents run, fused by fuse_documents."""
     documents: Annotated[list[Document], reduce_docs] = field(default_factory=list)
-    """Populated by the retriever. This is a list of documents that the agent can reference."""
+    """Populated by fuse_documents. This is a list of documents that the agent can reference."""
     query_index: Annotated[int, lambda _, y: y]
@@ -58,6 +58,16 @@ class InputState:
         message from `right` will replace the message from `left`."""
 
 
+@dataclass(kw_only=True)
+class ResearchStepState:
+    """Private state of one research_step task when the plan steps run in parallel."""
+
+    step: str
+    """The research plan step to research."""
+    research_id: str
+    """Shared by the steps of one plan; used to cap how many of them run at once."""
+
+
 # This is the primary state of your agent, where you can store any information
 
 
@@ -69,6 +79,8 @@ class AgentState(InputState):
     """A list of steps in the research plan."""
     documents: Annotated[list[Document], reduce_docs] = field(default_factory=list)
     """Populated by the retriever. This is a list of documents that the agent can reference."""
+    context_documents: list[Document] = field(default_factory=list)
+    """The reranked top documents used as the response context."""
     answer: str = field(default="")
     """Final answer. Useful for evaluations"""
     query: str = field(default="")
@@ -3,14 +3,73 @@
 Functions:
     format_docs: Convert documents to an xml-formatted string.
     load_chat_model: Load a chat model from a model name.
+    load_structured_chat_model: Load a chat model wrapped with structured output.
+    ainvoke_structured: Call a structured output model, memoized on its normalized input.
+    reduce_docs: State reducer accumulating documents into a `DocumentList`.
 """
 
-import uuid
-from typing import Any, Literal, Optional, Union
+import copy
+import heapq
+import json
+from typing import Any, Callable, Hashable, Iterable, Literal, Optional, TypeVar, Union
 
-from langchain.chat_models import init_chat_model
 from langchain_core.documents import Document
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+
+from app.config import settings
+from app.core.cache import LRUCache, make_key
+from app.rag.embedding_cache import hash_text
+
+M = TypeVar("M")
+
+# 모델 클라이언트(HTTP 커넥션 풀 포함)를 provider/model/kwargs 기준으로 재사용하기 위한 레지스트리
+model_registry: LRUCache[Hashable, Any] = LRUCache(maxsize=settings.MODEL_REGISTRY_SIZE)
+
+
+def get_or_create_model(kind: str, factory: Callable[[], M], *args: Any, **kwargs: Any) -> M:
+    """Return a cached model instance, creating it with `factory` on first use.
+
+    Args:
+        kind (str): Namespace of the model, e.g. "chat" or "embeddings".
+        factory (Callable[[], M]): Builds the model on a cache miss.
+        *args, **kwargs: Everything that makes the instance unique (provider, model, options).
+    """
+    return model_registry.get_or_set((kind, make_key(*args, **kwargs)), factory)
+
+
+def drop_model(kind: str, *args: Any, **kwargs: Any) -> None:
+    """Remove the instance registered by `get_or_create_model` with the same arguments."""
+    model_registry.pop((kind, make_key(*args, **kwargs)))
+
+
+def _close_resource(key: Hashable, resource: Any) -> None:
+    close = getattr(resource, "close", None)
+    if close is not None:
+        close()
+
+
+# 파일을 연 검색 리소스(BM25 인덱스, 로컬 벡터 스토어)는 모델 클라이언트와 따로 캐시하고, 밀려나면 닫음
+resource_registry: LRUCache[Hashable, Any] = LRUCache(
+    maxsize=settings.RESOURCE_REGISTRY_SIZE, on_evict=_close_resource
+)
+
+
+def get_or_create_resource(kind: str, factory: Callable[[], M], *args: Any, **kwargs: Any) -> M:
+    """Like `get_or_create_model` for resources holding files or connections.
+
+    A resource evicted from the registry is closed if it has a `close()` method.
+    """
+    return resource_registry.get_or_set((kind, make_key(*args, **kwargs)), factory)
+
+
+def drop_resource(kind: str, *args: Any, **kwargs: Any) -> None:
+    """Remove and close the resource registered by `get_or_create_resource` with the same arguments."""
+    key = (kind, make_key(*args, **kwargs))
+    resource = resource_registry.pop(key)
+    if resource is not None:
+        _close_resource(key, resource)
 
 
 def _format_doc(doc: Document) -> str:
@@ -76,10 +135,187 @@ def load_chat_model(fully_specified_name: str) -> BaseChatModel:
         provider = ""
         model = fully_specified_name
 
+    # provider 패키지(langchain_openai 등)까지 로딩하므로 모델을 처음 만들 때 import
+    from langchain.chat_models import init_chat_model
+
     model_kwargs = {"temperature": 0, "stream_usage": True}
     if provider == "google_genai":
         model_kwargs["convert_system_message_to_human"] = True
-    return init_chat_model(model, model_provider=provider, **model_kwargs)
+    return get_or_create_model(
+        "chat",
+        lambda: init_chat_model(model, model_provider=provider, **model_kwargs),
+        provider,
+        model,
+        **model_kwargs,
+    )
+
+
+def load_structured_chat_model(
+    fully_specified_name: str, schema: Any, **structured_output_kwargs: Any
+) -> Runnable:
+    """Load a chat model wrapped with `with_structured_output`.
+
+    The wrapper is cached per (model, schema, kwargs), so `schema` must be a
+    module-level type rather than a class defined inside the calling function.
+
+    Args:
+        fully_specified_name (str): String in the format 'provider/model'.
+        schema (Any): The output schema passed to `with_structured_output`.
+        **structured_output_kwargs: Extra arguments for `with_structured_output`.
+    """
+    return get_or_create_model(
+        "structured_chat",
+        lambda: load_chat_model(fully_specified_name).with_structured_output(
+            schema, **structured_output_kwargs
+        ),
+        fully_specified_name,
+        schema,
+        **structured_output_kwargs,
+    )
+
+
+# 구조화 출력 호출(연구 계획, 쿼리 생성) 결과 캐시: 모델은 temperature 0이므로 같은 입력이면 결과를 재사용
+structured_output_cache: Optional[LRUCache[Hashable, Any]] = (
+    LRUCache(
+        maxsize=settings.STRUCTURED_OUTPUT_CACHE_SIZE, ttl=settings.STRUCTURED_OUTPUT_CACHE_TTL
+    )
+    if settings.STRUCTURED_OUTPUT_CACHE_SIZE > 0
+    else None
+)
+
+_ROLES = {"user": "human", "assistant": "ai"}
+_MISSING = object()
+
+
+def _normalize_message(message: Any) -> tuple[str, str]:
+    if isinstance(message, BaseMessage):
+        role, content = message.type, message.content
+    elif isinstance(message, dict):
+        role, content = message["role"], message["content"]
+    else:
+        role, content = message
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    # 공백/줄바꿈 차이만 있는 입력은 같은 키가 되도록 정규화
+    return _ROLES.get(role, role), " ".join(content.split())
+
+
+async def ainvoke_structured(
+    fully_specified_name: str,
+    schema: Any,
+    messages: list[Any],
+    config: Optional[dict[str, Any]] = None,
+    **structured_output_kwargs: Any,
+) -> Any:
+    """Invoke `load_structured_chat_model(...)` on `messages`, reusing earlier results.
+
+    Results are cached in `structured_output_cache` (bounded, with a TTL) under the
+    model name, the schema and the messages with their whitespace normalized. The
+    system prompt is one of the messages, so changing it changes the key.
+
+    Args:
+        fully_specified_name (str): String in the format 'provider/model'.
+        schema (Any): The output schema passed to `with_structured_output`.
+        messages (list[Any]): Chat messages (dicts, tuples or `BaseMessage`s) of the call.
+        config (Optional[dict[str, Any]]): Runnable config of the call (not part of the key).
+        **structured_output_kwargs: Extra arguments for `with_structured_output`.
+    """
+    model = load_structured_chat_model(fully_specified_name, schema, **structured_output_kwargs)
+    if structured_output_cache is None:
+        return await model.ainvoke(messages, config)
+
+    normalized = json.dumps([_normalize_message(m) for m in messages], ensure_ascii=False)
+    key = (
+        fully_specified_name,
+        schema,
+        make_key(**structured_output_kwargs),
+        hash_text(normalized),
+    )
+    cached = structured_output_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        # 호출한 쪽에서 결과를 수정해도 캐시된 값은 바뀌지 않도록 복사본을 반환
+        return copy.deepcopy(cached)
+    response = await model.ainvoke(messages, config)
+    structured_output_cache.set(key, copy.deepcopy(response))
+    return response
+
+
+class DocumentList(list):
+    """`list[Document]` with a uuid -> position index, used as the `documents` state value.
+
+    `reduce_docs` copies it (list and index, no id-set rebuild or document
+    copies) only when an update adds new documents, so earlier state snapshots
+    are never changed afterwards. With a `capacity`, the lowest scoring
+    documents (`fused_score`, then `score`; unscored and older ones first) are
+    evicted once it overflows.
+    """
+
+    def __init__(self, docs: Iterable[Document] = (), capacity: Optional[int] = None):
+        super().__init__()
+        self.capacity = capacity
+        self._positions: dict[str, int] = {}
+        self.extend_unique(docs)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, str):
+            return item in self._positions
+        return super().__contains__(item)
+
+    def copy(self) -> "DocumentList":
+        """Shallow copy that keeps the uuid index (documents are shared, not copied)."""
+        clone = DocumentList(capacity=self.capacity)
+        list.extend(clone, self)
+        clone._positions = dict(self._positions)
+        return clone
+
+    def get_by_id(self, doc_id: str) -> Optional[Document]:
+        position = self._positions.get(doc_id)
+        return None if position is None else self[position]
+
+    def extend_unique(self, docs: Iterable[Document]) -> int:
+        """Append documents whose uuid is not present yet (all must have one). Returns the count added."""
+        added = 0
+        for doc in docs:
+            doc_id = doc.metadata["uuid"]
+            if doc_id not in self._positions:
+                self._positions[doc_id] = len(self)
+                self.append(doc)
+                added += 1
+        if self.capacity is not None and len(self) > self.capacity:
+            self._evict(len(self) - self.capacity)
+        return added
+
+    def _evict(self, count: int) -> None:
+        # 점수가 낮은(점수가 없으면 가장 낮은) 문서부터, 같으면 오래된 문서부터 제거하고 순서는 유지
+        def rank(position: int) -> tuple[float, int]:
+            metadata = self[position].metadata
+            score = metadata.get("fused_score", metadata.get("score"))
+            return (float("-inf") if score is None else score, position)
+
+        evicted = set(heapq.nsmallest(count, range(len(self)), key=rank))
+        kept = [doc for position, doc in enumerate(self) if position not in evicted]
+        self[:] = kept
+        self._positions = {doc.metadata["uuid"]: position for position, doc in enumerate(kept)}
+
+    def __reduce__(self):
+        # 체크포인트 직렬화 시에는 일반 list로 저장 (다음 reduce_docs 호출에서 인덱스를 다시 만듦)
+        return (list, (list(self),))
+
+
+def _with_uuid(item: Union[Document, dict[str, Any], str]) -> Document:
+    # uuid가 없으면 내용 해시를 사용: 같은 업데이트가 두 번 적용돼도(조건부 엣지의 local_read) 중복되지 않음
+    if isinstance(item, str):
+        return Document(page_content=item, metadata={"uuid": hash_text(item)})
+    if isinstance(item, dict):
+        metadata = item.get("metadata", {})
+        doc_id = metadata.get("uuid") or hash_text(item["page_content"])
+        return Document(**{**item, "metadata": {**metadata, "uuid": doc_id}})
+    if item.metadata.get("uuid") is None:
+        # 깊은 복사 대신 metadata만 새로 만든 얕은 복사
+        return item.model_copy(
+            update={"metadata": {**item.metadata, "uuid": hash_text(item.page_content)}}
+        )
+    return item
 
 
 def reduce_docs(
@@ -95,7 +331,13 @@ def reduce_docs(
     """Reduce and process documents based on the input type.
 
     This function handles various input types and converts them into a sequence of Document objects.
-    It also combines existing documents with the new one based on the document ID.
+    It also combines existing documents with the new one based on the document ID; documents without
+    a `uuid` get the hash of their content.
+
+    The result is a `DocumentList`. `existing` is never modified: when the update adds documents the
+    list and its uuid index are copied (copy-on-write), otherwise `existing` is returned as is, so
+    state snapshots kept by callers (`stream_mode="values"`, `astream_events`) stay unchanged.
+    `settings.STATE_MAX_DOCUMENTS` bounds the list size.
 
     Args:
         existing (Optional[Sequence[Document]]): The existing docs in the state, if any.
@@ -103,44 +345,17 @@ def reduce_docs(
             The new input to process. Can be a sequence of Documents, dictionaries, strings, or a single string.
     """
     if new == "delete":
-        return []
-
-    existing_list = list(existing) if existing else []
-    if isinstance(new, str):
-        return existing_list + [
-            Document(page_content=new, metadata={"uuid": str(uuid.uuid4())})
-        ]
-
-    new_list = []
-    if isinstance(new, list):
-        existing_ids = set(doc.metadata.get("uuid") for doc in existing_list)
-        for item in new:
-            if isinstance(item, str):
-                item_id = str(uuid.uuid4())
-                new_list.append(Document(page_content=item, metadata={"uuid": item_id}))
-                existing_ids.add(item_id)
-
-            elif isinstance(item, dict):
-                metadata = item.get("metadata", {})
-                item_id = metadata.get("uuid", str(uuid.uuid4()))
-
-                if item_id not in existing_ids:
-                    new_list.append(
-                        Document(**item, metadata={**metadata, "uuid": item_id})
-                    )
-                    existing_ids.add(item_id)
-
-            elif isinstance(item, Document):
-                item_id = item.metadata.get("uuid")
-                if item_id is None:
-                    item_id = str(uuid.uuid4())
-                    new_item = item.copy(deep=True)
-                    new_item.metadata["uuid"] = item_id
-                else:
-                    new_item = item
-
-                if item_id not in existing_ids:
-                    new_list.append(new_item)
-                    existing_ids.add(item_id)
-
-    return existing_list + new_list
+        return DocumentList(capacity=settings.STATE_MAX_DOCUMENTS)
+
+    incoming = [_with_uuid(item) for item in ([new] if isinstance(new, str) else new)]
+    if isinstance(existing, DocumentList):
+        # 이전 상태 스냅샷이 바뀌지 않도록 새 문서가 있을 때만 복사해서 확장 (copy-on-write)
+        if all(doc.metadata["uuid"] in existing for doc in incoming):
+            return existing
+        accumulated = existing.copy()
+    else:
+        accumulated = DocumentList(
+            (_with_uuid(doc) for doc in existing or []), capacity=settings.STATE_MAX_DOCUMENTS
+        )
+    accumulated.extend_unique(incoming)
+    return accumulated
@@ -0,0 +1,306 @@
+"""Batched, concurrent embed + upsert writer for Weaviate.
+
+`WeaviateVectorStore.add_texts` embeds everything in one call and then inserts
+with default dynamic batching, so the embedding API and Weaviate take turns
+idling. `BatchWriter` instead splits the texts into embedding batches, sends
+several of them in parallel under a rate limiter, and feeds each batch into a
+Weaviate gRPC batch as soon as its vectors arrive.
+
+Classes:
+    FailedObject: An object that could not be written after all retries.
+    WriteReport: Counters and failures of one or more writes.
+    BatchWriteError: Raised when objects are still failing after all retries.
+    BatchWriter: The writer itself.
+    BatchedWeaviateVectorStore: `WeaviateVectorStore` whose `add_texts` uses a `BatchWriter`.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Literal, Optional, Sequence
+from uuid import uuid4
+
+import weaviate
+from langchain_core.embeddings import Embeddings
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_weaviate import WeaviateVectorStore
+from langchain_weaviate.vectorstores import _json_serializable
+from weaviate.util import get_valid_uuid
+
+logger = logging.getLogger(__name__)
+
+BatchMode = Literal["fixed", "dynamic"]
+
+
+@dataclass
+class FailedObject:
+    uuid: str
+    message: str
+
+
+@dataclass
+class WriteReport:
+    """Counters of the writes done by a `BatchWriter` (cumulative across calls)."""
+
+    objects: int = 0
+    written: int = 0
+    embed_batches: int = 0
+    embed_retries: int = 0
+    write_retries: int = 0
+    failed: list[FailedObject] = field(default_factory=list)
+
+    def merge(self, other: "WriteReport") -> None:
+        self.objects += other.objects
+        self.written += other.written
+        self.embed_batches += other.embed_batches
+        self.embed_retries += other.embed_retries
+        self.write_retries += other.write_retries
+        self.failed.extend(other.failed)
+
+
+class BatchWriteError(RuntimeError):
+    """Some objects could not be written; `report.failed` lists them."""
+
+    def __init__(self, report: WriteReport):
+        self.report = report
+        super().__init__(
+            f"{len(report.failed)} of {report.objects} objects failed to write, "
+            f"first error: {report.failed[0].message}"
+        )
+
+
+class BatchWriter:
+    """Embed texts in parallel batches and upsert them through Weaviate gRPC batches.
+
+    Args:
+        client: Connected Weaviate client.
+        index_name: Target collection.
+        text_key: Property that holds the text.
+        embedding: Embedding model; its own request size should be >= `embed_batch_size`.
+        embed_batch_size: Texts per embedding request.
+        embed_concurrency: Embedding requests in flight.
+        requests_per_second: Embedding request rate limit (None = unlimited).
+        batch_mode: "fixed" for `batch.fixed_size`, "dynamic" for `batch.dynamic`.
+        batch_size: Objects per Weaviate batch request (fixed mode).
+        concurrent_requests: Weaviate batch requests in flight (fixed mode).
+        max_retries: Retries per embedding batch and for objects Weaviate rejected.
+        backoff: Base delay in seconds between retries (doubles per attempt).
+    """
+
+    def __init__(
+        self,
+        client: weaviate.WeaviateClient,
+        index_name: str,
+        text_key: str,
+        embedding: Optional[Embeddings],
+        *,
+        embed_batch_size: int = 200,
+        embed_concurrency: int = 4,
+        requests_per_second: Optional[float] = None,
+        batch_mode: BatchMode = "fixed",
+        batch_size: int = 200,
+        concurrent_requests: int = 2,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        self.client = client
+        self.index_name = index_name
+        self.text_key = text_key
+        self.embedding = embedding
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.batch_mode = batch_mode
+        self.batch_size = batch_size
+        self.concurrent_requests = concurrent_requests
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = (
+            InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                max_bucket_size=embed_concurrency,
+            )
+            if requests_per_second
+            else None
+        )
+        self.report = WriteReport()
+        self._report_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=embed_concurrency, thread_name_prefix="embed"
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _open_batch(self):
+        if self.batch_mode == "dynamic":
+            return self.client.batch.dynamic()
+        return self.client.batch.fixed_size(
+            batch_size=self.batch_size, concurrent_requests=self.concurrent_requests
+        )
+
+    def _embed(self, texts: list[str], report: WriteReport) -> list[list[float]]:
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return self.embedding.embed_documents(texts)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                with self._report_lock:
+                    report.embed_retries += 1
+                delay = self.backoff * (2**attempt)
+                logger.warning(f"Embedding batch failed ({e!r}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _embedded_batches(self, texts: list[str], report: WriteReport):
+        """Yield (start, vectors) as embedding batches finish, at most `embed_concurrency` ahead."""
+        starts = iter(range(0, len(texts), self.embed_batch_size))
+        pending: dict[Future, int] = {}
+
+        def submit_next() -> None:
+            start = next(starts, None)
+            if start is not None:
+                chunk = texts[start : start + self.embed_batch_size]
+                pending[self._executor.submit(self._embed, chunk, report)] = start
+
+        for _ in range(self.embed_concurrency):
+            submit_next()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start = pending.pop(future)
+                    report.embed_batches += 1
+                    yield start, future.result()
+                    submit_next()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def write(
+        self,
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+        tenant: Optional[str] = None,
+        raise_on_failure: bool = True,
+    ) -> tuple[list[str], WriteReport]:
+        """Embed and upsert `texts`. Returns the object ids and the report of this call.
+
+        Objects Weaviate rejects are retried up to `max_retries` times; those still
+        failing are listed in the report and, with `raise_on_failure`, raise
+        `BatchWriteError` so callers such as `index()` don't record them as written.
+        """
+        texts = list(texts)
+        if ids:
+            ids = [get_valid_uuid(i) for i in ids]
+        else:
+            ids = [get_valid_uuid(uuid4()) for _ in texts]
+        report = WriteReport(objects=len(texts))
+
+        def properties(i: int) -> dict[str, Any]:
+            props = {self.text_key: texts[i]}
+            if metadatas is not None:
+                for key, val in metadatas[i].items():
+                    props[key] = _json_serializable(val)
+            return props
+
+        # 임베딩이 끝난 배치부터 바로 Weaviate 배치에 넣어 임베딩과 업서트를 겹치게 함
+        with self._open_batch() as batch:
+            if self.embedding is None:
+                for i in range(len(texts)):
+                    batch.add_object(
+                        collection=self.index_name,
+                        properties=properties(i),
+                        uuid=ids[i],
+                        tenant=tenant,
+                    )
+            else:
+                for start, vectors in self._embedded_batches(texts, report):
+                    for offset, vector in enumerate(vectors):
+                        i = start + offset
+                        batch.add_object(
+                            collection=self.index_name,
+                            properties=properties(i),
+                            uuid=ids[i],
+                            vector=vector,
+                            tenant=tenant,
+                        )
+        failed = list(self.client.batch.failed_objects)
+
+        for attempt in range(self.max_retries):
+            if not failed:
+                break
+            report.write_retries += 1
+            logger.warning(
+                f"{len(failed)} objects failed to write ({failed[0].message}), retrying"
+            )
+            time.sleep(self.backoff * (2**attempt))
+            with self._open_batch() as batch:
+                for error in failed:
+                    obj = error.object_
+                    batch.add_object(
+                        collection=obj.collection,
+                        properties=obj.properties,
+                        uuid=obj.uuid,
+                        vector=obj.vector,
+                        tenant=obj.tenant,
+                    )
+            failed = list(self.client.batch.failed_objects)
+
+        report.failed = [
+            FailedObject(
+                uuid=str(error.original_uuid or error.object_.uuid), message=error.message
+            )
+            for error in failed
+        ]
+        report.written = report.objects - len(report.failed)
+        with self._report_lock:
+            self.report.merge(report)
+        for failure in report.failed:
+            logger.error(f"Failed to add object: {failure.uuid}\nReason: {failure.message}")
+        if report.failed and raise_on_failure:
+            raise BatchWriteError(report)
+        return [str(i) for i in ids], report
+
+
+class BatchedWeaviateVectorStore(WeaviateVectorStore):
+    """`WeaviateVectorStore` that writes through a `BatchWriter`.
+
+    Drop-in for `index()`: only `add_texts` changes, search and delete are inherited.
+    `writer_kwargs` are passed to `BatchWriter` (embed_batch_size, batch_mode, ...).
+    """
+
+    def __init__(self, *args: Any, writer_kwargs: Optional[dict] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.writer = BatchWriter(
+            self._client,
+            self._index_name,
+            self._text_key,
+            self._embedding,
+            **(writer_kwargs or {}),
+        )
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[list[dict]] = None,
+        tenant: Optional[str] = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        if tenant and not self._does_tenant_exist(tenant):
+            logger.info(f"Creating tenant {tenant} in index {self._index_name}")
+            self._collection.tenants.create(
+                tenants=[weaviate.classes.tenants.Tenant(name=tenant)]
+            )
+        ids, _ = self.writer.write(
+            list(texts),
+            metadatas=metadatas,
+            ids=kwargs.get("uuids") or kwargs.get("ids"),
+            tenant=tenant,
+        )
+        return ids
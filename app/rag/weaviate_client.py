@@ -0,0 +1,139 @@
+"""Process-wide Weaviate client pool.
+
+weaviate v4 클라이언트는 내부적으로 HTTP 커넥션 풀과 gRPC 채널을 유지하므로
+요청마다 connect/close 하지 않고 프로세스 전체에서 하나의 클라이언트를 공유한다.
+
+Functions:
+    get_weaviate_client: Return the shared sync client, connecting on first use.
+    aget_weaviate_client: Return the shared async client, connecting on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import weaviate
+
+logger = logging.getLogger(__name__)
+
+
+class WeaviateClientPool:
+    """Lazily connected, shared sync/async Weaviate clients.
+
+    The sync client is used by `WeaviateVectorStore` (retrieval and ingest), the async
+    client by code running directly on the event loop. Both are created once and
+    reconnected only if they report being disconnected.
+    """
+
+    def __init__(self, host: str, port: int, grpc_port: int):
+        self.host = host
+        self.port = port
+        self.grpc_port = grpc_port
+        self._client: Optional[weaviate.WeaviateClient] = None
+        self._async_client: Optional[weaviate.WeaviateAsyncClient] = None
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    def get_client(self) -> weaviate.WeaviateClient:
+        """Return the shared sync client, (re)connecting if needed."""
+        client = self._client
+        if client is not None and client.is_connected():
+            return client
+
+        with self._lock:
+            if self._client is None or not self._client.is_connected():
+                # weaviate 패키지는 import 비용이 크므로 처음 연결할 때 로딩
+                import weaviate
+
+                logger.info(f"Connecting to Weaviate at {self.host}:{self.port}")
+                self._client = weaviate.connect_to_local(
+                    host=self.host,
+                    port=self.port,
+                    grpc_port=self.grpc_port,
+                    skip_init_checks=True,
+                )
+            return self._client
+
+    async def aget_client(self) -> weaviate.WeaviateAsyncClient:
+        """Return the shared async client, (re)connecting if needed."""
+        client = self._async_client
+        if client is not None and client.is_connected():
+            return client
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self._async_client is None or not self._async_client.is_connected():
+                import weaviate
+
+                logger.info(f"Connecting async client to Weaviate at {self.host}:{self.port}")
+                self._async_client = weaviate.use_async_with_local(
+                    host=self.host,
+                    port=self.port,
+                    grpc_port=self.grpc_port,
+                    skip_init_checks=True,
+                )
+                await self._async_client.connect()
+            return self._async_client
+
+    @contextmanager
+    def client(self) -> Iterator[weaviate.WeaviateClient]:
+        """Borrow the shared sync client. Unlike `connect_to_local`, exiting does not close it."""
+        yield self.get_client()
+
+    def health_check(self) -> bool:
+        """Return True if Weaviate answers the readiness probe."""
+        try:
+            return self.get_client().is_ready()
+        except Exception:
+            logger.warning("Weaviate health check failed", exc_info=True)
+            return False
+
+    async def ahealth_check(self) -> bool:
+        """Async variant of `health_check`."""
+        try:
+            client = await self.aget_client()
+            return await client.is_ready()
+        except Exception:
+            logger.warning("Weaviate async health check failed", exc_info=True)
+            return False
+
+    def close(self) -> None:
+        """Close the sync client. The async client must be closed with `aclose`."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """Close both clients."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        self.close()
+
+
+weaviate_pool = WeaviateClientPool(
+    host=settings.WEAVIATE_HOST,
+    port=settings.WEAVIATE_PORT,
+    grpc_port=settings.WEAVIATE_GRPC_PORT,
+)
+
+# FastAPI lifespan 밖(CLI ingest 등)에서 사용된 경우에도 프로세스 종료 시 연결을 정리
+atexit.register(weaviate_pool.close)
+
+
+def get_weaviate_client() -> weaviate.WeaviateClient:
+    return weaviate_pool.get_client()
+
+
+async def aget_weaviate_client() -> weaviate.WeaviateAsyncClient:
+    return await weaviate_pool.aget_client()
@@ -1,7 +1,18 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+
 from app.model.models import User
 
 class BaseUserRepository(ABC):
     @abstractmethod
-    def insert_user(self, user: User):
+    async def insert_user(self, user: User):
+        pass
+
+    @abstractmethod
+    async def insert_users(self, users: list[User]) -> dict[int, str]:
+        """여러 사용자를 한 번에 저장하고 실패한 사용자의 (목록 내 위치 -> 실패 사유)를 반환"""
+        pass
+
+    @abstractmethod
+    async def get_user(self, user_id: str) -> Optional[User]:
         pass
@@ -1,18 +1,67 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
+from typing import Optional
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 import app.model.models as models
 from app.repository.base_user_repository import BaseUserRepository
-from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+USER_COLUMNS = ("user_id", "password", "nickname", "img_id")
+
 class UserRepositoryDB(BaseUserRepository):
-    def __init__(self, db:Session):
+    def __init__(self, db:AsyncSession):
         super().__init__()
         self.db=db
 
-    def insert_user(self, user: models.User) :
+    async def insert_user(self, user: models.User) :
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user) # DB에서 생성된 값(default 등)을 인스턴스에 반영
\ No newline at end of file
+        try:
+            await self.db.commit()
+        except Exception:
+            # 실패한 트랜잭션을 정리해야 같은 세션을 다시 사용할 수 있음
+            await self.db.rollback()
+            raise
+        await self.db.refresh(user) # DB에서 생성된 값(default 등)을 인스턴스에 반영
+
+    async def insert_users(self, users: list[models.User]) -> dict[int, str]:
+        failures: dict[int, str] = {}
+
+        # 이미 있는 아이디와 목록 안에서 중복된 아이디는 INSERT 전에 걸러냄 (SELECT 한 번)
+        ids = [user.user_id for user in users]
+        result = await self.db.execute(select(models.User.user_id).where(models.User.user_id.in_(ids)))
+        existing = set(result.scalars())
+        rows: list[tuple[int, dict]] = []
+        seen: set[str] = set()
+        for index, user in enumerate(users):
+            if user.user_id in existing:
+                failures[index] = "이미 존재하는 아이디입니다."
+            elif user.user_id in seen:
+                failures[index] = "요청 안에서 중복된 아이디입니다."
+            else:
+                seen.add(user.user_id)
+                rows.append((index, {column: getattr(user, column) for column in USER_COLUMNS}))
+        if not rows:
+            return failures
+
+        # 배치 전체를 executemany 한 번으로 저장 (행마다 add/commit/refresh 하지 않음)
+        try:
+            await self.db.execute(insert(models.User), [row for _, row in rows])
+            await self.db.commit()
+            return failures
+        except Exception:
+            await self.db.rollback()
+            logger.warning("Batch insert failed; retrying row by row", exc_info=True)
+
+        # 동시에 같은 아이디가 가입된 경우 등: 행마다 SAVEPOINT로 실패한 행만 제외
+        for index, row in rows:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(models.User).values(**row))
+            except Exception as e:
+                failures[index] = f"저장에 실패하였습니다: {type(e).__name__}"
+        await self.db.commit()
+        return failures
+
+    async def get_user(self, user_id: str) -> Optional[models.User]:
+        return await self.db.get(models.User, user_id)
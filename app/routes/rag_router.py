@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+import app.schema.rag_schema as rag_schema
+import app.service.rag_service as rag_service
+from app.core.security import get_current_user
+from app.rag.answer_cache import get_answer_cache
+
+router = APIRouter(tags=["RAG"], prefix="/rag")
+
+
+# 검색 그래프를 실행하면서 진행 상황과 답변 토큰을 SSE로 바로 전달
+@router.post("/chat/stream")
+async def stream_chat(
+    request: rag_schema.ChatRequest,
+    current_user: str = Depends(get_current_user),
+    graph=Depends(rag_service.get_retrieval_graph),
+    cache=Depends(get_answer_cache),
+) -> StreamingResponse:
+    return StreamingResponse(
+        rag_service.stream_answer(graph, request, cache),
+        media_type="text/event-stream",
+        # 프록시(nginx 등)가 응답을 모아서 보내지 않도록 버퍼링 비활성화
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,6 @@
-from typing import Any
-from fastapi import APIRouter
+from typing import Any, Literal, Optional
+from fastapi import APIRouter, Request
+from app.core.util import iter_lines
 from app.core.security import get_current_user
 import app.schema.common_schema as common_schema
 import app.schema.user_schema as user_schema
@@ -10,9 +11,9 @@ from app.repository.db.db_user_repository import UserRepositoryDB
 
 from fastapi import Depends
 from app.core.database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-def get_user_repository(db:Session = Depends(get_db)):
+def get_user_repository(db:AsyncSession = Depends(get_db)):
     return UserRepositoryDB(db)
 
 
@@ -21,7 +22,24 @@ router = APIRouter(tags=["사용자"], prefix="/user")
 @router.post("", response_model=common_schema.ApiResponse)
 async def create_user(request: user_schema.UserCreate, repo:BaseUserRepository = Depends(get_user_repository)) -> Any:
 
-    user_service.create_user(repo, request)
+    await user_service.create_user(repo, request)
     response = common_schema.ApiResponse(success=True, message="회원가입이 성공적으로 완료되었습니다.") 
 
-    return response
\ No newline at end of file
+    return response
+
+
+# 대량 가입: JSONL(application/x-ndjson) 또는 CSV(text/csv) 본문을 스트리밍으로 읽어 배치 단위로 저장
+# 계정을 대량으로 만들 수 있으므로 로그인한 사용자만 호출 가능
+@router.post("/bulk", response_model=common_schema.ApiResponse)
+async def import_users(request: Request, format: Optional[Literal["jsonl", "csv"]] = None, current_user:str = Depends(get_current_user), repo:BaseUserRepository = Depends(get_user_repository)) -> Any:
+
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+    report = await user_service.import_users(repo, iter_lines(request.stream()), format)
+    response = common_schema.ApiResponse(
+        success=True,
+        message=f"{report.total}명 중 {report.inserted}명의 회원가입이 완료되었습니다.",
+        data=report,
+    )
+
+    return response
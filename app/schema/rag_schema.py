@@ -0,0 +1,29 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    content: str
+
+
+# 클라이언트가 덮어쓸 수 있는 AgentConfiguration 필드 (모델, 프롬프트, 예산 등은 서버 설정만 사용)
+class ChatConfigurable(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    research_mode: Optional[Literal["sequential", "parallel"]] = Field(
+        default=None, description="연구 단계 실행 방식"
+    )
+    rerank_top_n: Optional[int] = Field(
+        default=None, ge=1, le=20, description="답변 생성에 사용할 재정렬 문서 수"
+    )
+
+
+# 검색 그래프 질의 요청 (history: 이전 대화, configurable: 허용된 검색 그래프 설정만 덮어쓰기)
+class ChatRequest(BaseModel):
+    question: str = Field(min_length=1, description="사용자 질문")
+    history: list[ChatMessage] = Field(default_factory=list, description="이전 대화 내역")
+    configurable: ChatConfigurable = Field(
+        default_factory=ChatConfigurable, description="검색 그래프 설정 (research_mode, rerank_top_n)"
+    )
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 #1. Payload 1: 회원 가입 (모든 정보 포함)
@@ -7,4 +9,19 @@ class UserCreate(BaseModel):
     user_id: str
     password: str
     nickname: str
-    img_id: str
\ No newline at end of file
+    img_id: str
+
+#2. 대량 가입 결과 (행 번호는 본문의 줄 번호, CSV는 헤더가 1번 줄)
+class BulkImportFailure(BaseModel):
+    line: int
+    user_id: Optional[str] = None
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    failures: list[BulkImportFailure] = Field(default_factory=list, description="실패한 행 (BULK_IMPORT_MAX_REPORTED_FAILURES개까지)")
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+import app.schema.rag_schema as rag_schema
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+    from app.rag.answer_cache import AnswerCache
+
+logger = logging.getLogger(__name__)
+
+# 진행 상황으로 알려줄 그래프 노드 -> 단계 이름
+PROGRESS_STAGES = {
+    "create_research_plan": "plan",
+    "conduct_research": "research",
+    "research_step": "research",
+    "generate_queries": "query",
+    "retrieve_documents": "retrieve",
+    "fuse_documents": "fuse",
+    "rerank_documents": "rerank",
+    "respond": "respond",
+}
+
+
+def _import_retrieval_graph():
+    from app.rag.retrieval_graph.graph import graph
+
+    return graph
+
+
+async def get_retrieval_graph():
+    # 그래프 모듈은 프롬프트/모델 로딩이 무거우므로 첫 요청 때 import
+    # (import 중에 이벤트 루프를 막지 않도록 스레드에서 실행, 이후에는 sys.modules에서 바로 반환)
+    return await asyncio.to_thread(_import_retrieval_graph)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _progress(stage: str, name: str, output: Any) -> dict[str, Any]:
+    # 노드 출력에서 클라이언트에 보여줄 요약만 추림 (문서 본문은 보내지 않음)
+    data: dict[str, Any] = {"stage": stage, "status": "end"}
+    if not isinstance(output, dict):
+        return data
+    if name == "create_research_plan":
+        data["steps"] = output.get("steps", [])
+    elif name == "generate_queries":
+        data["queries"] = output.get("queries", [])
+    elif name == "retrieve_documents":
+        results = output.get("query_results") or []
+        data["documents"] = sum(len(docs) for _, docs in results)
+    elif name in ("fuse_documents", "conduct_research", "research_step"):
+        data["documents"] = len(output.get("documents") or [])
+    elif name == "rerank_documents":
+        data["sources"] = [
+            doc.metadata.get("source") for doc in output.get("context_documents") or []
+        ]
+    return data
+
+
+async def stream_answer(
+    graph, request: rag_schema.ChatRequest, cache: Optional["AnswerCache"] = None
+) -> AsyncIterator[str]:
+    """Run the retrieval graph and yield SSE events.
+
+    With a `cache`, a question similar enough to an earlier one (same
+    configuration and history) is answered from the cache without running the
+    graph, and fresh answers are stored in it.
+
+    Events:
+        progress: {"stage", "status": "start" | "end", ...} when a graph stage starts/ends,
+            or {"stage": "cache", "status": "hit"} for a cached answer.
+        token: {"text"} for every chunk the response model generates in `respond`
+            (the whole answer at once if it was cached or the model does not stream).
+        done: {"answer", "cached"} once the graph finished.
+        error: {"message"} if the graph failed (the stream ends afterwards).
+    """
+    history = [(m.role, m.content) for m in request.history]
+    messages = history + [("user", request.question)]
+    # 스키마에서 허용한 필드 중 요청에 지정된 것만 그래프 설정으로 전달
+    configurable = request.configurable.model_dump(exclude_none=True)
+
+    lookup = None
+    if cache is not None:
+        try:
+            lookup = await cache.alookup(request.question, configurable, history)
+        except Exception:
+            # 캐시 장애로 답변이 막히지 않도록 그래프 실행으로 진행
+            logger.warning("Answer cache lookup failed", exc_info=True)
+        if lookup is not None and lookup[0] is not None:
+            hit = lookup[0]
+            sources = [doc["metadata"].get("source") for doc in hit.documents]
+            yield format_sse("progress", {"stage": "cache", "status": "hit", "sources": sources})
+            yield format_sse("token", {"text": hit.answer})
+            yield format_sse("done", {"answer": hit.answer, "cached": True})
+            return
+
+    answer_parts: list[str] = []
+    context_documents: list["Document"] = []
+    try:
+        async for event in graph.astream_events(
+            {"messages": messages},
+            {"configurable": configurable},
+            version="v2",
+        ):
+            kind = event["event"]
+            name = event.get("name", "")
+            node = event.get("metadata", {}).get("langgraph_node")
+            if kind == "on_chat_model_stream" and node == "respond":
+                text = event["data"]["chunk"].content
+                if text:
+                    answer_parts.append(text)
+                    yield format_sse("token", {"text": text})
+            elif kind in ("on_chain_start", "on_chain_end") and name == node and name in PROGRESS_STAGES:
+                # 노드 자체의 시작/종료 이벤트만 사용 (노드 안에서 실행되는 체인 이벤트는 무시)
+                if kind == "on_chain_start":
+                    yield format_sse("progress", {"stage": PROGRESS_STAGES[name], "status": "start"})
+                else:
+                    output = event["data"].get("output")
+                    if name == "rerank_documents" and isinstance(output, dict):
+                        context_documents = output.get("context_documents") or []
+                    elif name == "respond" and not answer_parts and isinstance(output, dict):
+                        # 스트리밍하지 않는 모델은 토큰 이벤트가 없으므로 노드 출력의 답변을 한 번에 전달
+                        answer = output.get("answer")
+                        if answer:
+                            answer_parts.append(answer)
+                            yield format_sse("token", {"text": answer})
+                    yield format_sse("progress", _progress(PROGRESS_STAGES[name], name, output))
+    except Exception:
+        logger.error("Retrieval graph failed", exc_info=True)
+        yield format_sse("error", {"message": "답변 생성 중 오류가 발생했습니다."})
+        return
+    answer = "".join(answer_parts)
+    yield format_sse("done", {"answer": answer, "cached": False})
+
+    if lookup is not None and answer:
+        _, vector, partition = lookup
+        try:
+            await cache.astore(request.question, vector, partition, answer, context_documents)
+        except Exception:
+            logger.warning("Answer cache store failed", exc_info=True)
@@ -1,15 +1,23 @@
+import asyncio
+import csv
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+from pydantic import ValidationError
 import app.schema.user_schema as user_schema
 import app.model.models as app_models
 import app.core.security as security
 from app.repository.base_user_repository import BaseUserRepository
 import logging
 from app.core.exception import CustomException, ErrorCode
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-def create_user(repo:BaseUserRepository, data:user_schema.UserCreate) :
+async def create_user(repo:BaseUserRepository, data:user_schema.UserCreate) :
 
-    hashedPassword = security.get_password_hash(data.password)
+    # bcrypt 해싱은 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    hashedPassword = await security.aget_password_hash(data.password)
     user = app_models.User(
         user_id=data.user_id,
         password=hashedPassword,
@@ -17,8 +25,108 @@ def create_user(repo:BaseUserRepository, data:user_schema.UserCreate) :
         img_id=data.img_id
     )
     try :
-        repo.insert_user(user)
+        await repo.insert_user(user)
     except Exception as e:
         logger.error("error", exc_info=True)
         raise CustomException(code=ErrorCode.INVALID_INPUT_VALUE, message="회원가입에 실패하였습니다.")
 
+
+
+def _record_failure(report:user_schema.BulkImportReport, line:int, user_id:Optional[str], error:str) :
+    report.failed += 1
+    # 실패가 많아도 응답 크기가 커지지 않도록 일정 개수까지만 담음
+    if len(report.failures) < settings.BULK_IMPORT_MAX_REPORTED_FAILURES:
+        report.failures.append(user_schema.BulkImportFailure(line=line, user_id=user_id, error=error))
+
+
+async def _iter_rows(lines:AsyncIterable[str], format:str) -> AsyncIterator[tuple[int, Any]]:
+    # (줄 번호, dict 또는 파싱 에러 메시지)
+    header = None
+    line_no = 0
+    # CSV: 따옴표 안에 줄바꿈이 있는 행은 여러 줄에 걸치므로 따옴표가 닫힐 때까지 모아서 파싱
+    record: list[str] = []
+    record_line = 0
+    quotes = 0
+    async for line in lines:
+        line_no += 1
+        if format == "csv":
+            if not record:
+                if not line.strip():
+                    continue
+                record_line = line_no
+            record.append(line)
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            values = next(csv.reader(["\n".join(record)]))
+            record, quotes = [], 0
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield record_line, f"열 개수가 헤더({len(header)}개)와 다릅니다."
+                continue
+            yield record_line, dict(zip(header, values))
+        else:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_no, "JSON 형식이 아닙니다."
+                continue
+            yield line_no, row if isinstance(row, dict) else "JSON 객체가 아닙니다."
+    if record:
+        yield record_line, "따옴표가 닫히지 않았습니다."
+
+
+async def _insert_batch(repo:BaseUserRepository, batch:list[tuple[int, user_schema.UserCreate]], report:user_schema.BulkImportReport) :
+    # 배치 안의 비밀번호를 해싱 스레드 풀에서 동시에 해싱
+    hashed = await asyncio.gather(*(security.aget_password_hash(data.password) for _, data in batch))
+    users = [
+        app_models.User(user_id=data.user_id, password=password, nickname=data.nickname, img_id=data.img_id)
+        for (_, data), password in zip(batch, hashed)
+    ]
+    failures = await repo.insert_users(users)
+    report.inserted += len(batch) - len(failures)
+    for index, error in sorted(failures.items()):
+        line, data = batch[index]
+        _record_failure(report, line, data.user_id, error)
+
+
+async def import_users(repo:BaseUserRepository, lines:AsyncIterable[str], format:str = "jsonl") -> user_schema.BulkImportReport:
+    """
+    JSONL(한 줄에 UserCreate 객체 하나) 또는 CSV(헤더: user_id,password,nickname,img_id) 본문으로 대량 가입
+    - BULK_IMPORT_BATCH_SIZE 행씩 해싱 후 한 번에 INSERT
+    - 잘못된 행, 중복 아이디 등은 해당 행만 실패로 기록하고 나머지는 계속 저장
+    """
+    report = user_schema.BulkImportReport()
+    start = time.perf_counter()
+    batch: list[tuple[int, user_schema.UserCreate]] = []
+    async for line, row in _iter_rows(lines, format):
+        report.total += 1
+        if isinstance(row, str):
+            _record_failure(report, line, None, row)
+            continue
+        try:
+            batch.append((line, user_schema.UserCreate.model_validate(row)))
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(loc) for loc in error["loc"])
+            user_id = row.get("user_id")
+            # 문자열이 아닌 user_id(예: 숫자)도 실패 목록에는 문자열로 기록
+            _record_failure(report, line, None if user_id is None else str(user_id), f"{field}: {error['msg']}")
+            continue
+        if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+            await _insert_batch(repo, batch, report)
+            batch = []
+    if batch:
+        await _insert_batch(repo, batch, report)
+
+    report.elapsed_seconds = time.perf_counter() - start
+    report.rows_per_second = report.total / report.elapsed_seconds if report.elapsed_seconds else 0.0
+    logger.info(
+        f"Imported {report.inserted}/{report.total} users ({report.failed} failed) "
+        f"in {report.elapsed_seconds:.2f}s ({report.rows_per_second:.0f} rows/s)"
+    )
+    return report
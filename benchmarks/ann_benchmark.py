@@ -0,0 +1,86 @@
+"""Recall@k and latency of the IVF index of the embedded store against exact search.
+
+    python -m benchmarks.ann_benchmark [--rows N] [--dim D] [--queries Q] [--k K] [--nlist L]
+                                       [--nprobe 1 4 8 16 32]
+
+Vectors are drawn around random cluster centers (real embeddings are clustered
+too; uniform random vectors would make any coarse quantizer look bad). Queries
+come from the same distribution. Recall@k is the overlap of the ANN top k with
+the exact top k.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.rag.local_store import LocalVectorStore
+from benchmarks.local_store_benchmark import _NoEmbeddings
+
+
+def clustered(rng: np.random.Generator, n: int, centers: np.ndarray, spread: float) -> np.ndarray:
+    labels = rng.integers(len(centers), size=n)
+    noise = rng.standard_normal((n, centers.shape[1]), dtype=np.float32)
+    return centers[labels] + spread * noise
+
+
+def measure(store: LocalVectorStore, queries: np.ndarray, k: int, **kwargs) -> tuple[list, list]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store._top_k(query.tolist(), k, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({row for row, _ in hits})
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((args.clusters, args.dim), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as path:
+        store = LocalVectorStore(path, _NoEmbeddings())
+        for offset in range(0, args.rows, 10_000):
+            n = min(10_000, args.rows - offset)
+            store.add_embeddings(
+                [f"chunk {offset + i}" for i in range(n)],
+                clustered(rng, n, centers, spread=0.5),
+                ids=[str(offset + i) for i in range(n)],
+            )
+
+        start = time.perf_counter()
+        ann = store.train_ann(nlist=args.nlist)
+        print(f"train:  nlist={ann.nlist} over {args.rows} x {args.dim} in {time.perf_counter() - start:.2f}s")
+        store.close()
+
+        start = time.perf_counter()
+        store = LocalVectorStore(path, _NoEmbeddings())
+        store.similarity_search_by_vector(centers[0].tolist(), k=1)
+        print(f"open + first query: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        queries = clustered(rng, args.queries, centers, spread=0.5)
+        truth, exact_latencies = measure(store, queries, args.k, exact=True)
+        print(f"exact:      p50 {statistics.median(exact_latencies):7.2f} ms")
+        for nprobe in args.nprobe:
+            found, latencies = measure(store, queries, args.k, nprobe=nprobe)
+            recall = sum(len(t & f) for t, f in zip(truth, found)) / (args.k * len(truth))
+            print(
+                f"nprobe={nprobe:<4} p50 {statistics.median(latencies):7.2f} ms, "
+                f"recall@{args.k} {recall:.3f}"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Load time and query latency of the embedded NumPy vector store.
+
+    python -m benchmarks.local_store_benchmark [--rows N] [--dim D] [--queries Q] [--k K]
+
+Random unit vectors stand in for embeddings, so no embedding API is called.
+The store is written to a temporary directory and reopened for the measurements.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.rag.local_store import LocalVectorStore
+
+
+class _NoEmbeddings:
+    def embed_documents(self, texts):
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def build(path: str, rows: int, dim: int, rng: np.random.Generator, batch: int = 10_000) -> float:
+    start = time.perf_counter()
+    store = LocalVectorStore(path, _NoEmbeddings())
+    for offset in range(0, rows, batch):
+        n = min(batch, rows - offset)
+        store.add_embeddings(
+            [f"chunk {offset + i}" for i in range(n)],
+            rng.standard_normal((n, dim), dtype=np.float32),
+            metadatas=[{"source": f"https://example.com/{(offset + i) // 10}"} for i in range(n)],
+            ids=[str(offset + i) for i in range(n)],
+        )
+    store.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as path:
+        elapsed = build(path, args.rows, args.dim, rng)
+        print(f"build:  {args.rows} x {args.dim} in {elapsed:.2f}s")
+
+        start = time.perf_counter()
+        store = LocalVectorStore(path, _NoEmbeddings(), attributes=["source"])
+        print(f"open:   {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        queries = rng.standard_normal((args.queries + 1, args.dim), dtype=np.float32)
+        start = time.perf_counter()
+        store.similarity_search_by_vector(queries[0].tolist(), k=args.k)
+        print(f"cold query: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        latencies = []
+        for query in queries[1:]:
+            start = time.perf_counter()
+            store.similarity_search_by_vector(query.tolist(), k=args.k, return_uuids=True)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f"query (k={args.k}): p50 {statistics.median(latencies):.2f} ms, "
+            f"p95 {p95:.2f} ms, {1000 / statistics.mean(latencies):.0f} qps"
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Pages/second of the BeautifulSoup and lxml docs extractors.
+
+    python -m benchmarks.parser_benchmark [--repeat N] [--corpus DIR]
+
+The corpus defaults to the HTML fixtures used by tests/parser_test.py; point
+--corpus at a directory of crawled pages for numbers closer to a real ingest.
+Both extractors start from raw bytes, so parse time is included.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.rag.parser import langchain_docs_extractor, lxml_docs_extractor
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+
+
+def bs4_extract(raw: bytes) -> str:
+    return langchain_docs_extractor(BeautifulSoup(raw, "lxml"))
+
+
+def run(name, extract, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for raw in pages:
+            extract(raw)
+    elapsed = time.perf_counter() - start
+    total = len(pages) * repeat
+    print(f"{name:<8} {total:>7} pages  {elapsed:8.3f}s  {total / elapsed:10.1f} pages/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    pages = [path.read_bytes() for path in sorted(args.corpus.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"No *.html files in {args.corpus}")
+    mismatched = sum(bs4_extract(raw) != lxml_docs_extractor(raw) for raw in pages)
+    print(f"corpus: {len(pages)} pages, {mismatched} with differing output")
+
+    baseline = run("bs4", bs4_extract, pages, args.repeat)
+    optimized = run("lxml", lxml_docs_extractor, pages, args.repeat)
+    print(f"speedup: {baseline / optimized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
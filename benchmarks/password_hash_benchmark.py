@@ -0,0 +1,64 @@
+"""Event-loop lag while signups hash passwords.
+
+    python -m benchmarks.password_hash_benchmark [--signups N]
+
+Runs `signups` concurrent password hashes next to a ticker coroutine that
+sleeps 10 ms at a time and records how late it wakes up. That lateness is the
+extra latency every other request on the same event loop (e.g. the RAG
+endpoints) would see. Compares hashing inline in the coroutine, as
+`create_user` used to, with `aget_password_hash`, which runs in the bounded
+hashing thread pool.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.security import _get_hash_executor, aget_password_hash, get_password_hash
+
+TICK = 0.01
+
+
+async def inline_hash(password: str) -> str:
+    # 이전 구현 (비교용): 코루틴 안에서 바로 bcrypt 실행
+    return get_password_hash(password)
+
+
+async def measure(hash_password, signups: int) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK)
+    start = time.perf_counter()
+    await asyncio.gather(*(hash_password(f"password-{i}") for i in range(signups)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return elapsed, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signups", type=int, default=20)
+    args = parser.parse_args()
+
+    workers = _get_hash_executor()._max_workers
+    print(f"{args.signups} concurrent signups, {workers} hashing thread(s)")
+    for name, hash_password in [("inline", inline_hash), ("thread pool", aget_password_hash)]:
+        elapsed, lags = asyncio.run(measure(hash_password, args.signups))
+        print(
+            f"{name:<12} total {elapsed * 1000:7.0f} ms | loop lag "
+            f"median {statistics.median(lags) * 1000:6.1f} ms, max {max(lags) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Cost of accumulating documents in graph state with `reduce_docs`.
+
+    python -m benchmarks.reduce_docs_benchmark [--updates N] [--batch B] [--overlap F]
+
+Simulates a research run: `updates` reducer calls (fan-out branches and steps),
+each merging `batch` documents of which a fraction `overlap` was already seen.
+Compares the current `DocumentList`-based reducer with the previous
+implementation, which copied the list and rebuilt the id set on every call.
+"""
+
+import argparse
+import time
+import uuid
+
+from langchain_core.documents import Document
+
+from app.rag.utils import reduce_docs
+
+
+def previous_reduce_docs(existing, new):
+    # 이전 구현 (비교용): 호출마다 리스트 복사 + id 집합 재생성
+    existing_list = list(existing) if existing else []
+    existing_ids = set(doc.metadata.get("uuid") for doc in existing_list)
+    new_list = []
+    for item in new:
+        item_id = item.metadata.get("uuid")
+        if item_id is None:
+            item_id = str(uuid.uuid4())
+            item = item.copy(deep=True)
+            item.metadata["uuid"] = item_id
+        if item_id not in existing_ids:
+            new_list.append(item)
+            existing_ids.add(item_id)
+    return existing_list + new_list
+
+
+def make_updates(updates: int, batch: int, overlap: float) -> list[list[Document]]:
+    seen = int(batch * overlap)
+    result, next_id = [], 0
+    for _ in range(updates):
+        docs = [
+            Document(page_content=f"chunk {i}", metadata={"uuid": str(i), "source": "x"})
+            for i in range(max(0, next_id - seen), next_id)
+        ]
+        fresh = batch - len(docs)
+        docs += [
+            Document(page_content=f"chunk {i}", metadata={"uuid": str(i), "source": "x"})
+            for i in range(next_id, next_id + fresh)
+        ]
+        next_id += fresh
+        result.append(docs)
+    return result
+
+
+def run(reducer, updates: list[list[Document]]) -> tuple[float, int]:
+    start = time.perf_counter()
+    state = []
+    for docs in updates:
+        state = reducer(state, docs)
+    return time.perf_counter() - start, len(state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--overlap", type=float, default=0.3)
+    args = parser.parse_args()
+
+    updates = make_updates(args.updates, args.batch, args.overlap)
+    for name, reducer in [("previous", previous_reduce_docs), ("DocumentList", reduce_docs)]:
+        elapsed, size = run(reducer, updates)
+        print(
+            f"{name:<13} {args.updates} updates -> {size} docs: {elapsed * 1000:8.1f} ms "
+            f"({elapsed / args.updates * 1e6:.1f} us/update)"
+        )
+
+
+if __name__ == "__main__":
+    main()
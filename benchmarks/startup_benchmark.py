@@ -0,0 +1,58 @@
+"""Import (startup) time of the API and ingest entry points.
+
+    python -m benchmarks.startup_benchmark [--module app.main ...] [--repeat N] [--top K]
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+the way a new uvicorn worker or CLI ingest run starts. Prints the median
+cumulative import time and the slowest direct imports of the last run.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["app.main", "app.rag.ingest", "app.rag.retrieval_graph.graph"]
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """(self us, cumulative us, indented name) of every import made by `import module`."""
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", maxsplit=2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", dest="modules")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules or DEFAULT_MODULES:
+        totals = []
+        for _ in range(args.repeat):
+            rows = import_times(module)
+            totals.append(next(c for _, c, name in rows if name.strip() == module))
+        print(f"{module}: {statistics.median(totals) / 1000:.0f} ms (median of {args.repeat})")
+        # 모듈이 직접 import한 것 중 느린 순서 (importtime은 한 단계마다 두 칸씩 들여씀)
+        direct = [(c, name.strip()) for _, c, name in rows if name.startswith("   ") and name[3] != " "]
+        for cumulative, name in sorted(direct, reverse=True)[: args.top]:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Per-row signup inserts vs batched bulk import.
+
+    python -m benchmarks.user_import_benchmark [--users N] [--batch B]
+
+Stores `users` users in a temporary SQLite database (aiosqlite) once with
+`insert_user` per row (add + commit + refresh) and once with `import_users`
+in batches of `batch`. Password hashing is replaced by a cheap function so
+only the database work is compared.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import app.core.security as security
+import app.service.user_service as user_service
+from app.config import settings
+from app.core.database import make_engine, make_sessionmaker
+from app.model.models import Base, User
+from app.repository.db.db_user_repository import UserRepositoryDB
+
+
+async def run(users: int, batch: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'users.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessionmaker = make_sessionmaker(engine)
+
+        start = time.perf_counter()
+        async with sessionmaker() as db:
+            repo = UserRepositoryDB(db)
+            for i in range(users):
+                await repo.insert_user(
+                    User(user_id=f"row-{i}", password="hashed", nickname=f"user {i}", img_id="img")
+                )
+        elapsed = time.perf_counter() - start
+        print(f"insert_user  {users} users: {elapsed * 1000:8.0f} ms ({users / elapsed:8.0f} rows/s)")
+
+        async def lines():
+            for i in range(users):
+                yield json.dumps(
+                    {"user_id": f"bulk-{i}", "password": "pw", "nickname": f"user {i}", "img_id": "img"}
+                )
+
+        settings.BULK_IMPORT_BATCH_SIZE = batch
+        async with sessionmaker() as db:
+            report = await user_service.import_users(UserRepositoryDB(db), lines())
+        print(
+            f"import_users {report.inserted} users: {report.elapsed_seconds * 1000:8.0f} ms "
+            f"({report.rows_per_second:8.0f} rows/s, batch {batch})"
+        )
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    # bcrypt 비용은 제외하고 DB 왕복만 비교
+    security.get_password_hash = lambda password: f"hashed {password}"
+    asyncio.run(run(args.users, args.batch))
+
+
+if __name__ == "__main__":
+    main()
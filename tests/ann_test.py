@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from app.rag.ann import IVFIndex
+from app.rag.local_store import LocalVectorStore
+
+
+class NoEmbeddings:
+    def embed_documents(self, texts):
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def clustered(n, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return vectors.astype(np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalVectorStore(str(tmp_path / "store"), NoEmbeddings(), nprobe=4)
+    vectors = clustered(3000)
+    store.add_embeddings([f"t{i}" for i in range(3000)], vectors, ids=[str(i) for i in range(3000)])
+    store.train_ann(nlist=32)
+    yield store
+    store.close()
+
+
+def recall(store, queries, k=10, **kwargs):
+    found = 0
+    for query in queries:
+        exact = {d.id for d in store.similarity_search_by_vector(query, k=k, exact=True)}
+        approx = {d.id for d in store.similarity_search_by_vector(query, k=k, **kwargs)}
+        found += len(exact & approx)
+    return found / (k * len(queries))
+
+
+def test_recall_improves_with_nprobe(store):
+    queries = clustered(50, seed=1).tolist()
+    assert recall(store, queries, nprobe=32) == 1.0
+    assert recall(store, queries, nprobe=4) >= 0.9
+    assert recall(store, queries, nprobe=1) <= recall(store, queries, nprobe=8)
+
+
+def test_candidates_cover_probed_lists(store):
+    ann = store.ann
+    query = np.asarray(store._matrix()[0])
+    rows = ann.candidates(query, nprobe=ann.nlist)
+    assert np.array_equal(rows, np.arange(len(store._uuids)))
+    assert len(ann.candidates(query, nprobe=1)) < len(rows)
+
+
+def test_inserts_and_deletes_stay_in_sync(store):
+    new = clustered(10, seed=2)
+    store.add_embeddings([f"n{i}" for i in range(10)], new, ids=[f"n{i}" for i in range(10)])
+    assert len(store.ann.assignments) == 3010
+    [top] = store.similarity_search_by_vector(new[3].tolist(), k=1)
+    assert top.id == "n3"
+
+    store.delete(["n3"])
+    [top] = store.similarity_search_by_vector(new[3].tolist(), k=1)
+    assert top.id != "n3"
+
+
+def test_persists_and_survives_compaction(store):
+    store.delete([str(i) for i in range(0, 3000, 2)])
+    reopened = LocalVectorStore(store.path, NoEmbeddings(), nprobe=32)
+    assert reopened.ann is not None and reopened.ann.nlist == 32
+    assert isinstance(reopened.ann.assignments, np.memmap)
+
+    query = clustered(1, seed=3)[0].tolist()
+    before = [d.id for d in reopened.similarity_search_by_vector(query, k=5)]
+    reopened.compact()
+    assert len(reopened.ann.assignments) == 1500
+    assert [d.id for d in reopened.similarity_search_by_vector(query, k=5)] == before
+    reopened.close()
+
+
+def test_training_policy(store, tmp_path):
+    assert not store.needs_ann_training(min_rows=1000)
+    assert store.needs_ann_training(min_rows=1000, growth=1.0)
+    empty = LocalVectorStore(str(tmp_path / "empty"), NoEmbeddings())
+    assert not empty.needs_ann_training(min_rows=1)
+    with pytest.raises(ValueError):
+        empty.train_ann()
+    store.drop_ann()
+    assert store.ann is None and IVFIndex.load(store.path) is None
@@ -0,0 +1,276 @@
+import asyncio
+import fnmatch
+import json
+import time
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+import app.service.rag_service as rag_service
+from app.core import security
+from app.rag.answer_cache import (
+    AnswerCache,
+    CachedAnswer,
+    LocalAnswerCache,
+    RedisAnswerCache,
+    bump_index_version,
+    get_answer_cache,
+)
+from app.routes import rag_router
+
+# 질문 -> 임베딩 (비슷한 질문은 비슷한 벡터)
+VECTORS = {
+    "how do I install langgraph?": [1.0, 0.0, 0.0],
+    "How do I install LangGraph": [0.99, 0.05, 0.0],
+    "what is a checkpointer?": [0.0, 1.0, 0.0],
+}
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return VECTORS.get(text, [0.0, 0.0, 1.0])
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by RedisAnswerCache (values are bytes, like redis-py)."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+        self.zsets = {}
+
+    def _alive(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.time():
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+            del self.expires[key]
+        return key in self.values or key in self.zsets
+
+    def get(self, key):
+        return self.values.get(key) if self._alive(key) else None
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        if ex:
+            self.expires[key] = time.time() + ex
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrange(self, key, start, end):
+        if not self._alive(key):
+            return []
+        members = sorted(self.zsets[key], key=self.zsets[key].get)
+        return [m.encode() for m in members[start : None if end == -1 else end + 1]]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zremrangebyrank(self, key, start, end):
+        self.zrem(key, *(m.decode() for m in self.zrange(key, start, end)))
+
+    def delete(self, *keys):
+        for key in keys:
+            key = key.decode() if isinstance(key, bytes) else key
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+
+    def expire(self, key, seconds):
+        self.expires[key] = time.time() + seconds
+
+    def scan_iter(self, pattern):
+        keys = [*self.values, *self.zsets]
+        return [key.encode() for key in keys if fnmatch.fnmatch(key, pattern)]
+
+
+def make_cache(backend=None, tmp_path=None, threshold=0.95):
+    if backend is None:
+        backend = LocalAnswerCache(index_version_path=str(tmp_path / "index_version"))
+    return AnswerCache(backend, FakeEmbeddings(), threshold=threshold)
+
+
+def store(cache, question, answer, configurable=None, history=()):
+    async def run():
+        _, vector, partition = await cache.alookup(question, configurable or {}, history)
+        await cache.astore(
+            question, vector, partition, answer, [Document(page_content="doc", metadata={"source": "a"})]
+        )
+
+    asyncio.run(run())
+
+
+def lookup(cache, question, configurable=None, history=()):
+    return asyncio.run(cache.alookup(question, configurable or {}, history))[0]
+
+
+def test_similar_question_hits_and_different_question_misses(tmp_path):
+    cache = make_cache(tmp_path=tmp_path)
+    store(cache, "how do I install langgraph?", "pip install langgraph")
+
+    hit = lookup(cache, "How do I install LangGraph")
+    assert hit.answer == "pip install langgraph"
+    assert hit.to_documents()[0].metadata == {"source": "a"}
+    assert lookup(cache, "what is a checkpointer?") is None
+    assert cache.backend.stats.hits == 1
+
+
+def test_partitions_by_configuration_and_history(tmp_path):
+    cache = make_cache(tmp_path=tmp_path)
+    store(cache, "how do I install langgraph?", "answer", {"response_model": "a"})
+
+    assert lookup(cache, "how do I install langgraph?", {"response_model": "b"}) is None
+    assert lookup(cache, "how do I install langgraph?", {"response_model": "a"}, [("user", "hi")]) is None
+    assert lookup(cache, "how do I install langgraph?", {"response_model": "a"}).answer == "answer"
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    backend = LocalAnswerCache(ttl=0.01, index_version_path=str(tmp_path / "index_version"))
+    cache = make_cache(backend)
+    store(cache, "how do I install langgraph?", "answer")
+    time.sleep(0.02)
+
+    assert lookup(cache, "how do I install langgraph?") is None
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    backend = LocalAnswerCache(max_entries=2, index_version_path=str(tmp_path / "index_version"))
+    cache = make_cache(backend)
+    store(cache, "how do I install langgraph?", "install")
+    store(cache, "what is a checkpointer?", "checkpointer")
+    assert lookup(cache, "how do I install langgraph?").answer == "install"
+    store(cache, "something else", "other")
+
+    assert lookup(cache, "what is a checkpointer?") is None
+    assert lookup(cache, "how do I install langgraph?").answer == "install"
+    assert backend.stats.evictions == 1
+
+
+def test_index_version_bump_invalidates_answers(tmp_path):
+    path = tmp_path / "index_version"
+    cache = make_cache(LocalAnswerCache(index_version_path=str(path)))
+    store(cache, "how do I install langgraph?", "old answer")
+
+    bump_index_version(str(path))
+
+    assert lookup(cache, "how do I install langgraph?") is None
+    store(cache, "how do I install langgraph?", "new answer")
+    assert lookup(cache, "how do I install langgraph?").answer == "new answer"
+
+
+def test_redis_backend_round_trip_lru_and_version():
+    client = FakeRedis()
+    backend = RedisAnswerCache(client=client, max_entries=1, ttl=60)
+    cache = make_cache(backend)
+    store(cache, "how do I install langgraph?", "install")
+    assert lookup(cache, "How do I install LangGraph").answer == "install"
+
+    # 파티션당 1개만 유지
+    store(cache, "what is a checkpointer?", "checkpointer")
+    assert lookup(cache, "how do I install langgraph?") is None
+    assert lookup(cache, "what is a checkpointer?").answer == "checkpointer"
+
+    backend.set_index_version("v2")
+    assert lookup(cache, "what is a checkpointer?") is None
+
+
+def test_redis_stores_binary_vectors_and_scans_recent_entries_only():
+    client = FakeRedis()
+    backend = RedisAnswerCache(client=client, max_scan=1)
+    cache = make_cache(backend)
+    store(cache, "how do I install langgraph?", "install")
+    vector_keys = [key for key in client.values if key.endswith(":vector")]
+    assert len(vector_keys) == 1
+    assert np.frombuffer(client.values[vector_keys[0]], dtype=np.float32).shape == (3,)
+
+    # 더 최근 항목이 생기면 max_scan=1 밖으로 밀려난 항목은 비교하지 않음
+    store(cache, "what is a checkpointer?", "checkpointer")
+    assert lookup(cache, "how do I install langgraph?") is None
+    assert lookup(cache, "what is a checkpointer?").answer == "checkpointer"
+
+
+def test_redis_clear_keeps_index_version():
+    client = FakeRedis()
+    backend = RedisAnswerCache(client=client)
+    backend.set_index_version("v1")
+    vector = np.ones(3, dtype=np.float32) / np.sqrt(3)
+    backend.store("p", vector, CachedAnswer("a"))
+    backend.clear()
+
+    assert backend.index_version() == "v1"
+    assert backend.lookup("p", vector, 0.5) is None
+
+
+class CountingGraph:
+    def __init__(self):
+        self.runs = 0
+
+    async def astream_events(self, input, config, version):
+        self.runs += 1
+        yield {
+            "event": "on_chain_end",
+            "name": "rerank_documents",
+            "metadata": {"langgraph_node": "rerank_documents"},
+            "data": {
+                "output": {
+                    "context_documents": [Document(page_content="doc", metadata={"source": "s"})]
+                }
+            },
+        }
+
+        class Chunk:
+            content = "pip install langgraph"
+
+        yield {
+            "event": "on_chat_model_stream",
+            "name": "model",
+            "metadata": {"langgraph_node": "respond"},
+            "data": {"chunk": Chunk()},
+        }
+
+
+def parse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_answers_repeated_question_from_cache(tmp_path):
+    graph = CountingGraph()
+    cache = make_cache(tmp_path=tmp_path)
+    app = FastAPI()
+    app.include_router(rag_router.router)
+    app.dependency_overrides[rag_service.get_retrieval_graph] = lambda: graph
+    app.dependency_overrides[get_answer_cache] = lambda: cache
+    app.dependency_overrides[security.get_current_user] = lambda: "user"
+    client = TestClient(app)
+
+    first = parse(client.post("/rag/chat/stream", json={"question": "how do I install langgraph?"}).text)
+    second = parse(client.post("/rag/chat/stream", json={"question": "How do I install LangGraph"}).text)
+
+    assert graph.runs == 1
+    assert first[-1] == ("done", {"answer": "pip install langgraph", "cached": False})
+    assert second == [
+        ("progress", {"stage": "cache", "status": "hit", "sources": ["s"]}),
+        ("token", {"text": "pip install langgraph"}),
+        ("done", {"answer": "pip install langgraph", "cached": True}),
+    ]
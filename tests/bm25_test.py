@@ -0,0 +1,105 @@
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from app.rag.bm25 import BM25Index, BM25Retriever, tokenize
+
+
+def doc(text, source):
+    return Document(page_content=text, metadata={"source": source, "title": source})
+
+
+CORPUS = [
+    doc("ChatOpenAI wraps the OpenAI chat completions API.", "chat"),
+    doc("Chat models take messages and return a chat message. Chat chat chat.", "concepts"),
+    doc("If the connection drops you will see ERR_CONNECTION_RESET in the logs.", "errors"),
+    doc("Connection pooling keeps connections alive and resets idle ones.", "pooling"),
+    doc("from langchain_core.documents import Document", "documents"),
+]
+
+
+@pytest.fixture
+def index():
+    index = BM25Index()
+    index.add_documents(CORPUS)
+    return index
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    tokens = tokenize("ChatOpenAI ERR_CONNECTION_RESET langchain_core.documents")
+    assert {"chatopenai", "chat", "open", "ai"} <= set(tokens)
+    assert {"err_connection_reset", "err", "connection", "reset"} <= set(tokens)
+    assert {"langchain_core.documents", "langchain", "core", "documents"} <= set(tokens)
+    assert "한국어" in tokenize("한국어 문서")
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("ChatOpenAI", "chat"),
+        ("ERR_CONNECTION_RESET", "errors"),
+        ("langchain_core.documents", "documents"),
+        ("connection pooling", "pooling"),
+    ],
+)
+def test_identifier_queries_rank_first(index, query, expected):
+    [(top, score)] = index.search(query, k=1)
+    assert top.metadata["source"] == expected
+    assert score > 0
+
+
+def test_refresh_replaces_and_removes_sources(index):
+    index.begin_refresh()
+    index.add(doc("ChatOpenAI now supports streaming.", "chat"))
+    index.add(doc("ERR_CONNECTION_RESET is retried automatically.", "errors"))
+    index.end_refresh(remove_missing=True)
+
+    assert len(index) == 2
+    assert [d.page_content for d, _ in index.search("ChatOpenAI", k=5)] == [
+        "ChatOpenAI now supports streaming."
+    ]
+    assert index.search("pooling") == []
+
+
+def test_remove_sources_cleans_postings(index):
+    assert index.remove_sources(["errors", "missing"]) == 1
+    assert all(d.metadata["source"] != "errors" for d, _ in index.search("ERR_CONNECTION_RESET", 5))
+    assert "err_connection_reset" not in index._postings
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / "bm25" / "index.jsonl.gz")
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.search("ChatOpenAI", 3) == index.search("ChatOpenAI", 3)
+    assert len(BM25Index.load_or_create(str(tmp_path / "missing.gz"))) == 0
+
+
+def test_retriever_adds_score_and_uuid(index):
+    retriever = BM25Retriever(index=index, k=2)
+    docs = retriever.invoke("ERR_CONNECTION_RESET")
+    assert docs[0].metadata["source"] == "errors"
+    assert docs[0].metadata["uuid"] and docs[0].metadata["score"] > 0
+    assert len(docs) == 2
+
+
+def test_load_bm25_index_keeps_one_entry_per_path(index, tmp_path):
+    from app.rag.retrieval import load_bm25_index
+    from app.rag.utils import resource_registry
+
+    path = str(tmp_path / "index.jsonl.gz")
+    index.save(path)
+    first = load_bm25_index(path)
+    assert load_bm25_index(path) is first
+
+    # ingest가 파일을 다시 씀
+    index.add_documents([doc("A page added by the next ingest run.", "new")])
+    index.save(path)
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 10))
+    second = load_bm25_index(path)
+
+    assert second is not first and len(second) == len(index)
+    entries = [key for key in resource_registry._data if key[0] == "bm25" and key[1] == ((path,), ())]
+    assert len(entries) == 1
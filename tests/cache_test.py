@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import LRUCache, make_key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용됨
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_on_evict_is_called_outside_the_lock():
+    evicted = []
+
+    def on_evict(key, value):
+        evicted.append((key, value, cache._lock._is_owned()))
+
+    cache = LRUCache(maxsize=1, on_evict=on_evict)
+    cache.set("a", 1)
+    cache.get_or_set("b", lambda: 2)
+    cache.set("c", 3)
+    assert evicted == [("a", 1, False), ("b", 2, False)]
+    # 명시적으로 꺼낸 항목은 호출자가 처리
+    cache.pop("c")
+    assert len(evicted) == 2
+
+
+def test_get_or_set_calls_factory_once():
+    cache = LRUCache(maxsize=4)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return object()
+
+    first = cache.get_or_set("model", factory)
+    second = cache.get_or_set("model", factory)
+
+    assert first is second
+    assert len(calls) == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_ttl_expires_entries():
+    cache = LRUCache(maxsize=4, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+def test_make_key_ignores_kwarg_order():
+    assert make_key("openai", "gpt", temperature=0, stream_usage=True) == make_key(
+        "openai", "gpt", stream_usage=True, temperature=0
+    )
+    assert make_key(x={"a": [1, 2]}) != make_key(x={"a": [2, 1]})
+
+
+def test_slow_factory_does_not_block_other_keys():
+    cache = LRUCache(maxsize=4)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_factory():
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    threads = [threading.Thread(target=cache.get_or_set, args=("slow", slow_factory)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+
+    # "slow" 생성 중에도 다른 키는 바로 조회/생성됨
+    assert cache.get_or_set("fast", lambda: "fast") == "fast"
+    assert cache.get("slow") is None
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == ["slow"]
+    assert cache.get("slow") == "slow"
+    assert cache._building == {}
+
+
+def test_failed_factory_is_retried():
+    cache = LRUCache(maxsize=2)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_set("k", failing)
+    assert cache.get_or_set("k", lambda: 1) == 1
+    assert cache._building == {}
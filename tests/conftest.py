@@ -0,0 +1,35 @@
+import hashlib
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+
+class HashingEmbeddings(Embeddings):
+    """Bag-of-words vectors: texts sharing words are similar, no network needed.
+
+    `batches` records the size of every `embed_documents` call.
+    """
+
+    dim = 64
+
+    def __init__(self):
+        self.batches = []
+
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+@pytest.fixture
+def hashing_embeddings():
+    return HashingEmbeddings()
@@ -0,0 +1,81 @@
+from langchain_core.documents import Document
+
+from app.rag.context import (
+    CONTEXT_BUDGETS,
+    DEFAULT_CONTEXT_BUDGET,
+    approximate_token_count,
+    context_budget,
+    pack_context,
+)
+
+
+def words(text):
+    return len(text.split())
+
+
+def doc(text, **metadata):
+    return Document(page_content=text, metadata=metadata)
+
+
+def test_packs_in_order_with_compact_metadata():
+    docs = [
+        doc("First chunk.", source="https://a", title='Say "hi"', uuid="1", score=0.5),
+        doc("Second chunk.", source="https://b"),
+    ]
+    packed = pack_context(docs, budget=1000, count_tokens=words, min_document_tokens=1)
+    assert packed.text == (
+        "<documents>\n"
+        '<document source="https://a" title=\'Say "hi"\'>\nFirst chunk.\n</document>\n'
+        '<document source="https://b">\nSecond chunk.\n</document>\n'
+        "</documents>"
+    )
+    assert [d.status for d in packed.documents] == ["packed", "packed"]
+    assert packed.tokens == sum(d.tokens for d in packed.documents) + words("<documents>\n</documents>")
+    assert packed.tokens == words(packed.text)
+
+
+def test_duplicate_passages_are_dropped():
+    shared = "Overlap between two neighbouring chunks."
+    docs = [
+        doc(f"Intro paragraph.\n\n{shared}"),
+        doc(f"{shared}\n\nNew paragraph."),
+        doc(f"  {shared.upper()}  "),
+    ]
+    packed = pack_context(docs, budget=1000, count_tokens=words, min_document_tokens=1)
+    assert packed.text.count("neighbouring") == 1
+    assert "New paragraph." in packed.text
+    assert [d.duplicate_passages for d in packed.documents] == [0, 1, 1]
+    assert packed.documents[2].status == "duplicate" and packed.documents[2].tokens == 0
+
+
+def test_trims_at_sentence_boundaries_within_budget():
+    long_text = " ".join(f"Sentence number {i} is here." for i in range(100))
+    docs = [doc("Short first document."), doc(long_text), doc("Never reached. " * 20)]
+    packed = pack_context(docs, budget=60, count_tokens=words, min_document_tokens=5)
+    assert packed.tokens <= 60
+    first, second, third = packed.documents
+    assert first.status == "packed" and not first.truncated
+    assert second.truncated and second.tokens > 5
+    body = packed.text.split("<document>\n")[2].split("\n</document>")[0]
+    assert body.endswith("is here.") and body in long_text
+    assert third.status == "over_budget"
+
+
+def test_trimmed_passages_are_not_marked_seen():
+    first = "Kept paragraph.\n\n" + " ".join(["filler words"] * 50)
+    packed = pack_context(
+        [doc(first), doc(" ".join(["filler words"] * 50))],
+        budget=40,
+        count_tokens=words,
+        min_document_tokens=1,
+    )
+    assert packed.documents[0].truncated
+    assert packed.documents[1].duplicate_passages == 0
+
+
+def test_budgets():
+    assert context_budget("openai/gpt-4o-mini") == CONTEXT_BUDGETS["openai/gpt-4o-mini"]
+    assert context_budget("unknown/model") == DEFAULT_CONTEXT_BUDGET
+    assert context_budget("openai/gpt-4o-mini", 1234) == 1234
+    assert approximate_token_count("abcdefgh") == 2
+    assert pack_context([], budget=10).text == "<documents>\n</documents>"
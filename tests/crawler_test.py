@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.rag.crawler import AsyncCrawler
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{base}/docs/a</loc><lastmod>2024-01-01</lastmod></url>
+  <url><loc>{base}/docs/b</loc></url>
+  <url><loc>{base}/blog/c</loc></url>
+</urlset>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    state: dict = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.state
+        with state["lock"]:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            self._respond()
+        finally:
+            with state["lock"]:
+                state["in_flight"] -= 1
+
+    def _respond(self):
+        base = f"http://{self.headers['Host']}"
+        if self.path == "/sitemap.xml":
+            return self._send(200, SITEMAP.format(base=base).encode())
+        if self.path == "/flaky":
+            self.state["flaky_calls"] += 1
+            if self.state["flaky_calls"] == 1:
+                return self._send(503, b"busy")
+            return self._send(200, b"recovered")
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self._send(304, b"")
+            return self._send(200, b"fresh", {"ETag": '"v1"'})
+        if self.path.startswith("/slow"):
+            time.sleep(0.05)
+        return self._send(200, f"<html><title>{self.path}</title></html>".encode())
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    FixtureHandler.state = {
+        "lock": threading.Lock(),
+        "in_flight": 0,
+        "max_in_flight": 0,
+        "flaky_calls": 0,
+    }
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", FixtureHandler.state
+    httpd.shutdown()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_fetch_sitemap_applies_filter(server):
+    base, _ = server
+
+    async def main():
+        async with AsyncCrawler() as crawler:
+            return await crawler.fetch_sitemap(f"{base}/sitemap.xml", [f"{base}/docs/"])
+
+    entries = run(main())
+    assert [e.loc for e in entries] == [f"{base}/docs/a", f"{base}/docs/b"]
+    assert entries[0].lastmod == "2024-01-01"
+
+
+def test_retries_transient_errors(server):
+    base, state = server
+
+    async def main():
+        async with AsyncCrawler(backoff=0.01) as crawler:
+            return await crawler.fetch(f"{base}/flaky")
+
+    result = run(main())
+    assert result.ok and result.content == b"recovered"
+    assert state["flaky_calls"] == 2
+
+
+def test_conditional_get_returns_not_modified(server):
+    base, _ = server
+    url = f"{base}/etag"
+
+    async def main():
+        async with AsyncCrawler() as crawler:
+            first = await crawler.fetch(url)
+            crawler.validators[url] = (first.etag, first.last_modified)
+            return first, await crawler.fetch(url)
+
+    first, second = run(main())
+    assert first.content == b"fresh" and first.etag == '"v1"'
+    assert second.not_modified and second.content is None
+
+
+def test_crawl_respects_per_host_limit(server):
+    base, state = server
+    urls = [f"{base}/slow/{i}" for i in range(12)]
+
+    async def main():
+        async with AsyncCrawler(concurrency=8, per_host_limit=3) as crawler:
+            return [result async for result in crawler.crawl(urls, max_in_flight=2)]
+
+    results = run(main())
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert all(r.ok for r in results)
+    assert state["max_in_flight"] <= 3
+
+
+def test_crawl_turns_non_transport_errors_into_results():
+    def handler(request):
+        if request.url.path == "/broken":
+            raise httpx.DecodingError("bad gzip", request=request)
+        return httpx.Response(200, content=b"ok")
+
+    urls = [f"http://example.com/{i}" for i in range(5)] + ["http://example.com/broken"]
+
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with AsyncCrawler(concurrency=2, transport=transport) as crawler:
+            return [result async for result in crawler.crawl(urls)]
+
+    results = run(asyncio.wait_for(main(), timeout=5))
+    assert sorted(r.url for r in results) == sorted(urls)
+    broken = next(r for r in results if r.url.endswith("/broken"))
+    assert not broken.ok and broken.error.startswith("DecodingError")
+    assert sum(r.ok for r in results) == 5
+
+
+def test_crawl_turns_per_url_exceptions_into_results():
+    urls = ["http://example.com/a", "http://[::1/", "http://example.com/b"]
+
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"ok"))
+        async with AsyncCrawler(concurrency=2, transport=transport) as crawler:
+            return [result async for result in crawler.crawl(urls)]
+
+    results = run(asyncio.wait_for(main(), timeout=5))
+    assert sorted(r.url for r in results) == sorted(urls)
+    invalid = next(r for r in results if r.url == "http://[::1/")
+    assert not invalid.ok and invalid.error
+    assert sum(r.ok for r in results) == 2
+
+
+def test_crawl_propagates_target_errors_instead_of_hanging():
+    def targets():
+        yield "http://example.com/a"
+        raise RuntimeError("boom")
+
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"ok"))
+        async with AsyncCrawler(concurrency=2, transport=transport) as crawler:
+            return [result async for result in crawler.crawl(targets())]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run(asyncio.wait_for(main(), timeout=5))
+
+
+@pytest.mark.parametrize("content", [b"not a sitemap", b"   ", b"\x00\x01"])
+def test_unparseable_sitemap_is_empty(content):
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content))
+        async with AsyncCrawler(transport=transport) as crawler:
+            return await crawler.fetch_sitemap("http://example.com/sitemap.xml")
+
+    assert run(main()) == []
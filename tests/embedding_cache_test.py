@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.rag.embedding_cache import CachedEmbeddings, SQLiteEmbeddingStore, hash_text
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+
+def make_cached(tmp_path, max_entries=100, touch_interval=0):
+    store = SQLiteEmbeddingStore(
+        str(tmp_path / "emb.sqlite3"), max_entries=max_entries, touch_interval=touch_interval
+    )
+    underlying = CountingEmbeddings(size=8, calls=[])
+    return CachedEmbeddings(underlying, model="fake/model", store=store), underlying
+
+
+def test_repeated_texts_skip_the_api(tmp_path):
+    cached, underlying = make_cached(tmp_path)
+
+    first = cached.embed_documents(["a", "b", "a"])
+    second = cached.embed_documents(["b", "c"])
+
+    # "a"는 배치 안에서 한 번만, "b"는 두 번째 호출에서 캐시 히트
+    assert underlying.calls == [["a", "b"], ["c"]]
+    assert first[0] == first[2]
+    assert second[0] == first[1]
+    assert cached.stats == {"hits": 1, "misses": 3}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    cached, _ = make_cached(tmp_path)
+    vector = cached.embed_query("hello")
+    cached.store.close()
+
+    reopened, underlying = make_cached(tmp_path)
+    assert asyncio.run(reopened.aembed_query("hello")) == vector
+    assert underlying.calls == []
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    cached, _ = make_cached(tmp_path, max_entries=2)
+    cached.embed_documents(["a"])
+    cached.embed_documents(["b"])
+    cached.embed_documents(["a"])  # a의 last_used 갱신
+    cached.embed_documents(["c"])
+
+    store = cached.store
+    assert len(store) == 2
+    remaining = store.get_many("fake/model", [hash_text(t) for t in "abc"])
+    assert set(remaining) == {hash_text("a"), hash_text("c")}
+
+
+def test_recent_hits_do_not_write(tmp_path):
+    cached, _ = make_cached(tmp_path, touch_interval=300)
+    cached.embed_documents(["a", "b"])
+    changes = cached.store._conn.total_changes
+
+    cached.embed_documents(["a", "b"])
+    assert cached.store._conn.total_changes == changes
+    assert cached.stats == {"hits": 2, "misses": 2}
+
+
+def test_row_count_is_tracked_without_recounting(tmp_path):
+    store = SQLiteEmbeddingStore(str(tmp_path / "emb.sqlite3"), max_entries=3)
+    store.put_many("m", {"a": [1.0], "b": [2.0]})
+    store.put_many("m", {"b": [3.0], "c": [4.0], "d": [5.0]})
+
+    assert store._rows == len(store) == 3
+    assert store.get_many("m", ["b"]) == {"b": [3.0]}
+    assert "a" not in store.get_many("m", ["a"])
+
+
+def test_async_methods_use_a_worker_thread(tmp_path):
+    cached, _ = make_cached(tmp_path)
+    threads = []
+    get_many = cached.store.get_many
+
+    def recording_get_many(model, hashes):
+        threads.append(threading.current_thread())
+        return get_many(model, hashes)
+
+    cached.store.get_many = recording_get_many
+    first = asyncio.run(cached.aembed_documents(["a"]))
+    assert asyncio.run(cached.aembed_query("a")) == first[0]
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,77 @@
+import pytest
+from langchain_core.documents import Document
+from weaviate.classes.query import HybridFusion
+
+from app.rag.fusion import (
+    content_key,
+    fuse_query_results,
+    hybrid_fusion,
+    reciprocal_rank_fusion,
+    relative_score_fusion,
+)
+from app.rag.retrieval import make_weaviate_search_kwargs
+
+
+def docs(*pairs):
+    return [Document(page_content=f"text {u}", metadata={"uuid": u, "score": s}) for u, s in pairs]
+
+
+def uuids(result):
+    return [d.metadata["uuid"] for d in result]
+
+
+def test_rrf_rewards_documents_found_by_both_lists():
+    dense = docs(("a", 0.9), ("b", 0.8), ("c", 0.7))
+    keyword = docs(("c", 12.0), ("d", 3.0))
+    result = reciprocal_rank_fusion([dense, keyword])
+    assert uuids(result) == ["c", "a", "b", "d"]
+    assert result[0].metadata["fused_score"] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_rrf_weights_and_k():
+    dense = docs(("a", 0), ("b", 0))
+    keyword = docs(("b", 0), ("a", 0))
+    assert uuids(reciprocal_rank_fusion([dense, keyword], k=1, weights=[1, 2])) == ["b"]
+
+
+def test_relative_score_fusion_normalizes_each_list():
+    dense = docs(("a", 0.91), ("b", 0.90), ("c", 0.10))
+    keyword = docs(("b", 20.0), ("c", 10.0), ("a", 0.0))
+    result = relative_score_fusion([dense, keyword], weights=[0.5, 0.5])
+    assert uuids(result) == ["b", "a", "c"]
+    assert result[0].metadata["fused_score"] == pytest.approx(0.5 * (0.80 / 0.81) + 0.5)
+
+
+@pytest.mark.parametrize("alpha, expected", [(1.0, "a"), (0.0, "d")])
+def test_hybrid_alpha_extremes(alpha, expected):
+    dense = docs(("a", 0.9), ("b", 0.5))
+    keyword = docs(("d", 9.0), ("b", 1.0))
+    assert uuids(hybrid_fusion(dense, keyword, k=1, alpha=alpha))[0] == expected
+    assert uuids(hybrid_fusion(dense, keyword, k=1, alpha=alpha, fusion="rrf"))[0] == expected
+
+
+def test_unknown_fusion():
+    with pytest.raises(ValueError):
+        hybrid_fusion([], [], fusion="max")
+
+
+def test_weaviate_search_kwargs():
+    assert make_weaviate_search_kwargs({"k": 6}) == {"k": 6, "return_uuids": True}
+    kwargs = make_weaviate_search_kwargs({"k": 6, "alpha": 0.3, "fusion": "rrf"})
+    assert kwargs == {"k": 6, "alpha": 0.3, "fusion_type": HybridFusion.RANKED, "return_uuids": True}
+    with pytest.raises(ValueError):
+        make_weaviate_search_kwargs({"fusion": "max"})
+
+
+def test_fuse_query_results_merges_by_uuid_and_content():
+    first = docs(("a", 0), ("b", 0))
+    # 같은 uuid, 또는 uuid 없이 같은 내용이면 같은 청크
+    second = [Document(page_content="text b"), *docs(("a", 0), ("c", 0))]
+    result = fuse_query_results([first, second])
+    assert uuids(result) == ["a", "b", "c"]
+    assert result[0].metadata["fused_score"] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_fuse_query_results_assigns_content_uuid():
+    [doc] = fuse_query_results([[Document(page_content="x")], [Document(page_content="x")]])
+    assert doc.metadata["uuid"] == content_key(doc)
@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from langchain.indexes import SQLRecordManager
+from langchain_core.documents import Document
+from langchain_core.indexing import index
+
+from app.config import settings
+from app.rag.bm25 import BM25Index
+from app.rag.configuration import BaseConfiguration
+from app.rag.fusion import HybridRetriever
+from app.rag.local_store import LocalVectorStore
+from app.rag.retrieval import make_local_retriever
+
+
+TEXTS = [
+    "weaviate hybrid search combines bm25 and vectors",
+    "the record manager tracks indexed documents",
+    "embeddings are cached in sqlite",
+    "sitemaps list the pages to crawl",
+]
+
+
+@pytest.fixture
+def store(tmp_path, hashing_embeddings):
+    store = LocalVectorStore(str(tmp_path / "store"), hashing_embeddings, attributes=["source", "title"])
+    store.add_texts(
+        TEXTS,
+        metadatas=[{"source": f"s{i}", "title": f"t{i}", "extra": i} for i in range(len(TEXTS))],
+        ids=[f"id{i}" for i in range(len(TEXTS))],
+    )
+    yield store
+    store.close()
+
+
+def test_search_matches_brute_force(tmp_path, hashing_embeddings):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 32)).astype(np.float32)
+    store = LocalVectorStore(str(tmp_path / "s"), hashing_embeddings)
+    store.add_embeddings([f"t{i}" for i in range(500)], vectors, ids=[str(i) for i in range(500)])
+
+    query = rng.normal(size=32).astype(np.float32)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+    hits = store.similarity_search_by_vector_with_score(query.tolist(), k=10)
+    assert [doc.id for doc, _ in hits] == [str(i) for i in expected]
+    assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+
+
+def test_attributes_and_uuids(store):
+    [doc] = store.similarity_search("record manager", k=1, return_uuids=True)
+    assert doc.page_content == TEXTS[1]
+    assert doc.metadata == {"source": "s1", "title": "t1", "uuid": "id1"}
+    [doc] = store.similarity_search("record manager", k=1)
+    assert "uuid" not in doc.metadata
+
+
+def test_upsert_delete_and_reopen(store, hashing_embeddings):
+    store.add_texts(["sitemaps are now crawled concurrently"], [{"source": "s3"}], ids=["id3"])
+    store.delete(["id0"])
+    assert len(store) == 3
+
+    reopened = LocalVectorStore(store.path, hashing_embeddings)
+    assert len(reopened) == 3
+    assert [d.page_content for d in reopened.get_by_ids(["id3", "id0"])] == [
+        "sitemaps are now crawled concurrently"
+    ]
+    results = reopened.similarity_search("weaviate hybrid search bm25", k=4)
+    assert TEXTS[0] not in [d.page_content for d in results]
+
+    reopened.compact()
+    assert len(reopened._uuids) == 3
+    assert reopened.similarity_search("sitemaps crawled", k=1)[0].id == "id3"
+    reopened.close()
+
+
+def test_refresh_sees_rows_from_another_writer(store, hashing_embeddings):
+    reader = LocalVectorStore(store.path, hashing_embeddings)
+    store.add_texts(["a brand new page about grpc batching"], ids=["new"])
+    assert "new" not in reader._row_of
+    reader.refresh()
+    assert reader.similarity_search("grpc batching", k=1)[0].id == "new"
+    reader.close()
+
+
+def test_failed_insert_does_not_misalign_later_rows(store, hashing_embeddings):
+    store.train_ann(nlist=2)
+    vectors = np.eye(2, 64, dtype=np.float32)
+    # text가 NULL이라 INSERT가 실패: 벡터와 ANN 항목은 이미 파일에 쓰인 상태
+    with pytest.raises(sqlite3.IntegrityError):
+        store.add_embeddings(["orphan", None], vectors, ids=["orphan0", "orphan1"])
+    assert len(store._uuids) == 4 and "orphan0" not in store._row_of
+
+    store.add_embeddings(["aligned"], vectors[1:], ids=["aligned"])
+    for reader in (store, LocalVectorStore(store.path, hashing_embeddings)):
+        assert os.path.getsize(reader._vectors_path) == 5 * 64 * 4
+        assert len(reader.ann.assignments) == 5
+        [(doc, score)] = reader.similarity_search_by_vector_with_score(vectors[1].tolist(), k=1)
+        assert doc.id == "aligned" and score == pytest.approx(1.0)
+
+
+def test_works_with_index_and_record_manager(tmp_path, hashing_embeddings):
+    store = LocalVectorStore(str(tmp_path / "idx"), hashing_embeddings)
+    record_manager = SQLRecordManager("local/test", db_url=f"sqlite:///{tmp_path / 'rm.db'}")
+    record_manager.create_schema()
+    docs = [Document(page_content=t, metadata={"source": f"s{i % 2}"}) for i, t in enumerate(TEXTS)]
+
+    stats = index(docs, record_manager, store, cleanup="full", source_id_key="source")
+    assert stats["num_added"] == 4 and len(store) == 4
+    stats = index(docs[:2], record_manager, store, cleanup="full", source_id_key="source")
+    assert stats["num_skipped"] == 2 and stats["num_deleted"] == 2
+    assert len(store) == 2
+
+
+def test_hybrid_retriever_fuses_with_bm25(store):
+    keyword_index = BM25Index()
+    keyword_index.add_documents(
+        Document(page_content=t, metadata={"source": f"s{i}"}) for i, t in enumerate(TEXTS)
+    )
+    retriever = HybridRetriever(
+        vectorstore=store, keyword_index=keyword_index, k=2, search_kwargs={"return_uuids": True}
+    )
+    docs = retriever.invoke("sqlite embeddings")
+    assert docs[0].page_content == TEXTS[2]
+    assert len({d.page_content for d in docs}) == len(docs)
+
+
+def test_make_local_retriever(store, monkeypatch, hashing_embeddings):
+    monkeypatch.setattr(settings, "LOCAL_STORE_PATH", store.path)
+    configuration = BaseConfiguration(retriever_provider="local", search_kwargs={"k": 2})
+    with make_local_retriever(configuration, hashing_embeddings) as retriever:
+        docs = retriever.invoke("cached embeddings sqlite")
+    assert len(docs) == 2
+    assert docs[0].metadata["uuid"] == "id2"
+
+
+def test_store_evicted_from_resource_registry_is_closed(tmp_path, monkeypatch, hashing_embeddings):
+    from app.rag.retrieval import load_local_store
+    from app.rag.utils import drop_resource, resource_registry
+
+    monkeypatch.setattr(resource_registry, "maxsize", 1)
+    paths = [str(tmp_path / "a"), str(tmp_path / "b")]
+    first = load_local_store(paths[0], hashing_embeddings, "hashing")
+    assert load_local_store(paths[0], hashing_embeddings, "hashing") is first
+    second = load_local_store(paths[1], hashing_embeddings, "hashing")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.refresh()
+    second.refresh()
+    drop_resource("local_store", paths[1], "hashing")
+    with pytest.raises(sqlite3.ProgrammingError):
+        second.refresh()
+
+
+def test_refresh_sees_deletes_from_another_process(store, hashing_embeddings):
+    reader = LocalVectorStore(store.path, hashing_embeddings)
+    assert "id0" in reader._row_of
+
+    # ingest 프로세스에서의 삭제 (행 수와 벡터 파일 크기는 그대로)
+    script = (
+        "import sys; from app.rag.local_store import LocalVectorStore; "
+        "from tests.conftest import HashingEmbeddings; "
+        "LocalVectorStore(sys.argv[1], HashingEmbeddings()).delete(['id0'])"
+    )
+    subprocess.run([sys.executable, "-c", script, store.path], check=True)
+
+    reader.refresh()
+    assert "id0" not in reader._row_of
+    results = reader.similarity_search("weaviate hybrid search bm25", k=4)
+    assert TEXTS[0] not in [d.page_content for d in results]
+
+    generation = reader._generation
+    reader.refresh()
+    assert reader._generation == generation
+    reader.close()
@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import settings
+from app.rag import ingest
+from app.rag.page_state import (
+    IncrementalTracker,
+    PageState,
+    PageStateStore,
+    content_fingerprint,
+)
+from app.rag.parser import simple_extractor
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """Serves `site["pages"]` ({path: (lastmod, body)}) with ETags derived from the body."""
+
+    site: dict = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        base = f"http://{self.headers['Host']}"
+        pages = self.site["pages"]
+        if self.path == "/sitemap.xml":
+            urls = "".join(
+                f"<url><loc>{base}{path}</loc>"
+                + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "")
+                + "</url>"
+                for path, (lastmod, _) in pages.items()
+            )
+            body = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+            return self._send(200, body.encode())
+
+        self.site["fetched"].append(self.path)
+        _, text = pages[self.path]
+        etag = f'"{hashlib.md5(text.encode()).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"")
+        body = f"<html><title>{self.path}</title><article>{text}</article></html>"
+        return self._send(200, body.encode(), etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_WORKERS", 0)
+    SiteHandler.site = {"pages": {}, "fetched": []}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", SiteHandler.site
+    httpd.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PageStateStore("weaviate/test", db_url=f"sqlite:///{tmp_path / 'records.db'}")
+    store.create_schema()
+    return store
+
+
+def run_once(base, store):
+    tracker = IncrementalTracker(previous=store.load())
+    source = ingest.SitemapSource(f"{base}/sitemap.xml", parsing_function=simple_extractor)
+    docs = list(ingest.iter_sitemap_docs([source], tracker))
+    tracker.commit(store)
+    return sorted(doc.metadata["source"].removeprefix(base) for doc in docs), tracker
+
+
+def test_fingerprint_ignores_whitespace():
+    assert content_fingerprint("a  b\n\nc ") == content_fingerprint(" a b c")
+    assert content_fingerprint("a b") != content_fingerprint("a c")
+
+
+def test_store_round_trip(store):
+    store.upsert_many([PageState(url="u1", etag='"x"', fingerprint="f1")])
+    store.upsert_many([PageState(url="u1", etag='"y"', fingerprint="f2"), PageState(url="u2")])
+    other = PageStateStore("other", engine=store.engine)
+    other.upsert_many([PageState(url="u1")])
+
+    states = store.load()
+    assert set(states) == {"u1", "u2"}
+    assert (states["u1"].etag, states["u1"].fingerprint) == ('"y"', "f2")
+
+    store.delete_many(["u2"])
+    assert set(store.load()) == {"u1"}
+    assert set(other.load()) == {"u1"}
+
+
+def test_only_changed_pages_are_reindexed(site, store):
+    base, state = site
+    state["pages"].update(
+        {
+            "/a": ("2024-01-01", "page a"),
+            "/b": (None, "page b"),
+            "/c": (None, "page c"),
+            "/d": ("2024-01-01", "page d"),
+        }
+    )
+    changed, tracker = run_once(base, store)
+    assert changed == ["/a", "/b", "/c", "/d"]
+    assert tracker.stats["new"] == 4
+
+    # a: lastmod 그대로 → 요청하지 않음, b: 삭제, c: 공백만 달라짐, d: 내용 변경, e: 새 페이지
+    state["fetched"].clear()
+    state["pages"]["/c"] = (None, "page   c")
+    state["pages"]["/d"] = ("2024-02-01", "page d, updated")
+    del state["pages"]["/b"]
+    state["pages"]["/e"] = (None, "page e")
+
+    changed, tracker = run_once(base, store)
+    assert changed == ["/d", "/e"]
+    assert "/a" not in state["fetched"]
+    assert tracker.stats == {
+        "skipped_lastmod": 1,
+        "not_modified": 0,
+        "unchanged_content": 1,
+        "changed": 1,
+        "new": 1,
+    }
+    assert tracker.removed() == [f"{base}/b"]
+    assert set(store.load()) == {f"{base}{p}" for p in ("/a", "/c", "/d", "/e")}
+    assert store.load()[f"{base}/d"].lastmod == "2024-02-01"
+
+    # 변경이 없으면 조건부 GET이 304로 끝남
+    changed, tracker = run_once(base, store)
+    assert changed == []
+    assert tracker.stats["not_modified"] == 2 and tracker.stats["skipped_lastmod"] == 2
+
+
+def test_failed_sitemap_does_not_delete_pages(site, store):
+    base, _ = site
+    store.upsert_many([PageState(url=f"{base}/gone", fingerprint="f")])
+    changed, tracker = run_once(base, store)  # 빈 사이트맵
+    assert changed == []
+    assert tracker.removed() == []
+    assert set(store.load()) == {f"{base}/gone"}
+
+
+def test_single_urls_stream_through_the_crawl_and_parse_stages(site):
+    base, state = site
+    state["pages"].update({"/a": (None, "page a"), "/b": (None, "page b")})
+
+    docs = ingest.iter_url_docs([f"{base}/a", f"{base}/b"])
+    # 제너레이터라서 소비하기 전에는 요청하지 않음
+    assert state["fetched"] == []
+    docs = sorted(docs, key=lambda doc: doc.metadata["source"])
+    assert sorted(state["fetched"]) == ["/a", "/b"]
+    assert [doc.metadata["source"] for doc in docs] == [f"{base}/a", f"{base}/b"]
+    assert "page a" in docs[0].page_content and docs[0].metadata["title"] == "/a"
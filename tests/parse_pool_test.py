@@ -0,0 +1,43 @@
+import pytest
+
+from app.rag.parse_pool import ParsePool, ParseTask
+from app.rag.parser import langchain_docs_extractor, simple_extractor
+
+
+def make_tasks(n):
+    return [
+        ParseTask(
+            content=f"<html lang='en'><title>Page {i}</title><article><h2>Title {i}</h2><p>Body {i}</p></article></html>".encode(),
+            parsing_function=langchain_docs_extractor if i % 2 else simple_extractor,
+            meta={"loc": f"https://example.com/{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def expected(tasks):
+    with ParsePool(workers=0) as pool:
+        return list(pool.map(tasks))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_process_pool_matches_inline_parsing(ordered):
+    tasks = make_tasks(25)
+    with ParsePool(workers=2, chunksize=3, ordered=ordered) as pool:
+        results = list(pool.map(iter(tasks)))
+
+    if ordered:
+        assert results == expected(tasks)
+    else:
+        def key(result):
+            return result[1]["source"]
+
+        assert sorted(results, key=key) == sorted(expected(tasks), key=key)
+
+
+def test_inline_result_shape():
+    [(content, metadata)] = expected(make_tasks(2)[1:])
+    assert "## Title 1" in content
+    assert metadata["source"] == "https://example.com/1"
+    assert metadata["title"] == "Page 1"
+    assert metadata["language"] == "en"
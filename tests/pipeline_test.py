@@ -0,0 +1,60 @@
+import asyncio
+import itertools
+
+import pytest
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.rag.pipeline import iter_async, prepare_chunks
+
+
+def test_iter_async_bounds_the_producer():
+    produced = []
+
+    async def agen():
+        for i in range(100):
+            produced.append(i)
+            yield i
+            await asyncio.sleep(0)
+
+    items = iter_async(agen, max_buffered=4)
+    first = list(itertools.islice(items, 3))
+    items.close()
+
+    assert first == [0, 1, 2]
+    # 소비자가 멈추면 생산자도 버퍼 크기 근처에서 멈춰야 함
+    assert len(produced) < 20
+
+
+def test_iter_async_propagates_errors():
+    async def agen():
+        yield 1
+        raise RuntimeError("crawl failed")
+
+    items = iter_async(agen)
+    assert next(items) == 1
+    with pytest.raises(RuntimeError, match="crawl failed"):
+        next(items)
+
+
+def test_prepare_chunks_is_lazy_and_fills_metadata():
+    pulled = []
+
+    def docs():
+        for i in range(3):
+            pulled.append(i)
+            yield Document(page_content=f"document number {i} " * 20, metadata={"source": str(i)})
+        yield Document(page_content="short")
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=100, chunk_overlap=0)
+    chunks = prepare_chunks(docs(), splitter)
+
+    first = next(chunks)
+    assert pulled == [0]
+    assert first.metadata == {"source": "0", "title": ""}
+
+    rest = list(chunks)
+    assert all(len(c.page_content) > 10 for c in rest)
+    assert [c.metadata["source"] for c in [first, *rest]] == sorted(
+        c.metadata["source"] for c in [first, *rest]
+    )
@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+from langchain_core.load import dumpd
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.rag.prompt_registry import PromptRegistry
+
+
+class FakeClient:
+    def __init__(self, prompts):
+        # identifier -> (commit hash, template)
+        self.prompts = prompts
+        self.pulls = []
+
+    def get_prompt(self, identifier):
+        return SimpleNamespace(last_commit_hash=self.prompts[identifier][0])
+
+    def pull_prompt_commit(self, identifier):
+        self.pulls.append(identifier)
+        commit_hash, template = self.prompts[identifier]
+        manifest = dumpd(ChatPromptTemplate.from_messages([("system", template)]))
+        return SimpleNamespace(commit_hash=commit_hash, manifest=manifest)
+
+
+def make_registry(path, client):
+    return PromptRegistry({"ROUTER": "owner/router", "PLAN": "owner/plan"}, str(path), lambda: client)
+
+
+def test_missing_snapshot_gives_empty_prompts_without_network(tmp_path):
+    def no_client():
+        raise AssertionError("get() must not connect to LangSmith")
+
+    registry = PromptRegistry({"ROUTER": "owner/router"}, str(tmp_path / "prompts.json"), no_client)
+
+    assert registry.get("ROUTER") == ""
+
+
+def test_refresh_writes_a_snapshot_that_new_registries_load(tmp_path):
+    path = tmp_path / "prompts.json"
+    client = FakeClient({"owner/router": ("c1", "route {question}"), "owner/plan": ("p1", "plan")})
+    assert sorted(make_registry(path, client).refresh()) == ["PLAN", "ROUTER"]
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot["version"] == 1
+    assert snapshot["prompts"]["ROUTER"]["commit_hash"] == "c1"
+
+    offline = make_registry(path, None)
+    assert offline.get("ROUTER") == "route {question}"
+    assert offline.get("PLAN") == "plan"
+
+
+def test_refresh_pulls_only_changed_commits(tmp_path):
+    path = tmp_path / "prompts.json"
+    client = FakeClient({"owner/router": ("c1", "old"), "owner/plan": ("p1", "plan")})
+    registry = make_registry(path, client)
+    registry.refresh()
+    client.pulls.clear()
+
+    client.prompts["owner/router"] = ("c2", "new")
+    assert registry.refresh() == ["ROUTER"]
+    assert client.pulls == ["owner/router"]
+    assert registry.get("ROUTER") == "new"
+    assert registry.refresh() == []
+
+
+def test_failed_refresh_keeps_snapshot_values(tmp_path):
+    path = tmp_path / "prompts.json"
+    client = FakeClient({"owner/router": ("c1", "route"), "owner/plan": ("p1", "plan")})
+    registry = make_registry(path, client)
+    registry.refresh()
+
+    def offline(identifier):
+        raise ConnectionError("offline")
+
+    client.get_prompt = offline
+    assert registry.refresh() == []
+    assert registry.get("ROUTER") == "route"
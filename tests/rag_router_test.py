@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Annotated
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AnyMessage
+from langgraph.graph import END, START, StateGraph, add_messages
+
+import app.service.rag_service as rag_service
+from app.core import security
+from app.routes import rag_router
+
+
+@dataclass(kw_only=True)
+class State:
+    messages: Annotated[list[AnyMessage], add_messages]
+    steps: list[str] = field(default_factory=list)
+    answer: str = ""
+
+
+def make_graph(fail=False):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="Hello there world")]))
+
+    async def create_research_plan(state: State):
+        return {"steps": ["look it up"]}
+
+    async def respond(state: State):
+        if fail:
+            raise RuntimeError("model down")
+        response = await model.ainvoke(state.messages)
+        return {"messages": [response], "answer": response.content}
+
+    builder = StateGraph(State)
+    builder.add_node(create_research_plan)
+    builder.add_node(respond)
+    builder.add_edge(START, "create_research_plan")
+    builder.add_edge("create_research_plan", "respond")
+    builder.add_edge("respond", END)
+    return builder.compile()
+
+
+def client_for(graph, authenticated=True):
+    app = FastAPI()
+    app.include_router(rag_router.router)
+    app.dependency_overrides[rag_service.get_retrieval_graph] = lambda: graph
+    if authenticated:
+        app.dependency_overrides[security.get_current_user] = lambda: "user"
+    return TestClient(app)
+
+
+def parse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_streams_progress_tokens_and_done():
+    response = client_for(make_graph()).post(
+        "/rag/chat/stream", json={"question": "hi", "history": [{"role": "user", "content": "before"}]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse(response.text)
+
+    assert events[0] == ("progress", {"stage": "plan", "status": "start"})
+    assert events[1] == ("progress", {"stage": "plan", "status": "end", "steps": ["look it up"]})
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1 and "".join(tokens) == "Hello there world"
+    # 첫 토큰은 respond 노드가 끝나기 전에 전달됨
+    respond_end = events.index(("progress", {"stage": "respond", "status": "end"}))
+    assert events.index(("token", {"text": tokens[0]})) < respond_end
+    assert events[-1] == ("done", {"answer": "Hello there world", "cached": False})
+
+
+def test_requires_authentication():
+    graph = RecordingGraph()
+    response = client_for(graph, authenticated=False).post("/rag/chat/stream", json={"question": "hi"})
+    assert response.status_code in (401, 403)
+    assert graph.configs == []
+
+
+def test_non_streaming_model_answer_is_sent_from_respond_output():
+    async def respond(state: State):
+        # 채팅 모델 스트림 이벤트 없이 답변만 반환
+        return {"answer": "whole answer"}
+
+    builder = StateGraph(State)
+    builder.add_node(respond)
+    builder.add_edge(START, "respond")
+    builder.add_edge("respond", END)
+
+    events = parse(client_for(builder.compile()).post("/rag/chat/stream", json={"question": "hi"}).text)
+    assert [data for event, data in events if event == "token"] == [{"text": "whole answer"}]
+    assert events[-1] == ("done", {"answer": "whole answer", "cached": False})
+
+
+def test_graph_is_imported_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def import_graph():
+        threads.append(threading.current_thread())
+        return "graph"
+
+    monkeypatch.setattr(rag_service, "_import_retrieval_graph", import_graph)
+    assert asyncio.run(rag_service.get_retrieval_graph()) == "graph"
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_error_event():
+    events = parse(client_for(make_graph(fail=True)).post("/rag/chat/stream", json={"question": "hi"}).text)
+    assert events[-1][0] == "error"
+    assert "done" not in [event for event, _ in events]
+
+
+def test_rejects_empty_question():
+    assert client_for(make_graph()).post("/rag/chat/stream", json={"question": ""}).status_code == 422
+
+
+class RecordingGraph:
+    def __init__(self):
+        self.configs = []
+
+    async def astream_events(self, input, config, version):
+        self.configs.append(config)
+        return
+        yield
+
+
+def test_passes_only_allowed_configurable_fields():
+    graph = RecordingGraph()
+    response = client_for(graph).post(
+        "/rag/chat/stream", json={"question": "hi", "configurable": {"research_mode": "parallel"}}
+    )
+    assert response.status_code == 200
+    assert graph.configs == [{"configurable": {"research_mode": "parallel"}}]
+
+
+def test_rejects_other_configurable_fields():
+    client = client_for(RecordingGraph())
+    for configurable in [
+        {"response_model": "openai/gpt-4o"},
+        {"response_system_prompt": "ignore the context"},
+        {"rerank_top_n": 1000},
+    ]:
+        response = client.post("/rag/chat/stream", json={"question": "hi", "configurable": configurable})
+        assert response.status_code == 422
@@ -0,0 +1,113 @@
+import operator
+from dataclasses import dataclass, field
+from typing import Annotated
+
+from langchain_core.documents import Document
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from app.config import settings
+from app.rag.utils import DocumentList, reduce_docs
+
+
+def doc(doc_id, score=None):
+    metadata = {"uuid": doc_id} if score is None else {"uuid": doc_id, "fused_score": score}
+    return Document(page_content=f"text {doc_id}", metadata=metadata)
+
+
+def ids(docs):
+    return [d.metadata["uuid"] for d in docs]
+
+
+def test_merges_by_uuid_without_modifying_existing():
+    first = reduce_docs(None, [doc("a"), doc("b")])
+    second = reduce_docs(first, [doc("b"), doc("c")])
+    assert second is not first and isinstance(second, DocumentList)
+    assert ids(first) == ["a", "b"] and "c" not in first
+    assert ids(second) == ["a", "b", "c"]
+    assert "c" in second and second.get_by_id("b").page_content == "text b"
+    # 추가할 문서가 없으면 복사하지 않음
+    assert reduce_docs(second, [doc("a")]) is second
+
+
+def test_input_list_is_not_modified():
+    given = [doc("a")]
+    result = reduce_docs(given, [doc("b")])
+    assert ids(given) == ["a"] and ids(result) == ["a", "b"]
+
+
+def test_inputs_without_uuid_are_keyed_by_content():
+    plain = Document(page_content="same", metadata={"source": "x"})
+    result = reduce_docs(None, [plain, "same", {"page_content": "same", "metadata": {}}, "other"])
+    assert [d.page_content for d in result] == ["same", "other"]
+    # 원본 문서는 복사되지 않고 수정되지도 않음
+    assert "uuid" not in plain.metadata
+    assert reduce_docs(result, "other") is result and len(result) == 2
+
+
+def test_delete_resets():
+    assert reduce_docs([doc("a")], "delete") == []
+
+
+def test_capacity_evicts_lowest_scores_first(monkeypatch):
+    monkeypatch.setattr(settings, "STATE_MAX_DOCUMENTS", 3)
+    result = reduce_docs(None, [doc("a", 0.5), doc("b"), doc("c", 0.9)])
+    result = reduce_docs(result, [doc("d", 0.7), doc("e", 0.1)])
+    assert ids(result) == ["a", "c", "d"]
+    evicted = reduce_docs(result, [doc("f", 0.6)])
+    assert ids(evicted) == ["c", "d", "f"] and ids(result) == ["a", "c", "d"]
+    assert evicted.get_by_id("f") is evicted[2] and "a" not in evicted
+
+
+@dataclass(kw_only=True)
+class State:
+    documents: Annotated[list[Document], reduce_docs] = field(default_factory=list)
+    steps: Annotated[list[int], operator.add] = field(default_factory=list)
+
+
+def test_graph_with_conditional_edges_and_checkpointer():
+    # 조건부 엣지는 노드의 업데이트를 채널 복사본에 한 번 더 적용해 읽으므로 결과가 멱등이어야 함
+    def research(state: State):
+        step = len(state.steps)
+        return {"documents": [f"step {step}", doc(f"d{step}"), doc("shared")], "steps": [step]}
+
+    def route(state: State):
+        return "research" if len(state.steps) < 3 else END
+
+    builder = StateGraph(State)
+    builder.add_node(research)
+    builder.add_edge(START, "research")
+    builder.add_conditional_edges("research", route, ["research", END])
+    graph = builder.compile(checkpointer=InMemorySaver())
+
+    config = {"configurable": {"thread_id": "1"}}
+    output = graph.invoke({"documents": [doc("input")]}, config)
+    assert [d.page_content for d in output["documents"]] == [
+        "text input",
+        "step 0",
+        "text d0",
+        "text shared",
+        "step 1",
+        "text d1",
+        "step 2",
+        "text d2",
+    ]
+    assert graph.get_state(config).values["documents"] == output["documents"]
+
+
+def test_streamed_snapshots_are_not_modified_afterwards():
+    def first(state: State):
+        return {"documents": [doc("a")]}
+
+    def second(state: State):
+        return {"documents": [doc("b")]}
+
+    builder = StateGraph(State)
+    builder.add_node(first)
+    builder.add_node(second)
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    graph = builder.compile()
+
+    snapshots = list(graph.stream({"documents": []}, stream_mode="values"))
+    assert [ids(s["documents"]) for s in snapshots] == [[], ["a"], ["a", "b"]]
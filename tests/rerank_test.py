@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+
+from app.rag import rerank
+from app.rag.rerank import (
+    HybridReranker,
+    LexicalReranker,
+    Reranker,
+    make_reranker,
+    register_reranker,
+)
+
+
+DOCS = [
+    Document(page_content="the record manager tracks indexed documents", metadata={"uuid": "a"}),
+    Document(page_content="weaviate hybrid search combines bm25 and vectors", metadata={"uuid": "b"}),
+    Document(page_content="configure the ChatOpenAI model with a temperature", metadata={"uuid": "c"}),
+]
+
+
+def ids(docs):
+    return [d.metadata["uuid"] for d in docs]
+
+
+def test_none_keeps_order_and_cuts():
+    result = Reranker().rerank("anything", DOCS, top_n=2)
+    assert ids(result) == ["a", "b"]
+    assert result[0].metadata["rerank_score"] > result[1].metadata["rerank_score"]
+
+
+def test_lexical_prefers_matching_identifiers():
+    assert ids(LexicalReranker().rerank("How do I set up ChatOpenAI?", DOCS))[0] == "c"
+    assert ids(LexicalReranker().rerank("hybrid bm25 search", DOCS, top_n=1)) == ["b"]
+
+
+def test_hybrid_embeds_in_batches(hashing_embeddings):
+    reranker = HybridReranker(hashing_embeddings, batch_size=2)
+    result = reranker.rerank("which documents does the record manager track", DOCS, top_n=2)
+    assert ids(result)[0] == "a" and len(result) == 2
+    assert hashing_embeddings.batches == [2, 1]
+    assert 0 < result[0].metadata["rerank_score"] <= 1
+    # 원본 문서의 metadata는 바뀌지 않음
+    assert "rerank_score" not in DOCS[0].metadata
+
+
+def test_async_matches_sync(hashing_embeddings):
+    reranker = HybridReranker(hashing_embeddings)
+    query = "vectors and bm25"
+    sync = reranker.rerank(query, DOCS)
+    assert [d.metadata for d in asyncio.run(reranker.arerank(query, DOCS))] == [
+        d.metadata for d in sync
+    ]
+    assert asyncio.run(reranker.arerank(query, [])) == []
+
+
+def test_registry(monkeypatch, hashing_embeddings):
+    monkeypatch.setattr(rerank, "RERANKERS", dict(rerank.RERANKERS))
+    assert isinstance(make_reranker("lexical", hashing_embeddings), LexicalReranker)
+    register_reranker("reverse", lambda embeddings: ReverseReranker())
+    assert ids(make_reranker("reverse", hashing_embeddings).rerank("q", DOCS)) == ["c", "b", "a"]
+    with pytest.raises(ValueError):
+        make_reranker("cross-encoder", hashing_embeddings)
+
+
+class ReverseReranker(Reranker):
+    def score(self, query, docs):
+        return list(range(len(docs)))
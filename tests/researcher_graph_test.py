@@ -0,0 +1,33 @@
+import asyncio
+from contextlib import contextmanager
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from app.rag.retrieval_graph.researcher_graph import graph as researcher
+
+
+class FakeRetriever(BaseRetriever):
+    results: dict[str, list[str]]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return [
+            Document(page_content=f"chunk {c}", metadata={"uuid": c}) for c in self.results[query]
+        ]
+
+
+def test_research_results_are_fused_and_deduplicated(monkeypatch):
+    results = {"q1": ["a", "b"], "q2": ["b", "c"], "q3": ["b", "a"]}
+
+    async def ainvoke_structured(model, schema, messages, config=None, **kwargs):
+        return {"queries": ["q1", "q2", "q3"]}
+
+    @contextmanager
+    def make_retriever(config):
+        yield FakeRetriever(results=results)
+
+    monkeypatch.setattr(researcher, "ainvoke_structured", ainvoke_structured)
+    monkeypatch.setattr(researcher.retrieval, "make_retriever", make_retriever)
+
+    output = asyncio.run(researcher.graph.ainvoke({"question": "q"}))
+    assert [d.metadata["uuid"] for d in output["documents"]] == ["b", "a", "c"]
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+import app.rag.retrieval_graph.graph as retrieval_graph
+from app.rag.context import approximate_token_count
+
+STEPS = ["step 1", "step 2", "step 3", "step 4"]
+
+
+class StubResearcher:
+    """researcher_graph 대신 사용: 단계마다 고유 문서 + 공통 문서를 반환하고 동시 실행 수를 기록"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.questions = []
+
+    async def ainvoke(self, input, config=None):
+        self.questions.append(input["question"])
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.running -= 1
+        step = input["question"]
+        return {
+            "documents": [
+                Document(page_content=f"doc for {step}", metadata={"uuid": step}),
+                Document(page_content="shared doc", metadata={"uuid": "shared"}),
+            ]
+        }
+
+
+class StubReranker:
+    def __init__(self):
+        self.calls = []
+
+    async def arerank(self, query, documents, top_n):
+        self.calls.append(list(documents))
+        return list(documents)[:top_n]
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    researcher = StubResearcher()
+    reranker = StubReranker()
+
+    async def ainvoke_structured(model, schema, messages, config=None, **kwargs):
+        return {"steps": list(STEPS)}
+
+    monkeypatch.setattr(retrieval_graph, "ainvoke_structured", ainvoke_structured)
+    monkeypatch.setattr(retrieval_graph, "researcher_graph", researcher)
+    monkeypatch.setattr(retrieval_graph, "make_reranker", lambda name, encoder: reranker)
+    monkeypatch.setattr(retrieval_graph, "make_text_encoder", lambda model: None)
+    monkeypatch.setattr(retrieval_graph, "get_token_counter", lambda model: approximate_token_count)
+    monkeypatch.setattr(
+        retrieval_graph,
+        "load_chat_model",
+        lambda model: GenericFakeChatModel(messages=iter([AIMessage(content="answer")])),
+    )
+    return researcher, reranker
+
+
+def run(configurable):
+    return asyncio.run(
+        retrieval_graph.graph.ainvoke(
+            {"messages": [("user", "question")]}, {"configurable": configurable}
+        )
+    )
+
+
+def test_parallel_research_merges_all_steps_and_respects_cap(stubs):
+    researcher, reranker = stubs
+    output = run({"research_mode": "parallel", "max_parallel_research": 2, "rerank_top_n": 10})
+
+    assert sorted(researcher.questions) == STEPS
+    # 단계들은 동시에 실행되지만 max_parallel_research를 넘지 않음
+    assert researcher.peak == 2
+    assert sorted(d.metadata["uuid"] for d in output["documents"]) == sorted([*STEPS, "shared"])
+    assert len(reranker.calls) == 1
+    assert sorted(d.metadata["uuid"] for d in reranker.calls[0]) == sorted([*STEPS, "shared"])
+    assert output["answer"] == "answer"
+
+
+def test_sequential_research_runs_one_step_at_a_time(stubs):
+    researcher, reranker = stubs
+    output = run({"research_mode": "sequential", "rerank_top_n": 10})
+
+    assert researcher.questions == STEPS
+    assert researcher.peak == 1
+    assert [d.metadata["uuid"] for d in output["documents"]] == [
+        "step 1",
+        "shared",
+        "step 2",
+        "step 3",
+        "step 4",
+    ]
+    assert len(reranker.calls) == 1
+
+
+@pytest.mark.parametrize("research_mode", ["sequential", "parallel"])
+def test_empty_plan_goes_straight_to_respond(stubs, monkeypatch, research_mode):
+    researcher, reranker = stubs
+
+    async def ainvoke_structured(model, schema, messages, config=None, **kwargs):
+        return {"steps": []}
+
+    monkeypatch.setattr(retrieval_graph, "ainvoke_structured", ainvoke_structured)
+    output = run({"research_mode": research_mode})
+
+    assert researcher.questions == [] and reranker.calls == []
+    assert output["answer"] == "answer"
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import app.core.security as security
+from app.core.cache import LRUCache
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def fresh_token_cache(monkeypatch):
+    monkeypatch.setattr(security, "token_cache", LRUCache(maxsize=8, ttl=60))
+
+
+def test_password_hash_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def fake_hash(password):
+        threads.append(threading.current_thread().name)
+        return f"hashed {password}"
+
+    monkeypatch.setattr(security, "get_password_hash", fake_hash)
+
+    assert asyncio.run(security.aget_password_hash("secret")) == "hashed secret"
+    assert threads[0].startswith("password-hash")
+
+
+def test_hashed_password_verifies():
+    async def run():
+        hashed = await security.aget_password_hash("secret")
+        return await security.averify_password("secret", hashed), await security.averify_password(
+            "wrong", hashed
+        )
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_verified_token_is_cached(monkeypatch):
+    token = security.create_access_token({"user_id": "alice"})
+    decode = security.jwt.decode
+    calls = []
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+
+    assert asyncio.run(security.get_current_user(bearer(token))) == "alice"
+    assert asyncio.run(security.get_current_user(bearer(token))) == "alice"
+    assert len(calls) == 1
+
+
+def test_cached_token_is_rejected_after_it_expires():
+    token = security.create_access_token({"user_id": "alice", "exp": int(time.time()) + 1})
+    assert asyncio.run(security.get_current_user(bearer(token))) == "alice"
+    time.sleep(1.1)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(security.get_current_user(bearer(token)))
+    assert error.value.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "token", ["not-a-jwt", security.create_access_token({"sub": "no user id"})]
+)
+def test_invalid_token_is_rejected(token):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(security.get_current_user(bearer(token)))
+    assert error.value.status_code == 401
+    assert token not in security.token_cache
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# 새 워커의 import 시간 상한 (느린 CI에서는 STARTUP_IMPORT_BUDGET_MS로 조정)
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 3000))
+
+# 첫 사용 시점까지 import를 미루는 무거운 패키지
+DEFERRED = ["weaviate", "langchain_weaviate", "langchain_openai", "openai", "langchain_community"]
+
+
+def import_times(module):
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "test")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative_us, name = line.removeprefix("import time:").split("|", maxsplit=2)
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def test_api_startup_defers_rag_providers():
+    times = import_times("app.main")
+
+    assert not [name for name in times if name.split(".")[0] in {*DEFERRED, "langchain", "langgraph", "bs4"}]
+    assert times["app.main"] / 1000 < IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize("module", ["app.rag.ingest", "app.rag.retrieval_graph.graph"])
+def test_rag_modules_defer_provider_packages(module):
+    times = import_times(module)
+
+    assert not [name for name in times if name.split(".")[0] in DEFERRED]
+    assert "langchain.indexes" not in times
+    assert times[module] / 1000 < IMPORT_BUDGET_MS
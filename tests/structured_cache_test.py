@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+import app.rag.utils as utils
+from app.core.cache import LRUCache
+
+
+class Plan(dict):
+    pass
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def model(messages):
+        calls.append(messages)
+        return {"steps": [f"step {len(calls)}"]}
+
+    monkeypatch.setattr(utils, "structured_output_cache", LRUCache(maxsize=2, ttl=60))
+    monkeypatch.setattr(
+        utils, "load_structured_chat_model", lambda name, schema, **kwargs: RunnableLambda(model)
+    )
+    return calls
+
+
+def invoke(messages, model="openai/gpt-4o-mini", **kwargs):
+    return asyncio.run(utils.ainvoke_structured(model, Plan, messages, **kwargs))
+
+
+def test_repeated_input_is_served_from_cache(calls):
+    system = {"role": "system", "content": "plan the research"}
+    first = invoke([system, {"role": "user", "content": "How do I  use\nLangGraph?"}])
+    # 메시지 형식과 공백 차이는 같은 입력으로 취급
+    second = invoke([system, HumanMessage(content="How do I use LangGraph? ")])
+
+    assert first == second == {"steps": ["step 1"]}
+    assert len(calls) == 1
+    assert utils.structured_output_cache.stats.hits == 1
+
+
+def test_prompt_model_and_kwargs_are_part_of_the_key(calls):
+    question = {"role": "user", "content": "question"}
+    invoke([{"role": "system", "content": "prompt a"}, question])
+    invoke([{"role": "system", "content": "prompt b"}, question])
+    invoke([{"role": "system", "content": "prompt a"}, question], model="anthropic/claude")
+    invoke([{"role": "system", "content": "prompt a"}, question], method="function_calling")
+
+    assert len(calls) == 4
+
+
+def test_cached_result_is_not_shared_with_callers(calls):
+    messages = [{"role": "user", "content": "question"}]
+    invoke(messages)["steps"].append("mutated")
+
+    assert invoke(messages) == {"steps": ["step 1"]}
+
+
+def test_disabled_cache_always_calls_the_model(calls, monkeypatch):
+    monkeypatch.setattr(utils, "structured_output_cache", None)
+    messages = [{"role": "user", "content": "question"}]
+    invoke(messages)
+    invoke(messages)
+
+    assert len(calls) == 2
@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+import app.core.security as security
+from app.config import settings
+from app.core.database import get_db, make_engine, make_sessionmaker
+from app.core.util import iter_lines
+from app.main import app
+from app.model.models import Base, User
+from app.repository.db.db_user_repository import UserRepositoryDB
+
+
+@pytest.fixture
+def sessionmaker(tmp_path):
+    # MariaDB 대신 SQLite + aiosqlite 사용
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # 테스트마다 다른 이벤트 루프에서 실행되므로 이 루프에서 만든 연결은 닫아 둠
+        await engine.dispose()
+
+    asyncio.run(create_tables())
+    yield make_sessionmaker(engine)
+    asyncio.run(engine.dispose())
+
+
+def make_user(user_id="alice"):
+    return User(user_id=user_id, password="hashed", nickname="Alice", img_id="img")
+
+
+def test_insert_and_get_user(sessionmaker):
+    async def run():
+        async with sessionmaker() as db:
+            await UserRepositoryDB(db).insert_user(make_user())
+        async with sessionmaker() as db:
+            return await UserRepositoryDB(db).get_user("alice")
+
+    user = asyncio.run(run())
+    assert user.nickname == "Alice"
+
+
+def test_duplicate_insert_rolls_back_and_session_stays_usable(sessionmaker):
+    async def run():
+        async with sessionmaker() as db:
+            repo = UserRepositoryDB(db)
+            await repo.insert_user(make_user())
+            with pytest.raises(IntegrityError):
+                await repo.insert_user(make_user())
+            await repo.insert_user(make_user("bob"))
+            return await repo.get_user("bob")
+
+    assert asyncio.run(run()).user_id == "bob"
+
+
+def test_create_user_endpoint(sessionmaker):
+    async def override_get_db():
+        async with sessionmaker() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        body = {"user_id": "carol", "password": "secret", "nickname": "Carol", "img_id": "img"}
+        created = client.post("/user", json=body)
+        duplicate = client.post("/user", json=body)
+    finally:
+        app.dependency_overrides.pop(get_db)
+
+    assert created.status_code == 200 and created.json()["success"] is True
+    assert duplicate.json()["success"] is False
+    assert duplicate.json()["code"] == "INVALID_INPUT_VALUE"
+
+
+def test_insert_users_reports_duplicates_and_keeps_the_rest(sessionmaker):
+    async def run():
+        async with sessionmaker() as db:
+            repo = UserRepositoryDB(db)
+            await repo.insert_user(make_user("alice"))
+            failures = await repo.insert_users(
+                [make_user("alice"), make_user("bob"), make_user("bob"), make_user("carol")]
+            )
+            return failures, [await repo.get_user(i) is not None for i in ("bob", "carol")]
+
+    failures, stored = asyncio.run(run())
+    assert sorted(failures) == [0, 2]
+    assert stored == [True, True]
+
+
+def test_iter_lines_handles_chunk_boundaries():
+    async def chunks():
+        for chunk in [b'{"a": 1}\r\n{"b"', b': "\xea\xb0', b'\x80"}\n', b"last"]:
+            yield chunk
+
+    async def run():
+        return [line async for line in iter_lines(chunks())]
+
+    assert asyncio.run(run()) == ['{"a": 1}', '{"b": "가"}', "last"]
+
+
+@pytest.fixture
+def bulk_client(sessionmaker, monkeypatch):
+    # bcrypt 대신 빠른 해시 사용
+    monkeypatch.setattr(security, "get_password_hash", lambda password: f"hashed {password}")
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+
+    async def override_get_db():
+        async with sessionmaker() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[security.get_current_user] = lambda: "admin"
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db)
+    app.dependency_overrides.pop(security.get_current_user)
+
+
+def test_bulk_import_jsonl_reports_row_failures(bulk_client, sessionmaker):
+    rows = [
+        {"user_id": "u1", "password": "p", "nickname": "n1", "img_id": "i"},
+        {"user_id": "u2", "password": "p", "nickname": "n2"},
+        "not json",
+        {"user_id": "u3", "password": "p", "nickname": "n3", "img_id": "i"},
+        {"user_id": "u1", "password": "p", "nickname": "again", "img_id": "i"},
+    ]
+    body = "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+    response = bulk_client.post(
+        "/user/bulk", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+
+    report = response.json()["data"]
+    assert (report["total"], report["inserted"], report["failed"]) == (5, 2, 3)
+    assert [(f["line"], f["user_id"]) for f in report["failures"]] == [(2, "u2"), (3, None), (5, "u1")]
+    assert report["rows_per_second"] > 0
+
+    async def stored():
+        async with sessionmaker() as db:
+            user = await UserRepositoryDB(db).get_user("u3")
+            return user.password
+
+    assert asyncio.run(stored()) == "hashed p"
+
+
+def test_bulk_import_csv(bulk_client):
+    body = "user_id,password,nickname,img_id\na,p,A,i\nb,p,B,i\nc,p,C\n"
+    response = bulk_client.post("/user/bulk", content=body, headers={"content-type": "text/csv"})
+
+    report = response.json()["data"]
+    assert (report["total"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert report["failures"][0]["line"] == 4
+
+
+def test_bulk_import_records_non_string_user_id_as_row_failure(bulk_client):
+    rows = [
+        {"user_id": 123, "password": "p", "nickname": "n", "img_id": "i"},
+        {"user_id": "ok", "password": "p", "nickname": "n", "img_id": "i"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = bulk_client.post("/user/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    report = response.json()["data"]
+    assert (report["total"], report["inserted"], report["failed"]) == (2, 1, 1)
+    assert report["failures"][0]["user_id"] == "123"
+
+
+def test_bulk_import_csv_quoted_newlines(bulk_client, sessionmaker):
+    body = 'user_id,password,nickname,img_id\na,p,"two\nlines",i\nb,p,B,i\nc,p,"open\n'
+    response = bulk_client.post("/user/bulk", content=body, headers={"content-type": "text/csv"})
+
+    report = response.json()["data"]
+    assert (report["total"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert [f["line"] for f in report["failures"]] == [5]
+
+    async def nickname():
+        async with sessionmaker() as db:
+            return (await UserRepositoryDB(db).get_user("a")).nickname
+
+    assert asyncio.run(nickname()) == "two\nlines"
+
+
+def test_bulk_import_requires_authentication(sessionmaker):
+    response = TestClient(app).post(
+        "/user/bulk", content="{}", headers={"content-type": "application/x-ndjson"}
+    )
+
+    assert response.status_code in (401, 403)
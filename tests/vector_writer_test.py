@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from weaviate.collections.classes.batch import BatchObject, ErrorObject
+
+from app.rag.vector_writer import BatchWriteError, BatchWriter
+
+
+class SlowEmbeddings(Embeddings):
+    """Deterministic vectors; records batch sizes and peak concurrency, can fail N times."""
+
+    def __init__(self, delay=0.02, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("rate limited")
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.batches.append(len(texts))
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_object(self, collection, properties, uuid, vector=None, tenant=None):
+        obj = BatchObject(
+            collection=collection, properties=properties, uuid=uuid, vector=vector, tenant=tenant,
+            index=len(self.client.objects),
+        )
+        if self.client.reject.get(str(uuid), 0) > 0:
+            self.client.reject[str(uuid)] -= 1
+            self.client.failed_objects.append(
+                ErrorObject(message="shard unavailable", object_=obj, original_uuid=uuid)
+            )
+        else:
+            self.client.objects[str(uuid)] = obj
+
+
+class FakeBatchClient:
+    """Just enough of `client.batch` for BatchWriter."""
+
+    def __init__(self, reject=None):
+        self.objects = {}
+        self.reject = dict(reject or {})
+        self.failed_objects = []
+        self.modes = []
+        self.batch = self
+
+    def fixed_size(self, batch_size, concurrent_requests):
+        self.modes.append(("fixed", batch_size, concurrent_requests))
+        self.failed_objects = []
+        return FakeBatch(self)
+
+    def dynamic(self):
+        self.modes.append(("dynamic",))
+        self.failed_objects = []
+        return FakeBatch(self)
+
+
+def make_writer(client, embedding, **kwargs):
+    kwargs.setdefault("backoff", 0)
+    return BatchWriter(client, "Docs", "text", embedding, **kwargs)
+
+
+def test_writes_all_objects_with_matching_vectors():
+    client, embedding = FakeBatchClient(), SlowEmbeddings()
+    writer = make_writer(client, embedding, embed_batch_size=10, embed_concurrency=4, batch_size=50)
+    texts = [f"text {'x' * i}" for i in range(95)]
+    metadatas = [{"source": f"s{i}", "tags": ("a", "b")} for i in range(95)]
+
+    ids, report = writer.write(texts, metadatas=metadatas)
+
+    assert report.written == report.objects == 95 and not report.failed
+    assert sorted(embedding.batches) == [5] + [10] * 9
+    assert embedding.peak > 1
+    assert client.modes == [("fixed", 50, 2)]
+    for i, uuid in enumerate(ids):
+        obj = client.objects[uuid]
+        assert obj.properties["text"] == texts[i]
+        assert obj.properties["source"] == f"s{i}"
+        assert obj.vector == [float(len(texts[i])), 1.0]
+    writer.close()
+
+
+def test_keeps_given_ids_and_dynamic_mode():
+    client = FakeBatchClient()
+    writer = make_writer(client, SlowEmbeddings(delay=0), batch_mode="dynamic")
+    given = ["5f0f7e4c-6a51-4c56-9d5a-0c8f4a6d8e11", "0b9f2c43-2f4c-4c8e-8a0c-8f1f3c2b7a10"]
+    ids, _ = writer.write(["a", "b"], ids=given)
+    assert ids == given
+    assert set(client.objects) == set(given)
+    assert client.modes == [("dynamic",)]
+
+
+def test_retries_failed_embedding_batches():
+    embedding = SlowEmbeddings(delay=0, failures=2)
+    writer = make_writer(FakeBatchClient(), embedding, embed_batch_size=4, embed_concurrency=1)
+    _, report = writer.write([f"t{i}" for i in range(8)])
+    assert report.embed_retries == 2
+    assert report.written == 8
+
+
+def test_retries_objects_rejected_by_weaviate():
+    given = ["5f0f7e4c-6a51-4c56-9d5a-0c8f4a6d8e11", "0b9f2c43-2f4c-4c8e-8a0c-8f1f3c2b7a10"]
+    client = FakeBatchClient(reject={given[0]: 2})
+    writer = make_writer(client, SlowEmbeddings(delay=0))
+    _, report = writer.write(["a", "b"], ids=given)
+    assert report.write_retries == 2
+    assert report.written == 2
+    assert given[0] in client.objects
+
+
+def test_reports_objects_that_keep_failing():
+    given = ["5f0f7e4c-6a51-4c56-9d5a-0c8f4a6d8e11", "0b9f2c43-2f4c-4c8e-8a0c-8f1f3c2b7a10"]
+    client = FakeBatchClient(reject={given[1]: 99})
+    writer = make_writer(client, SlowEmbeddings(delay=0), max_retries=2)
+
+    with pytest.raises(BatchWriteError) as exc_info:
+        writer.write(["a", "b"], ids=given)
+    report = exc_info.value.report
+    assert [f.uuid for f in report.failed] == [given[1]]
+    assert report.written == 1
+
+    _, report = writer.write(["a", "b"], ids=given, raise_on_failure=False)
+    assert len(report.failed) == 1
+    assert writer.report.objects == 4 and len(writer.report.failed) == 2
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+import weaviate
+
+import app.main as main
+from app.config import settings
+from app.rag.weaviate_client import WeaviateClientPool
+
+
+class StubClient:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def is_ready(self):
+        return True
+
+    def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class StubAsyncClient:
+    def __init__(self):
+        self.connected = False
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self):
+        self.connected = True
+
+    async def is_ready(self):
+        return True
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    created = {"sync": [], "async": []}
+
+    def connect_to_local(**kwargs):
+        created["sync"].append(StubClient())
+        return created["sync"][-1]
+
+    def use_async_with_local(**kwargs):
+        created["async"].append(StubAsyncClient())
+        return created["async"][-1]
+
+    monkeypatch.setattr(weaviate, "connect_to_local", connect_to_local)
+    monkeypatch.setattr(weaviate, "use_async_with_local", use_async_with_local)
+    return created
+
+
+def make_pool():
+    return WeaviateClientPool(host="localhost", port=8080, grpc_port=50051)
+
+
+def test_client_is_shared_and_reconnected_after_disconnect(clients):
+    pool = make_pool()
+    first = pool.get_client()
+    with pool.client() as borrowed:
+        assert borrowed is first
+    assert not first.closed
+    assert len(clients["sync"]) == 1
+
+    first.connected = False
+    second = pool.get_client()
+    assert second is not first and len(clients["sync"]) == 2
+
+
+def test_aclose_closes_both_clients(clients):
+    pool = make_pool()
+
+    async def run():
+        async_client = await pool.aget_client()
+        assert await pool.aget_client() is async_client
+        pool.get_client()
+        await pool.aclose()
+        # 두 번째 호출은 아무것도 하지 않음
+        await pool.aclose()
+
+    asyncio.run(run())
+    assert [c.closed for c in clients["async"]] == [True]
+    assert [c.closed for c in clients["sync"]] == [True]
+    assert pool._client is None and pool._async_client is None
+
+
+def test_health_check_reports_connection_failure(monkeypatch):
+    def connect_to_local(**kwargs):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(weaviate, "connect_to_local", connect_to_local)
+    assert make_pool().health_check() is False
+
+
+def test_lifespan_runs_health_check_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def health_check():
+        threads.append(threading.current_thread())
+        return False
+
+    async def aclose():
+        pass
+
+    monkeypatch.setattr(settings, "PROMPT_REFRESH_INTERVAL", 0)
+    monkeypatch.setattr(main.weaviate_pool, "health_check", health_check)
+    monkeypatch.setattr(main.weaviate_pool, "aclose", aclose)
+
+    async def run():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(run())
+    assert threads and threads[0] is not threading.main_thread()